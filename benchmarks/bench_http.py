@@ -0,0 +1,91 @@
+"""
+Benchmark: one aiohttp session per call (old get_quote/roast) vs the shared HttpClient.
+
+Starts a local stub server that mimics the zenquotes and evilinsult endpoints and
+reports p50/p99 latency for the `!roast` fetch and the sadness auto-reply fetch.
+Run from the repo root:
+    python benchmarks/bench_http.py [--requests 500] [--concurrency 8]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from http_client import HttpClient  # noqa: E402
+
+
+async def start_stub_server():
+    async def zenquotes(request):
+        return web.json_response([{"q": "Keep going.", "a": "Stub"}])
+
+    async def evilinsult(request):
+        return web.json_response({"insult": "You are a stub."})
+
+    app = web.Application()
+    app.router.add_get("/api/random", zenquotes)
+    app.router.add_get("/generate_insult.php", evilinsult)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+async def legacy_get_json(url: str):
+    """The old pattern: a brand-new ClientSession (and connection) per call."""
+    async with aiohttp.ClientSession() as session:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=8)) as resp:
+            return resp.status, await resp.json()
+
+
+async def run(fetch, url: str, total: int, concurrency: int) -> list:
+    latencies = []
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with sem:
+            start = time.perf_counter()
+            await fetch(url)
+            latencies.append((time.perf_counter() - start) * 1e3)
+
+    await asyncio.gather(*(one() for _ in range(total)))
+    return latencies
+
+
+def pct(values: list, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    runner, base = await start_stub_server()
+    client = HttpClient()
+    await client.start()
+    try:
+        for label, path in (("!roast", "/generate_insult.php?lang=en&type=json"),
+                            ("sadness reply", "/api/random")):
+            url = base + path
+            for name, fetch in (("per-call session", legacy_get_json), ("shared client", client.get_json)):
+                lat = await run(fetch, url, args.requests, args.concurrency)
+                print(f"{label:>13} | {name:<16} p50 {statistics.median(lat):7.2f} ms"
+                      f"  p99 {pct(lat, 0.99):7.2f} ms")
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,377 @@
+"""
+Load test: replay synthetic chat through the real bot (message pipeline + command parser), offline.
+
+A fake Discord layer builds a guild, channels, members and messages as real
+discord.py objects on the bot's ConnectionState, and answers every REST call
+(send, edit, react, history, ...) from a stub route with fixed latency.
+zenquotes and the insult/compliment/advice APIs are served by a local aiohttp
+stub; Gemini and the translator are local stand-ins with injected latency.
+
+Each stage offers messages at a fixed rate (open loop: arrivals don't wait for
+earlier messages to finish) and reports throughput, p50/p95/p99 latency from
+arrival until `on_message` returns, event-loop lag, REST calls and memory
+growth. Exits non-zero if a stage misses `--max-p99` or drops messages.
+Run from the repo root:
+    python benchmarks/bench_load.py [--rates 50,200,500] [--duration 10] [--mix chatter|mixed|commands]
+"""
+import argparse
+import asyncio
+import collections
+import datetime as dt
+import gc
+import itertools
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from urllib.parse import urlsplit
+
+import discord
+from aiohttp import web
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from bench_triggers import CHAT_LINES  # noqa: E402
+from cogs import EXTENSIONS  # noqa: E402
+from gemini import GeminiClient  # noqa: E402
+from http_client import HttpClient  # noqa: E402
+from outbound import OutboundDispatcher  # noqa: E402
+from quote_pool import QuotePool  # noqa: E402
+from translation import TranslationService  # noqa: E402
+from tryhard_bot import TryhardBot  # noqa: E402
+
+BOT_ID = 1000
+GUILD_ID = 1 << 22
+CHANNEL_BASE = 5000
+USER_BASE = 2000
+
+COMMANDS = [
+    "!flip", "!roast <@{user}>", "!compliment <@{user}>", "!ineedhelp", "!wyr",
+    '!poll "best snack?" chips cookies fruit', "!translate es good morning everyone",
+    "!remindme 2h stretch", "!reminders", "!mymood", "!servermood", "!moodplay", "!thankyou", "!helptryhard",
+]
+# share of messages that are commands
+MIXES = {"chatter": 0.0, "mixed": 0.1, "commands": 1.0}
+
+MOOD_ANSWER = json.dumps({"song_title": "Don't Stop Me Now", "artist": "Queen", "mood": "hyped"})
+
+
+# -- local stand-ins for the third-party services
+
+async def start_upstream_stub(latency: float):
+    """zenquotes / evilinsult / complimentr / adviceslip, one path per real hostname."""
+    async def zenquotes(request):
+        await asyncio.sleep(latency)
+        return web.json_response([{"q": f"Stub quote number {i}.", "a": "Load Test"} for i in range(50)])
+
+    async def insult(request):
+        await asyncio.sleep(latency)
+        return web.json_response({"insult": f"you are stub insult #{random.randrange(10000)}."})
+
+    async def compliment(request):
+        await asyncio.sleep(latency)
+        return web.json_response({"compliment": f"you are stub compliment #{random.randrange(10000)}."})
+
+    async def advice(request):
+        await asyncio.sleep(latency)
+        return web.json_response({"slip": {"advice": f"stub advice #{random.randrange(10000)}."}})
+
+    app = web.Application()
+    app.router.add_get("/zenquotes.io", zenquotes)
+    app.router.add_get("/evilinsult.com", insult)
+    app.router.add_get("/complimentr.com", compliment)
+    app.router.add_get("/api.adviceslip.com", advice)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+
+class LocalHttpClient(HttpClient):
+    """Sends every upstream API call to the local stub server instead of the internet."""
+
+    def __init__(self, base: str, **kwargs):
+        super().__init__(**kwargs)
+        self.base = base
+
+    async def get_json(self, url: str, timeout: float = None):
+        return await super().get_json(f"{self.base}/{urlsplit(url).hostname}", timeout=timeout)
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeGemini:
+    """Stands in for genai.GenerativeModel: a blocking call with fixed latency."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def generate_content(self, prompt, stream=False, generation_config=None):
+        answer = MOOD_ANSWER if generation_config else "Mood: chill, mostly gaming talk and snacks."
+        if stream:
+            def chunks():
+                for i in range(0, len(answer), 16):
+                    time.sleep(self.latency / 8)
+                    yield FakeResponse(answer[i:i + 16])
+            return chunks()
+        time.sleep(self.latency)
+        return FakeResponse(answer)
+
+
+class FakeTranslator:
+    def __init__(self, target: str, latency: float):
+        self.target = target
+        self.latency = latency
+
+    def translate(self, text: str) -> str:
+        time.sleep(self.latency)
+        return f"[{self.target}] {text}"
+
+
+# -- fake Discord layer
+
+def user_payload(uid: int) -> dict:
+    return {"id": uid, "username": f"user{uid}", "discriminator": "0", "avatar": None, "global_name": None}
+
+
+def member_payload() -> dict:
+    return {"roles": [], "joined_at": dt.datetime.now(dt.timezone.utc).isoformat(), "deaf": False, "mute": False, "flags": 0}
+
+
+def message_payload(mid: int, channel_id: int, author: dict, content: str, embeds=()) -> dict:
+    return {"id": mid, "channel_id": channel_id, "guild_id": GUILD_ID, "author": author, "member": member_payload(),
+            "content": content or "", "timestamp": dt.datetime.now(dt.timezone.utc).isoformat(),
+            "edited_timestamp": None, "tts": False, "mention_everyone": False, "mentions": [], "mention_roles": [],
+            "attachments": [], "embeds": list(embeds), "pinned": False, "type": 0}
+
+
+class FakeDiscord:
+    """One guild on the bot's own ConnectionState plus a stub for every REST route."""
+
+    def __init__(self, bot, channels: int, users: int, rest_latency: float):
+        self.bot = bot
+        self.state = state = bot._connection
+        self.rest_latency = rest_latency
+        self.calls = collections.Counter()
+        self._ids = itertools.count(discord.utils.time_snowflake(dt.datetime.now(dt.timezone.utc)))
+        state.user = discord.ClientUser(state=state, data={**user_payload(BOT_ID), "bot": True})
+        self.guild = discord.Guild(state=state, data={
+            "id": GUILD_ID, "name": "load test", "owner_id": BOT_ID, "channels": [], "members": [], "member_count": 0,
+            "roles": [{"id": GUILD_ID, "name": "@everyone", "permissions": "0", "position": 0, "color": 0,
+                       "hoist": False, "managed": False, "mentionable": False}],
+        })
+        state._add_guild(self.guild)
+        self.channels = []
+        for i in range(channels):
+            ch = discord.TextChannel(state=state, guild=self.guild, data={
+                "id": CHANNEL_BASE + i, "type": 0, "name": "general" if i == 0 else f"chat-{i}", "position": i,
+                "permission_overwrites": [], "guild_id": GUILD_ID})
+            self.guild._add_channel(ch)
+            self.channels.append(ch)
+        self.users = [USER_BASE + i for i in range(users)]
+        for uid in (BOT_ID, *self.users):
+            self.guild._add_member(discord.Member(state=state, guild=self.guild,
+                                                  data={**member_payload(), "user": user_payload(uid)}))
+        bot.http.request = self.request
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    def message(self, channel, user_id: int, content: str) -> discord.Message:
+        data = message_payload(self.next_id(), channel.id, user_payload(user_id), content)
+        return discord.Message(state=self.state, channel=channel, data=data)
+
+    async def request(self, route, **kwargs):
+        self.calls[f"{route.method} {route.path}"] += 1
+        await asyncio.sleep(self.rest_latency)
+        body = kwargs.get("json") or {}
+        if route.path.endswith("/messages") and route.method == "POST":
+            return message_payload(self.next_id(), route.channel_id, user_payload(BOT_ID), body.get("content"),
+                                   body.get("embeds") or ())
+        if route.path.endswith("/messages/{message_id}") and route.method == "PATCH":
+            return message_payload(int(route.url.rsplit("/", 1)[1]), route.channel_id, user_payload(BOT_ID), body.get("content"),
+                                   body.get("embeds") or ())
+        if route.path.endswith("/messages") and route.method == "GET":
+            return []  # channel history
+        return None
+
+
+# -- load generation
+
+class LagSampler:
+    def __init__(self, interval: float = 0.02):
+        self.interval = interval
+        self.samples = []
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - start - self.interval))
+
+    def start(self):
+        self.samples = []
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        self._task.cancel()
+
+
+def rss_mib() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+
+def pct(values, q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def run_stage(bot, fake: FakeDiscord, rate: float, duration: float, command_share: float, drain: float) -> dict:
+    loop = asyncio.get_running_loop()
+    latencies, errors = [], collections.Counter()
+    pending = set()
+    calls_before = sum(fake.calls.values())
+    gc.collect()
+    rss_before = rss_mib()
+    lag = LagSampler()
+    lag.start()
+
+    async def deliver(msg, arrived):
+        try:
+            await bot.on_message(msg)
+        except Exception as e:
+            errors[type(e).__name__] += 1
+        latencies.append(loop.time() - arrived)
+
+    total = int(rate * duration)
+    start = loop.time()
+    for i in range(total):
+        arrival = start + i / rate
+        delay = arrival - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        channel = random.choice(fake.channels)
+        user = random.choice(fake.users)
+        if random.random() < command_share:
+            content = random.choice(COMMANDS).format(user=random.choice(fake.users))
+        else:
+            content = random.choice(CHAT_LINES)
+        task = asyncio.create_task(deliver(fake.message(channel, user, content), loop.time()))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+    offered_for = loop.time() - start
+    if pending:
+        await asyncio.wait(set(pending), timeout=drain)
+    elapsed = loop.time() - start
+    lag.stop()
+    gc.collect()
+    return {
+        "rate": rate, "offered": total, "offered_rate": total / offered_for if offered_for else 0.0,
+        "done": len(latencies), "stuck": len(pending), "throughput": len(latencies) / elapsed,
+        "p50": pct(latencies, 0.50), "p95": pct(latencies, 0.95), "p99": pct(latencies, 0.99),
+        "max": max(latencies, default=0.0), "lag_p99": pct(lag.samples, 0.99), "lag_max": max(lag.samples, default=0.0),
+        "rest_calls": sum(fake.calls.values()) - calls_before, "rss": rss_mib(), "rss_delta": rss_mib() - rss_before,
+        "errors": dict(errors),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rates", default="50,200,500", help="comma-separated messages/second, one stage each")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per stage")
+    parser.add_argument("--mix", choices=sorted(MIXES), default="mixed")
+    parser.add_argument("--channels", type=int, default=20)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--rest-latency", type=float, default=0.03, help="seconds per fake Discord REST call")
+    parser.add_argument("--api-latency", type=float, default=0.05, help="seconds per stub upstream API call")
+    parser.add_argument("--gemini-latency", type=float, default=0.4)
+    parser.add_argument("--translate-latency", type=float, default=0.1)
+    parser.add_argument("--outbox-rate", type=float, default=None,
+                        help="per-channel sends/second for the outbox (default: production pacing)")
+    parser.add_argument("--drain", type=float, default=30.0, help="seconds to wait for in-flight messages per stage")
+    parser.add_argument("--max-p99", type=float, default=None, help="fail if any stage's p99 exceeds this (seconds)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    tmp = tempfile.TemporaryDirectory()
+    for var, name in (("REMINDER_DB", "reminders.db"), ("CONTENT_DB", "content.db"),
+                      ("POLL_DB", "polls.db"), ("DAILY_DB", "daily.db"), ("SETTINGS_DB", "settings.db")):
+        os.environ[var] = os.path.join(tmp.name, name)
+
+    runner, base = await start_upstream_stub(args.api_latency)
+    bot = TryhardBot(command_prefix="!", intents=discord.Intents.all())
+    bot.remove_command("help")
+    # swap every external dependency for a local stand-in before the cogs capture them
+    bot.http_client = LocalHttpClient(base)
+    bot.quotes = QuotePool(bot.http_client)
+    bot.gemini = GeminiClient(model_factory=lambda name: FakeGemini(args.gemini_latency))
+    bot.translator = TranslationService(translator_factory=lambda target: FakeTranslator(target, args.translate_latency))
+    if args.outbox_rate:
+        bot.outbox = OutboundDispatcher(rate=args.outbox_rate, burst=max(5, int(args.outbox_rate)))
+    fake = FakeDiscord(bot, args.channels, args.users, args.rest_latency)
+    # what login() would do: bind the client to this loop, then mark it ready
+    await bot._async_setup_hook()
+    bot._ready.set()
+    await bot.http_client.start()
+    bot.quotes.start()
+    bot.loop_lag.start()
+    for ext in EXTENSIONS:
+        await bot.load_extension(ext)
+    await asyncio.sleep(0.5)  # let the quote buffer and content bank warm up
+
+    print(f"mix={args.mix} channels={args.channels} users={args.users} rest={args.rest_latency * 1e3:.0f}ms"
+          f" api={args.api_latency * 1e3:.0f}ms gemini={args.gemini_latency * 1e3:.0f}ms"
+          f" translate={args.translate_latency * 1e3:.0f}ms rss={rss_mib():.1f} MiB")
+    print(f"{'rate/s':>7} {'msgs':>6} {'done/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+          f" {'lag99 ms':>9} {'lagmax':>7} {'REST':>6} {'RSS MiB':>8} {'ΔRSS':>6}")
+    failures = []
+    try:
+        for rate in (float(r) for r in args.rates.split(",")):
+            r = await run_stage(bot, fake, rate, args.duration, MIXES[args.mix], args.drain)
+            print(f"{rate:7.0f} {r['offered']:6d} {r['throughput']:8.1f} {r['p50'] * 1e3:8.1f} {r['p95'] * 1e3:8.1f}"
+                  f" {r['p99'] * 1e3:8.1f} {r['max'] * 1e3:8.1f} {r['lag_p99'] * 1e3:9.1f} {r['lag_max'] * 1e3:7.1f}"
+                  f" {r['rest_calls']:6d} {r['rss']:8.1f} {r['rss_delta']:+6.1f}")
+            if r["errors"]:
+                print(f"        errors: {r['errors']}")
+            if r["stuck"]:
+                failures.append(f"{rate:.0f}/s: {r['stuck']} messages still in flight after {args.drain:.0f}s")
+            if args.max_p99 is not None and r["p99"] > args.max_p99:
+                failures.append(f"{rate:.0f}/s: p99 {r['p99'] * 1e3:.0f} ms > {args.max_p99 * 1e3:.0f} ms")
+            if r["offered_rate"] < rate * 0.9:
+                print(f"        note: the generator only offered {r['offered_rate']:.0f}/s (harness is CPU-bound)")
+    finally:
+        top = ", ".join(f"{route} ×{n}" for route, n in fake.calls.most_common(6))
+        print(f"REST routes: {top}")
+        out = bot.outbox.stats()
+        print(f"outbox: {out['sends']} sends (+{out['merged']} merged), depth {out['depth']},"
+              f" avg latency {out['avg_latency_ms']} ms · gemini calls {bot.gemini.calls}"
+              f" · translate calls {bot.translator.calls}")
+        for ext in reversed(list(bot.extensions)):
+            await bot.unload_extension(ext)
+        await bot.quotes.stop()
+        bot.translator.close()
+        await bot.http_client.close()
+        bot.loop_lag.stop()
+        await runner.cleanup()
+        tmp.cleanup()
+
+    if failures:
+        print("FAILED: " + "; ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+"""
+Microbenchmark: batched lexicon mood scoring vs the original per-user substring heuristic.
+
+Run from the repo root:
+    python benchmarks/bench_mood.py [--users 5000] [--messages 20] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mood import LEXICON  # noqa: E402
+
+CHAT_LINES = [
+    "anyone up for ranked later?",
+    "lmao that clip was insane",
+    "bro the wifi is so slow today",
+    "ok i'm downloading the update rn",
+    "gg wp everyone",
+    "that's actually so funny 😂",
+    "i'll be on in like 10 min",
+    "new patch nerfed my main again, so annoying",
+    "thank you so much for the help!!",
+    "ugh mondays",
+    "i'm so tired of this assignment",
+    "that movie made me cry ngl",
+    "exams next week and i'm stressed",
+    "not gonna lie i'm kinda happy today",
+    "just chilling with some music",
+    "i hate when the bus is late",
+    "so excited for the trip!!",
+    "pizza or burgers for dinner?",
+]
+
+# The original !mymood fallback, reproduced verbatim
+POS_WORDS = {
+    "happy", "glad", "great", "awesome", "good", "love", "excited", "yay", "win", "nice",
+    "fun", "cool", "chill", "relaxed", "relax", "lol", "lmao", "haha", "hehe", "content"
+}
+NEG_WORDS = {
+    "sad", "tired", "angry", "mad", "upset", "anxious", "stress", "stressed", "depressed",
+    "cry", "crying", "lonely", "worthless", "pain", "hurt", "numb", "lost", "down", "ugh", "hate"
+}
+
+
+def legacy_mood(texts: list) -> str:
+    text = " ".join(texts).lower()
+    pos = sum(1 for w in POS_WORDS if w in text)
+    neg = sum(1 for w in NEG_WORDS if w in text)
+    if pos > neg and pos > 0:
+        return "happy"
+    if neg > pos and neg > 0:
+        if any(k in text for k in ["stress", "stressed", "pressure", "deadline"]):
+            return "stressed"
+        if any(k in text for k in ["angry", "mad"]):
+            return "angry"
+        if any(k in text for k in ["sad", "cry", "lonely", "depress"]):
+            return "sad"
+        return "down"
+    return "neutral"
+
+
+def build_buffers(users: int, messages: int, seed: int = 42) -> dict:
+    rng = random.Random(seed)
+    return {uid: [rng.choice(CHAT_LINES) for _ in range(messages)] for uid in range(users)}
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    buffers = build_buffers(args.users, args.messages)
+    texts = list(buffers.values())
+
+    legacy = best_of(lambda: [legacy_mood(t) for t in texts], args.repeat)
+    single = best_of(lambda: [LEXICON.mood(t) for t in texts], args.repeat)
+    batched = best_of(lambda: LEXICON.rank(buffers), args.repeat)
+    for name, secs in (("legacy", legacy), ("lexicon/1", single), ("batched", batched)):
+        print(f"{name:>10}: {secs * 1e3:8.2f} ms total, {secs / len(texts) * 1e6:7.2f} µs/user")
+    print(f"   batched vs one-at-a-time lexicon: {single / batched:.2f}x over {len(texts)} users")
+    print(f"   batched vs legacy heuristic:      {legacy / batched:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark: buffered vs streamed !moodplay against a local fake streaming Gemini model.
+
+The fake model emits the JSON answer in small chunks with a fixed delay per
+chunk, like a real token stream. Reports time until the `m!play` line is sent,
+total command time, and how many sends/edits hit the (fake) channel.
+Run from the repo root:
+    python benchmarks/bench_moodplay_stream.py [--chunks 24] [--chunk-delay 0.05] [--runs 5]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cogs.ai as ai  # noqa: E402
+from gemini import GeminiClient  # noqa: E402
+from outbound import STATUS, LiveMessage, OutboundDispatcher  # noqa: E402
+from sharding import ShardPartitioned  # noqa: E402
+
+ANSWER = json.dumps({"song_title": "Don't Stop Me Now", "artist": "Queen",
+                     "mood": "uplifting, the chat is hyped and ready to go"})
+
+
+class FakeChunk:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeStreamingModel:
+    """Stands in for genai.GenerativeModel: blocking generate_content, optionally streamed."""
+
+    def __init__(self, chunks: int, delay: float):
+        size = max(1, len(ANSWER) // chunks)
+        self.pieces = [ANSWER[i:i + size] for i in range(0, len(ANSWER), size)]
+        self.delay = delay
+
+    def _iter(self):
+        for piece in self.pieces:
+            time.sleep(self.delay)
+            yield FakeChunk(piece)
+
+    def generate_content(self, prompt, stream=False, generation_config=None):
+        if stream:
+            return self._iter()
+        return FakeChunk("".join(c.text for c in self._iter()))
+
+
+class FakeMessage:
+    def __init__(self, channel):
+        self.channel = channel
+
+    async def edit(self, content=None, **kwargs):
+        self.channel.log.append((time.perf_counter(), "edit", content))
+
+
+class FakeChannel:
+    id = 1
+    guild = None
+
+    def __init__(self):
+        self.log = []
+        self.channel = self
+
+    async def send(self, content=None, **kwargs):
+        self.log.append((time.perf_counter(), "send", content))
+        return FakeMessage(self)
+
+    async def history(self, limit=30):
+        for i in range(limit):
+            yield types.SimpleNamespace(id=i, author=types.SimpleNamespace(bot=False, display_name=f"user{i % 3}"),
+                                        content="lets gooo we won the finals")
+
+
+async def run_once(stream: bool, chunks: int, delay: float) -> dict:
+    ai.MOODPLAY_STREAM = stream
+    model = FakeStreamingModel(chunks, delay)
+    bot = types.SimpleNamespace(
+        outbox=OutboundDispatcher(rate=100.0, burst=100),
+        gemini=GeminiClient(model_factory=lambda name: model),
+        partitioned=lambda factory: ShardPartitioned(factory),
+    )
+    cog = ai.AI(bot)
+    channel = FakeChannel()
+    start = time.perf_counter()
+    await cog._moodplay(channel)
+    await asyncio.sleep(0.2)  # let queued fire-and-forget status posts land
+    total = time.perf_counter() - start
+    play_at = next(t for t, _, content in channel.log if content and content.startswith("m!play"))
+    return {"play": play_at - start, "total": total,
+            "sends": sum(1 for _, kind, _ in channel.log if kind == "send"),
+            "edits": sum(1 for _, kind, _ in channel.log if kind == "edit")}
+
+
+async def check_live_isolation():
+    """A post queued next to a LiveMessage's first send must stay its own message, untouched by the edits."""
+    outbox = OutboundDispatcher(rate=100.0, burst=100)
+    channel = FakeChannel()
+    live = LiveMessage(outbox, channel, min_interval=0.0)
+    outbox.post(channel, "queued reply", priority=STATUS)
+    live.update("⏳ working...")
+    await asyncio.sleep(0)  # the flusher queues the first send between the two posts
+    outbox.post(channel, "another reply", priority=STATUS)
+    await live.finish("✅ done")
+    await asyncio.sleep(0.2)
+    sends = [content for _, kind, content in channel.log if kind == "send"]
+    assert "⏳ working..." in sends, sends
+    assert [c for c in sends if "reply" in c] == ["queued reply", "another reply"], sends
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=24)
+    parser.add_argument("--chunk-delay", type=float, default=0.05)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    await check_live_isolation()
+    for label, stream in (("buffered", False), ("streamed", True)):
+        results = [await run_once(stream, args.chunks, args.chunk_delay) for _ in range(args.runs)]
+        play = statistics.median(r["play"] for r in results)
+        total = statistics.median(r["total"] for r in results)
+        print(f"{label:<9} m!play after {play * 1e3:7.1f} ms · done {total * 1e3:7.1f} ms · "
+              f"{results[0]['sends']} sends, {results[0]['edits']} edits")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
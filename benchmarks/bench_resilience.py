@@ -0,0 +1,139 @@
+"""
+Benchmark + checks: circuit breakers, hedging and deadlines against local stub upstreams.
+
+A stub server exposes a healthy endpoint, one that hangs, and one that returns
+HTTP 500. Scenarios compare the old sequential compliment fetch (primary, then
+secondary, each with its own timeout) with the hedged `first_success` path,
+and show a failing host's breaker opening so later calls skip it instantly.
+Exits non-zero if any check fails.
+Run from the repo root:
+    python benchmarks/bench_resilience.py [--old-timeout 8] [--deadline 3] [--hedge 0.3]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from http_client import HttpClient  # noqa: E402
+from resilience import CircuitBreaker, CircuitOpen, first_success  # noqa: E402
+
+
+async def start_stub_server():
+    async def ok(request):
+        await asyncio.sleep(0.02)
+        return web.json_response({"compliment": "you are a great stub"})
+
+    async def hang(request):
+        await asyncio.sleep(3600)
+        return web.json_response({})
+
+    async def broken(request):
+        return web.json_response({"error": "boom"}, status=500)
+
+    app = web.Application()
+    app.router.add_get("/ok", ok)
+    app.router.add_get("/hang", hang)
+    app.router.add_get("/500", broken)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, port
+
+
+async def fetch(http, url, timeout):
+    status, data = await http.get_json(url, timeout=timeout)
+    return data.get("compliment") if status == 200 and data else None
+
+
+async def sequential(http, primary, secondary, timeout):
+    """The old !compliment: try the primary, then the secondary, each with its own timeout."""
+    for url in (primary, secondary):
+        try:
+            result = await fetch(http, url, timeout)
+            if result:
+                return result
+        except Exception:
+            pass
+    return None
+
+
+async def timed(coro):
+    start = time.perf_counter()
+    result = await coro
+    return result, time.perf_counter() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--old-timeout", type=float, default=8.0)
+    parser.add_argument("--deadline", type=float, default=3.0)
+    parser.add_argument("--hedge", type=float, default=0.3)
+    args = parser.parse_args()
+
+    runner, port = await start_stub_server()
+    # 127.0.0.1 and localhost are separate hosts, so they get separate breakers
+    ok, hang, broken = f"http://localhost:{port}/ok", f"http://127.0.0.1:{port}/hang", f"http://127.0.0.1:{port}/500"
+    failures = []
+
+    def check(name, cond, detail):
+        print(f"  [{'PASS' if cond else 'FAIL'}] {name}: {detail}")
+        if not cond:
+            failures.append(name)
+
+    http = HttpClient(failure_threshold=3, reset_timeout=0.5)
+    await http.start()
+    try:
+        print("primary hangs, secondary healthy")
+        res, secs = await timed(sequential(http, hang, ok, args.old_timeout))
+        print(f"  sequential   {secs * 1e3:8.1f} ms -> {res!r}")
+        res, secs = await timed(first_success(lambda: fetch(http, hang, args.deadline), lambda: fetch(http, ok, args.deadline),
+                                              deadline=args.deadline, hedge_delay=args.hedge))
+        print(f"  hedged       {secs * 1e3:8.1f} ms -> {res!r}")
+        check("hedge wins", res is not None and secs < args.hedge + 0.5, f"{secs * 1e3:.0f} ms")
+
+        print("both upstreams hang")
+        res, secs = await timed(first_success(lambda: fetch(http, hang, None), lambda: fetch(http, hang, None),
+                                              deadline=args.deadline, hedge_delay=args.hedge))
+        check("deadline holds", res is None and secs < args.deadline + 0.2, f"{secs * 1e3:.0f} ms")
+
+        print("primary returns HTTP 500")
+        http.breakers.pop("127.0.0.1", None)
+        for i in range(4):
+            try:
+                _, secs = await timed(fetch(http, broken, 2))
+                outcome = "500"
+            except CircuitOpen as e:
+                secs, outcome = 0.0, f"skipped ({e})"
+            print(f"  call {i + 1}: {outcome}")
+        breaker = http.breakers["127.0.0.1"]
+        check("breaker opens after 3 failures", breaker.state == CircuitBreaker.OPEN, breaker.state)
+        res, secs = await timed(first_success(lambda: fetch(http, broken, 2), lambda: fetch(http, ok, 2),
+                                              deadline=args.deadline, hedge_delay=args.hedge))
+        check("open circuit falls through immediately", res is not None and secs < args.hedge, f"{secs * 1e3:.1f} ms")
+
+        await asyncio.sleep(0.6)
+        try:
+            await fetch(http, broken, 2)
+        except CircuitOpen:
+            pass
+        check("half-open trial re-opens on failure", breaker.state == CircuitBreaker.OPEN and breaker.reset_timeout == 1.0,
+              f"{breaker.state}, next retry in {breaker.reset_timeout:.1f}s")
+    finally:
+        await http.close()
+        await runner.cleanup()
+
+    if failures:
+        print(f"{len(failures)} check(s) failed: {', '.join(failures)}")
+        sys.exit(1)
+    print("all checks passed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+"""
+Benchmark: per-request GoogleTranslator + to_thread (old !translate) vs TranslationService.
+
+Uses a local stand-in translator with injected latency, so it runs offline.
+Requests are drawn from a small phrase set to mimic a busy server where the
+same phrases get translated repeatedly.
+Run from the repo root:
+    python benchmarks/bench_translate.py [--requests 400] [--concurrency 32] [--latency 0.05]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from translation import TranslationService  # noqa: E402
+
+PHRASES = [
+    "good morning", "how are you?", "see you tomorrow", "thank you so much",
+    "where is the train station", "i love ramen", "what time is it", "gg wp",
+    "happy birthday!", "let's play later", "i'm hungry", "good night everyone",
+]
+TARGETS = ["es", "fr", "ja", "de"]
+
+
+class StandInTranslator:
+    """Mimics GoogleTranslator: some construction cost plus a blocking network round-trip."""
+
+    def __init__(self, target: str, latency: float):
+        time.sleep(latency / 10)
+        self.target = target
+        self.latency = latency
+
+    def translate(self, text: str) -> str:
+        time.sleep(self.latency)
+        return f"[{self.target}] {text[::-1]}"
+
+
+async def legacy(workload, latency):
+    async def one(text, target):
+        return await asyncio.to_thread(StandInTranslator(target, latency).translate, text)
+    return await asyncio.gather(*(one(t, tg) for t, tg in workload))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=32, help="requests per burst")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per upstream call")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    workload = [(rng.choice(PHRASES), rng.choice(TARGETS)) for _ in range(args.requests)]
+    bursts = [workload[i:i + args.concurrency] for i in range(0, len(workload), args.concurrency)]
+
+    start = time.perf_counter()
+    for burst in bursts:
+        await legacy(burst, args.latency)
+    legacy_secs = time.perf_counter() - start
+
+    svc = TranslationService(translator_factory=lambda target: StandInTranslator(target, args.latency))
+    start = time.perf_counter()
+    for burst in bursts:
+        await asyncio.gather(*(svc.translate(t, tg) for t, tg in burst))
+    service_secs = time.perf_counter() - start
+    stats = svc.stats()
+    svc.close()
+
+    print(f"   legacy: {len(workload) / legacy_secs:8.1f} req/s ({legacy_secs:.2f}s)")
+    print(f"  service: {len(workload) / service_secs:8.1f} req/s ({service_secs:.2f}s)")
+    print(f"  upstream calls {stats['calls']}, coalesced {stats['coalesced']}, "
+          f"cache hit rate {stats['cache']['hit_rate']:.0%}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+"""
+Microbenchmark: compiled TriggerMatcher vs the original per-pattern on_message checks.
+
+Run from the repo root:
+    python benchmarks/bench_triggers.py [--lines 20000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from triggers import sad_words, SIXTY_SEVEN_PATTERNS, build_default_matcher  # noqa: E402
+
+CHAT_LINES = [
+    "anyone up for ranked later?",
+    "lmao that clip was insane",
+    "bro the wifi is so slow today",
+    "did you finish the math homework",
+    "ok i'm downloading the update rn",
+    "gg wp everyone",
+    "who's hosting the movie night this weekend",
+    "that's actually so funny 😂",
+    "can someone send the notes from lecture 4",
+    "i'll be on in like 10 min",
+    "new patch nerfed my main again",
+    "thank you so much for the help!!",
+    "plz speed i need this",
+    "6 7 lol",
+    "ugh mondays",
+    "i'm so tired of this assignment",
+    "that movie made me cry ngl",
+    "what time is the meeting tomorrow",
+    "check #announcements for the schedule",
+    "pizza or burgers for dinner?",
+]
+
+
+def build_corpus(n: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(n):
+        # glue 1-3 lines together to get realistic message length variance
+        corpus.append(" ".join(rng.choice(CHAT_LINES) for _ in range(rng.randint(1, 3))))
+    return corpus
+
+
+def legacy_match(lower_msg: str) -> set:
+    """The original on_message checks, reproduced verbatim."""
+    fired = set()
+    if any(re.search(p, lower_msg) for p in SIXTY_SEVEN_PATTERNS):
+        fired.add("sixtyseven")
+    if any(word in lower_msg for word in sad_words):
+        fired.add("sad")
+    if "thank you" in lower_msg:
+        fired.add("thanks")
+    if re.search(r"plz.*speed.*i need this", lower_msg):
+        fired.add("speed")
+    return fired
+
+
+def bench(fn, corpus, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for line in corpus:
+            fn(line)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = [line.lower() for line in build_corpus(args.lines)]
+    matcher = build_default_matcher()
+
+    # sanity: both implementations must agree on every line
+    for line in corpus:
+        assert legacy_match(line) == matcher.match(line), line
+
+    legacy = bench(legacy_match, corpus, args.repeat)
+    compiled = bench(matcher.match, corpus, args.repeat)
+    for name, secs in (("legacy", legacy), ("compiled", compiled)):
+        print(f"{name:>9}: {secs * 1e3:8.2f} ms total, {secs / len(corpus) * 1e6:6.2f} µs/msg")
+    print(f"  speedup: {legacy / compiled:.2f}x over {len(corpus)} messages")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+import asyncio
+import datetime as dt
+import heapq
+import random
+import sqlite3
+import time
+from typing import NamedTuple
+
+from utils import parse_timezone
+
+
+class Undeliverable(Exception):
+    """Raised by a broadcaster's `send` for failures a retry can't fix (no channel, no permission)."""
+
+
+class GuildSchedule(NamedTuple):
+    guild_id: int
+    channel_id: int  # None: the guild's default channel
+    tz: str
+    at: dt.time
+    enabled: bool
+
+
+def next_run(tz: dt.tzinfo, at: dt.time, after: float) -> float:
+    """Unix time of the first local `at` in `tz` strictly after `after`."""
+    local = dt.datetime.fromtimestamp(after, tz)
+    due = local.replace(hour=at.hour, minute=at.minute, second=0, microsecond=0)
+    if due.timestamp() <= after:
+        due += dt.timedelta(days=1)  # wall-clock arithmetic: stays at `at` across DST changes
+    return due.timestamp()
+
+
+class DailyBroadcaster:
+    """
+    Posts one message a day to every tracked guild at its own local time.
+
+    Guilds without stored settings use `default_tz`/`default_at`. One heap of
+    (due, guild_id) entries drives a single task: everything due at the same
+    instant forms a slot, `fetch()` is called once per slot and its text goes
+    to every guild in it. Sends fan out concurrently, at most `concurrency` at
+    a time; transient failures are retried `retries` times with jittered
+    exponential backoff, `Undeliverable` is not retried.
+
+    `send(schedule, text)` does the actual post. Only tracked guilds (the ones
+    this process can see, see `track()`) are scheduled, so shard workers
+    sharing the settings database each post for their own guilds.
+    """
+
+    def __init__(self, path: str, fetch, send, default_tz: str = "UTC+8", default_at: dt.time = dt.time(8, 0),
+                 concurrency: int = 20, retries: int = 3, retry_backoff: float = 1.0):
+        self.path = path
+        self.fetch = fetch
+        self.send = send
+        self.default_tz = default_tz
+        self.default_at = default_at
+        self.concurrency = concurrency
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self._db = None
+        self._settings = {}   # guild_id -> GuildSchedule (explicitly configured guilds only)
+        self._tzinfo = {}     # tz string -> tzinfo, parsed once
+        self._heap = []       # (due, guild_id, version)
+        self._version = {}    # guild_id -> version of its live heap entry (tracked guilds)
+        self._wake = asyncio.Event()
+        self._task = None
+        self.slots = 0
+        self.sent = 0
+        self.failed = 0
+        self.skipped = 0
+        self.retried = 0
+        self.last_slot = {"guilds": 0, "seconds": 0.0}
+
+    def __len__(self):
+        return len(self._version)
+
+    def open(self):
+        if self._db is not None:
+            return
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS daily_schedule ("
+            " guild_id INTEGER PRIMARY KEY, channel_id INTEGER, tz TEXT NOT NULL,"
+            " hour INTEGER NOT NULL, minute INTEGER NOT NULL, enabled INTEGER NOT NULL DEFAULT 1)"
+        )
+        self._db.commit()
+        rows = self._db.execute("SELECT guild_id, channel_id, tz, hour, minute, enabled FROM daily_schedule")
+        for gid, cid, tz, hour, minute, enabled in rows:
+            self._settings[gid] = GuildSchedule(gid, cid, tz, dt.time(hour, minute), bool(enabled))
+
+    def tzinfo(self, tz: str) -> dt.tzinfo:
+        info = self._tzinfo.get(tz)
+        if info is None:
+            info = self._tzinfo[tz] = parse_timezone(tz)
+        return info
+
+    def schedule_for(self, guild_id: int) -> GuildSchedule:
+        s = self._settings.get(guild_id)
+        return s if s is not None else GuildSchedule(guild_id, None, self.default_tz, self.default_at, True)
+
+    def _push(self, guild_id: int, after: float):
+        s = self.schedule_for(guild_id)
+        version = self._version.get(guild_id, 0) + 1
+        self._version[guild_id] = version
+        if not s.enabled:
+            return
+        due = next_run(self.tzinfo(s.tz), s.at, after)
+        if not self._heap or due < self._heap[0][0]:
+            self._wake.set()
+        heapq.heappush(self._heap, (due, guild_id, version))
+
+    def track(self, guild_id: int):
+        """Schedule a guild this process serves (idempotent)."""
+        if guild_id not in self._version:
+            self._push(guild_id, time.time())
+
+    def untrack(self, guild_id: int):
+        # its heap entry goes stale and is skipped lazily
+        self._version.pop(guild_id, None)
+
+    def configure(self, guild_id: int, **changes) -> GuildSchedule:
+        """Update a guild's channel_id / tz / at / enabled, persist it and reschedule. Returns the result."""
+        self.open()
+        s = self.schedule_for(guild_id)._replace(**changes)
+        self.tzinfo(s.tz)  # validate before storing
+        self._db.execute(
+            "INSERT OR REPLACE INTO daily_schedule (guild_id, channel_id, tz, hour, minute, enabled)"
+            " VALUES (?, ?, ?, ?, ?, ?)", (guild_id, s.channel_id, s.tz, s.at.hour, s.at.minute, int(s.enabled)),
+        )
+        self._db.commit()
+        self._settings[guild_id] = s
+        if guild_id in self._version:
+            self._push(guild_id, time.time())
+        return s
+
+    def next_due(self, guild_id: int):
+        """Unix time of the guild's next post, or None if it's disabled."""
+        s = self.schedule_for(guild_id)
+        return next_run(self.tzinfo(s.tz), s.at, time.time()) if s.enabled else None
+
+    def start(self):
+        self.open()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _pop_slot(self, now: float) -> list:
+        guilds = []
+        while self._heap and self._heap[0][0] <= now:
+            due, gid, version = heapq.heappop(self._heap)
+            if self._version.get(gid) != version:
+                continue
+            guilds.append(gid)
+            self._push(gid, max(due, now))
+        return guilds
+
+    async def _run(self):
+        while True:
+            guilds = self._pop_slot(time.time())
+            if guilds:
+                try:
+                    await self.broadcast(guilds)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"⚠️ Daily broadcast to {len(guilds)} guild(s) failed: {e}")
+                continue
+            self._wake.clear()
+            timeout = self._heap[0][0] - time.time() if self._heap else None
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def broadcast(self, guild_ids: list) -> dict:
+        """Fetch once and send to every guild in `guild_ids`. Returns per-outcome counts."""
+        start = time.monotonic()
+        text = await self.fetch()
+        gate = asyncio.Semaphore(self.concurrency)
+
+        async def one(gid):
+            async with gate:
+                return await self._deliver(self.schedule_for(gid), text)
+
+        outcomes = await asyncio.gather(*(one(gid) for gid in guild_ids))
+        counts = {k: outcomes.count(k) for k in ("sent", "skipped", "failed")}
+        self.slots += 1
+        self.sent += counts["sent"]
+        self.skipped += counts["skipped"]
+        self.failed += counts["failed"]
+        self.last_slot = {"guilds": len(guild_ids), "seconds": round(time.monotonic() - start, 3)}
+        return counts
+
+    async def _deliver(self, schedule: GuildSchedule, text: str) -> str:
+        for attempt in range(self.retries + 1):
+            try:
+                await self.send(schedule, text)
+                return "sent"
+            except Undeliverable:
+                return "skipped"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if attempt == self.retries:
+                    print(f"⚠️ Daily post to guild {schedule.guild_id} failed: {e}")
+                    return "failed"
+                self.retried += 1
+                await asyncio.sleep(self.retry_backoff * 2 ** attempt * random.uniform(0.5, 1.5))
+
+    def stats(self) -> dict:
+        return {"tracked": len(self._version), "configured": len(self._settings), "slots": self.slots,
+                "sent": self.sent, "skipped": self.skipped, "failed": self.failed, "retried": self.retried,
+                "last_slot": self.last_slot}
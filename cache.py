@@ -0,0 +1,88 @@
+import collections
+import time
+
+
+class TTLCache:
+    """
+    Bounded mapping with LRU eviction and per-entry expiry.
+
+    Entries expire `ttl` seconds after they were last written, or last touched
+    when `sliding=True` (idle expiry, e.g. for per-user state). At most
+    `maxsize` entries are kept; the least recently used entry goes first.
+    Expired entries are dropped lazily on access and by `purge()`; `hits` and
+    `misses` count lookups through `get()`.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = None, sliding: bool = False):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.sliding = sliding
+        self.hits = 0
+        self.misses = 0
+        self._data = collections.OrderedDict()  # key -> [value, expires_at]
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING, count=False) is not _MISSING
+
+    def _deadline(self, now: float):
+        return now + self.ttl if self.ttl is not None else None
+
+    def get(self, key, default=None, count: bool = True):
+        entry = self._data.get(key)
+        if entry is not None:
+            now = time.monotonic()
+            if entry[1] is None or entry[1] > now:
+                self._data.move_to_end(key)
+                if self.sliding:
+                    entry[1] = self._deadline(now)
+                if count:
+                    self.hits += 1
+                return entry[0]
+            del self._data[key]
+        if count:
+            self.misses += 1
+        return default
+
+    def set(self, key, value):
+        self._data[key] = [value, self._deadline(time.monotonic())]
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    __setitem__ = set
+
+    def pop(self, key, default=None):
+        entry = self._data.pop(key, None)
+        return entry[0] if entry is not None else default
+
+    def clear(self):
+        self._data.clear()
+
+    def values(self):
+        now = time.monotonic()
+        return [v for v, exp in self._data.values() if exp is None or exp > now]
+
+    def items(self):
+        now = time.monotonic()
+        return [(k, v) for k, (v, exp) in self._data.items() if exp is None or exp > now]
+
+    def purge(self) -> int:
+        """Drop every expired entry. Returns how many were removed."""
+        if self.ttl is None:
+            return 0
+        now = time.monotonic()
+        expired = [k for k, (_, exp) in self._data.items() if exp <= now]
+        for key in expired:
+            del self._data[key]
+        return len(expired)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {"size": len(self._data), "hits": self.hits, "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0}
+
+
+_MISSING = object()
@@ -0,0 +1,11 @@
+# Loaded in this order by TryhardBot.setup_hook
+EXTENSIONS = (
+    "cogs.moderation",
+    "cogs.triggers",
+    "cogs.ai",
+    "cogs.reminders",
+    "cogs.polls",
+    "cogs.daily_quote",
+    "cogs.settings",
+    "cogs.utilities",
+)
@@ -0,0 +1,352 @@
+import asyncio
+import json
+import os
+import random
+import re
+
+import discord
+from discord.ext import commands
+
+from gemini import JSONFieldStream
+from keyed_lock import Busy, KeyedLimiter
+from message_index import ChannelWindows, UserMessageIndex
+from metrics import CACHE_ENTRIES, CACHE_HIT_RATIO, REGISTRY
+from outbound import STATUS, LiveMessage
+from utils import resolve_lang_code
+
+# -- Mood Tracker (!mymood / !servermood): Gemini for one user, the batched lexicon for a whole guild
+SERVERMOOD_TOP = 3
+# buffers with fewer lexicon hits than this are left out of the rankings
+SERVERMOOD_MIN_HITS = 2
+
+
+async def collect_user_messages(guild: discord.Guild, user: discord.User, needed: int = 20, per_channel_limit: int = 200, global_scan_limit: int = 3000):
+    """Collect up to `needed` most-recent (message id, text) pairs by user across text channels (best-effort)."""
+    msgs = []
+    scanned = 0
+    if not guild:
+        return msgs
+    for channel in guild.text_channels:
+        if len(msgs) >= needed:
+            break
+        # skip channels bot can't read
+        if not channel.permissions_for(guild.me).read_message_history:
+            continue
+        try:
+            async for msg in channel.history(limit=per_channel_limit):
+                scanned += 1
+                if scanned > global_scan_limit or len(msgs) >= needed:
+                    break
+                if msg.author.id == user.id and msg.content:
+                    # keep a compact single-line version
+                    clean = msg.content.replace("\n", " ").strip()
+                    if clean:
+                        msgs.append((msg.id, clean[:200]))
+                        if len(msgs) >= needed:
+                            break
+        except Exception:
+            # perms or rate limits — ignore channel
+            continue
+    return msgs[:needed]
+
+
+# !moodplay answers: streamed with live status edits unless MOODPLAY_STREAM=0
+MOODPLAY_STREAM = os.getenv("MOODPLAY_STREAM", "1") != "0"
+MOODPLAY_FALLBACK = [
+    {"mood": "uplifting", "song_title": "Don't Stop Me Now", "artist": "Queen"},
+    {"mood": "chill", "song_title": "Lo-Fi Beats", "artist": "ChilledCow"},
+    {"mood": "happy", "song_title": "Happy", "artist": "Pharrell Williams"},
+    {"mood": "moody", "song_title": "Blinding Lights", "artist": "The Weeknd"},
+]
+
+
+def parse_song_json(raw: str):
+    """Parse the model's JSON answer, tolerating text around the object. None if unusable."""
+    if not raw:
+        return None
+    try:
+        data = json.loads(raw)
+    except Exception:
+        m = re.search(r"\{.*\}", raw, re.S)
+        if not m:
+            return None
+        try:
+            data = json.loads(m.group(0))
+        except Exception:
+            return None
+    return data if isinstance(data, dict) else None
+
+
+def pick_song(data) -> tuple:
+    """(mood, song_title, artist) from a parsed answer, falling back to a known-good pick."""
+    if not data or not isinstance(data, dict):
+        data = random.choice(MOODPLAY_FALLBACK)
+    mood = str(data.get("mood", "unknown")).strip() or "unknown"
+    song_title = str(data.get("song_title", "")).strip()
+    artist = str(data.get("artist", "")).strip()
+    if not song_title or not artist:
+        song_title, artist = "Don't Stop Me Now", "Queen"
+    return mood, song_title, artist
+
+
+def heuristic_mood_guess(texts: list[str]) -> str:
+    """Fallback mood guess without AI if Gemini fails."""
+    from mood import LEXICON
+
+    return LEXICON.mood(texts)
+
+
+class AI(commands.Cog):
+    """Gemini-backed commands (!moodplay, !mymood), !servermood and !translate, plus the chat indexes they read."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        # Per-shard partitions of per-guild state:
+        # last 20 snippets per (guild, user), fed by the pipeline so !mymood rarely touches history
+        self.user_index = bot.partitioned(lambda: UserMessageIndex(per_user=20))
+        # last 10 human chat lines per channel (prompt source for !moodplay)
+        self.channel_windows = bot.partitioned(lambda: ChannelWindows(size=10))
+        # Self-evicting concurrency guards: one !moodplay per channel (one more may queue),
+        # one !mymood per user, one !servermood per guild, and a couple of parallel !translate calls per user
+        self.moodplay_limiter = KeyedLimiter(concurrency=1, max_waiting=1)
+        self.mymood_limiter = KeyedLimiter(concurrency=1, max_waiting=0)
+        self.servermood_limiter = KeyedLimiter(concurrency=1, max_waiting=0)
+        self.translate_limiter = KeyedLimiter(concurrency=2, max_waiting=2)
+        CACHE_HIT_RATIO.source(lambda: self.user_index.merged_stats()["hit_rate"], "user_index")
+        CACHE_HIT_RATIO.source(lambda: self.channel_windows.merged_stats()["hit_rate"], "channel_window")
+        CACHE_ENTRIES.source(lambda: self.user_index.merged_stats().get("users", 0), "user_index")
+        CACHE_ENTRIES.source(lambda: self.channel_windows.merged_stats().get("channels", 0), "channel_window")
+        rejected = REGISTRY.gauge("busy_rejections", "Commands rejected because the key was already busy.", ("command",))
+        active = REGISTRY.gauge("keyed_limiter_keys", "Keys with in-flight or queued work.", ("command",))
+        for name, limiter in self.limiters().items():
+            rejected.source(lambda limiter=limiter: limiter.rejected, name)
+            active.source(lambda limiter=limiter: len(limiter), name)
+
+    async def cog_load(self):
+        self.bot.pipeline.register("index", 0, self.record_message)
+
+    async def cog_unload(self):
+        self.bot.pipeline.unregister("index")
+
+    async def record_message(self, mctx):
+        message = mctx.message
+        self.user_index.for_guild(mctx.guild_id).record(mctx.guild_id, message.author.id, message.id, mctx.content)
+        author = getattr(message.author, "display_name", str(message.author))
+        self.channel_windows.for_guild(mctx.guild_id).record(message.channel.id, message.id, author, mctx.content)
+
+    def limiters(self) -> dict:
+        return {"moodplay": self.moodplay_limiter, "mymood": self.mymood_limiter,
+                "servermood": self.servermood_limiter, "translate": self.translate_limiter}
+
+    async def limited(self, ctx, limiter: KeyedLimiter, key, work):
+        """Run `work()` under `limiter[key]`, replying "busy" instead of queueing without bound."""
+        try:
+            async with limiter.hold(key):
+                return await work()
+        except Busy:
+            await ctx.send("⏳ I'm still working on the last one of those — try again in a moment.")
+
+    @commands.command(name="moodplay")
+    async def moodplay(self, ctx):
+        await self.limited(ctx, self.moodplay_limiter, ctx.channel.id, lambda: self._moodplay(ctx))
+
+    async def _moodplay(self, ctx):
+        if MOODPLAY_STREAM:
+            return await self._moodplay_streaming(ctx)
+        outbox = self.bot.outbox
+        outbox.post(ctx, "⚡ Moodplay command triggered!", priority=STATUS)
+        outbox.post(ctx, "🔍 Collecting recent messages...", priority=STATUS)
+        prompt = await self._moodplay_prompt(ctx)
+
+        try:
+            outbox.post(ctx, "🤖 Talking to Gemini...", priority=STATUS)
+            raw = await self.bot.gemini.generate(prompt, json_mode=True)
+
+            # DEBUG: log raw Gemini output in Discord
+            if raw:
+                await outbox.send_as_file(ctx, raw, "gemini_raw.json", header="📝 Raw Gemini output:", priority=STATUS)
+            else:
+                outbox.post(ctx, "⚠️ Gemini returned no text.", priority=STATUS)
+
+            mood, song_title, artist = pick_song(parse_song_json(raw))
+            outbox.post(ctx, f"🎶 Mood: **{mood}**\nRecommendation: **{song_title} {artist}**")
+            await self._post_play(ctx, song_title, artist)
+
+        except Exception as e:
+            await outbox.safe_send(ctx, f"❌ Gemini step failed.\nError: {e}")
+
+    async def _moodplay_streaming(self, ctx):
+        # One status message edited as the answer streams in; m!play goes out as soon
+        # as song_title and artist are complete, before the JSON has even closed
+        status = LiveMessage(self.bot.outbox, ctx, min_interval=0.5)
+        status.update("⚡ Moodplay: 🔍 collecting recent messages...")
+        prompt = await self._moodplay_prompt(ctx)
+        status.update("⚡ Moodplay: 🤖 talking to Gemini...")
+
+        parser = JSONFieldStream()
+        played = None
+        try:
+            async for chunk in self.bot.gemini.stream(prompt, json_mode=True):
+                fields = parser.feed(chunk)
+                if played is None and fields.get("song_title", "").strip() and fields.get("artist", "").strip():
+                    _, song_title, artist = pick_song(fields)
+                    played = (song_title, artist)
+                    await self._post_play(ctx, song_title, artist)
+                    status.update(f"⚡ Moodplay: 🎶 **{song_title} {artist}** (reading the mood...)")
+        except Exception as e:
+            if played is None:
+                await status.finish(f"❌ Gemini step failed.\nError: {e}")
+                return
+
+        data = parser.fields or parse_song_json(parser.buffer)
+        mood, song_title, artist = pick_song(data)
+        if played is None:
+            await self._post_play(ctx, song_title, artist)
+        else:
+            song_title, artist = played
+        await status.finish(f"🎶 Mood: **{mood}**\nRecommendation: **{song_title} {artist}**")
+
+    async def _moodplay_prompt(self, ctx) -> str:
+        guild_id = ctx.guild.id if ctx.guild else 0
+        windows = self.channel_windows.for_guild(guild_id)
+        # Collect chat fragment: rolling window if warm, otherwise back-fill it from history once
+        lines = windows.lines(ctx.channel.id)
+        if lines is None:
+            history = []
+            async for msg in ctx.channel.history(limit=30):
+                if msg.author.bot:
+                    continue
+                history.append((msg.id, getattr(msg.author, "display_name", str(msg.author)), msg.content))
+            lines = windows.warm(ctx.channel.id, history)
+        preview = "\n".join(lines)
+
+        return (
+            "You are a DJ. Read the chat fragment and output STRICT JSON matching this schema:\n"
+            "{ \"song_title\": string, \"artist\": string, \"mood\": string }\n"
+            "- Choose EXACTLY ONE specific, real song.\n"
+            "- 'song_title' must be the official song name only (no extra text).\n"
+            "- 'artist' must be the main performing artist only (no features unless essential).\n"
+            "- Do not add commentary. Only output JSON.\n\n"
+            f"Chat fragment:\n{preview}"
+        )
+
+    async def _post_play(self, ctx, song_title: str, artist: str):
+        play_cmd = f"m!play {song_title} - {artist}"
+        # sent on its own (never merged) so music bots see a bare command
+        await self.bot.outbox.send(ctx, play_cmd, allowed_mentions=discord.AllowedMentions.none())
+
+    # -- Translate Command (!translate <lang> <text>) using deep_translator (GoogleTranslator)
+    @commands.command(name="translate")
+    async def translate_cmd(self, ctx, lang: str = None, *, text: str = None):
+        """
+        Translate text into a target language.
+        Usage: !translate <lang> <text>
+        Examples:
+          !translate es Hello, how are you?
+          !translate japanese I love ramen
+        """
+        if not lang or not text:
+            return await ctx.send("Usage: `!translate <lang> <text>` e.g., `!translate es good morning`")
+        target = resolve_lang_code(lang)
+        await self.limited(ctx, self.translate_limiter, ctx.author.id, lambda: self._translate(ctx, text, target))
+
+    async def _translate(self, ctx, text: str, target: str):
+        try:
+            translated_text = await self.bot.translator.translate(text, target)
+            await ctx.send(f"🌍 **{translated_text}** *(auto → {target})*")
+        except Exception as e:
+            await ctx.send(f"❌ Translation failed: {e}")
+
+    @commands.command(name="mymood")
+    async def mymood(self, ctx):
+        """Analyze last 20 messages sent by the invoking user and report mood."""
+        await self.limited(ctx, self.mymood_limiter, ctx.author.id, lambda: self._mymood(ctx))
+
+    async def _mymood(self, ctx):
+        await ctx.send("🧠 Analyzing your recent messages...")
+        guild_id = ctx.guild.id if ctx.guild else 0
+        index = self.user_index.for_guild(guild_id)
+        texts = index.recent(guild_id, ctx.author.id, 20)
+        if len(texts) < 20 and not index.is_warm(guild_id, ctx.author.id):
+            # Index miss: warm it once from history. Prefer cross-channel (guild)
+            # collection, fallback to current channel only
+            found = []
+            if ctx.guild:
+                found = await collect_user_messages(ctx.guild, ctx.author, needed=20, per_channel_limit=100, global_scan_limit=2000)
+            if not found:
+                async for msg in ctx.channel.history(limit=300):
+                    if msg.author.id == ctx.author.id and msg.content:
+                        found.append((msg.id, msg.content))
+                        if len(found) >= 20:
+                            break
+            index.warm(guild_id, ctx.author.id, found)
+            texts = index.recent(guild_id, ctx.author.id, 20)
+        if not texts:
+            return await ctx.send("😕 I couldn’t find enough of your messages to analyze.")
+        fragment = "\n".join(texts)
+
+        prompt = (
+            "You will receive up to 20 recent messages from ONE user. "
+            "Infer their CURRENT OVERALL MOOD as a single lowercase word from this set:\n"
+            "[happy, sad, stressed, chill, angry, excited, bored, anxious, neutral].\n"
+            "Rules:\n"
+            "- Respond with ONLY one word, no punctuation or explanations.\n"
+            "- If uncertain, respond with 'neutral'.\n\n"
+            f"MESSAGES:\n{fragment}\n\n"
+            "MOOD:"
+        )
+        mood = None
+        try:
+            mood_raw = (await self.bot.gemini.generate(prompt)).strip().lower()
+            # sanitize to a single token
+            mood = re.sub(r"[^a-z]", "", mood_raw)
+            if not mood:
+                raise ValueError("Empty AI response.")
+        except Exception:
+            mood = heuristic_mood_guess(texts)
+
+        await ctx.send(f"🧭 Based on your last 20 messages, your mood seems to be: **{mood}**")
+
+    @commands.command(name="servermood")
+    @commands.guild_only()
+    async def servermood(self, ctx):
+        """Rank the moods of this server's channels and chatters from the chat indexes (no AI calls)."""
+        await self.limited(ctx, self.servermood_limiter, ctx.guild.id, lambda: self._servermood(ctx))
+
+    async def _servermood(self, ctx):
+        from mood import LEXICON
+
+        guild = ctx.guild
+        windows = self.channel_windows.for_guild(guild.id)
+        buffers = {("user", uid): texts for uid, texts in self.user_index.for_guild(guild.id).guild_buffers(guild.id).items()}
+        for channel in guild.text_channels:
+            texts = windows.texts(channel.id)
+            if texts:
+                buffers[("channel", channel.id)] = texts
+        # every user and channel of the guild in one scoring batch, off the event loop
+        results = await asyncio.to_thread(LEXICON.rank, buffers)
+        users = [r for r in results if r.key[0] == "user"]
+        overall = LEXICON.overall(users)
+        users = [r for r in users if r.hits >= SERVERMOOD_MIN_HITS]
+        channels = [r for r in results if r.key[0] == "channel" and r.hits >= SERVERMOOD_MIN_HITS]
+        if not users and not channels:
+            return await ctx.send("😶 Not enough recent chat here to read the room yet.")
+
+        embed = discord.Embed(title=f"🌡️ Server mood: {overall}", color=discord.Color.teal(),
+                              description=f"Read from the recent messages of {len(users)} people in {len(channels)} channels.")
+
+        def field(name, ranked, mention):
+            if ranked:
+                value = "\n".join(f"{mention(r.key[1])} · **{r.mood}** ({r.valence:+.1f})" for r in ranked)
+                embed.add_field(name=name, value=value, inline=False)
+
+        # rankings run most positive first; the gloomy lists read from the other end
+        field("☀️ Brightest channels", [r for r in channels if r.valence > 0][:SERVERMOOD_TOP], lambda i: f"<#{i}>")
+        field("🌧️ Gloomiest channels", [r for r in reversed(channels) if r.valence < 0][:SERVERMOOD_TOP], lambda i: f"<#{i}>")
+        field("😄 Happiest chatters", [r for r in users if r.valence > 0][:SERVERMOOD_TOP], lambda i: f"<@{i}>")
+        field("🫂 Could use some love", [r for r in reversed(users) if r.valence < 0][:SERVERMOOD_TOP], lambda i: f"<@{i}>")
+        await ctx.send(embed=embed, allowed_mentions=discord.AllowedMentions.none())
+
+
+async def setup(bot):
+    await bot.add_cog(AI(bot))
@@ -0,0 +1,176 @@
+import datetime as dt
+import os
+
+import discord
+from discord.ext import commands
+
+from broadcast import DailyBroadcaster, GuildSchedule, Undeliverable
+from metrics import REGISTRY
+from outbound import STATUS
+from utils import log_command_error, parse_clock, parse_timezone
+
+# Guilds that never ran !dailyquote get the quote at this local time (the old fixed 8 AM UTC+8)
+DAILY_QUOTE_TZ = os.getenv("DAILY_QUOTE_TZ", "UTC+8")
+DAILY_QUOTE_TIME = os.getenv("DAILY_QUOTE_TIME", "08:00")
+# Sends in flight at once while fanning a quote out to every due guild
+DAILY_QUOTE_CONCURRENCY = int(os.getenv("DAILY_QUOTE_CONCURRENCY", 20))
+
+
+def default_channel(guild: discord.Guild):
+    """#general if the bot can post there, else the first text channel it can post in."""
+    me = guild.me
+    usable = [c for c in guild.text_channels if me is None or c.permissions_for(me).send_messages]
+    return discord.utils.get(usable, name="general") or (usable[0] if usable else None)
+
+
+class DailyQuote(commands.Cog):
+    """Daily motivational quote for every guild, at each guild's own time and channel."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        # guild_id -> default channel id; refreshed per guild on channel/guild events,
+        # so a broadcast never scans channels
+        self.channels = {}
+        self.broadcaster = DailyBroadcaster(
+            os.getenv("DAILY_DB", "daily.db"), fetch=bot.get_quote, send=self.post,
+            default_tz=DAILY_QUOTE_TZ, default_at=parse_clock(DAILY_QUOTE_TIME),
+            concurrency=DAILY_QUOTE_CONCURRENCY,
+        )
+        REGISTRY.gauge("daily_quote_guilds", "Guilds scheduled for the daily quote.").source(lambda: len(self.broadcaster))
+
+    async def cog_load(self):
+        self.broadcaster.start()
+        # on reload the guilds are already cached and no guild_available will come
+        for guild in self.bot.guilds:
+            self.index(guild)
+
+    async def cog_unload(self):
+        await self.broadcaster.stop()
+
+    def index(self, guild: discord.Guild):
+        channel = default_channel(guild)
+        if channel is None:
+            self.channels.pop(guild.id, None)
+        else:
+            self.channels[guild.id] = channel.id
+        self.broadcaster.track(guild.id)
+
+    def forget(self, guild: discord.Guild):
+        self.channels.pop(guild.id, None)
+        self.broadcaster.untrack(guild.id)
+
+    async def post(self, schedule: GuildSchedule, quote: str):
+        channel = None
+        if schedule.channel_id is not None:
+            channel = self.bot.get_channel(schedule.channel_id)
+        if channel is None:
+            # no channel configured, or it was deleted: fall back to the guild's default
+            channel = self.bot.get_channel(self.channels.get(schedule.guild_id, 0))
+        if channel is None:
+            raise Undeliverable(f"no usable channel in guild {schedule.guild_id}")
+        try:
+            await self.bot.outbox.send(channel, f"🌞 Daily Motivation:\n> {quote}", priority=STATUS)
+        except (discord.Forbidden, discord.NotFound) as e:
+            raise Undeliverable(str(e)) from e
+
+    @commands.Cog.listener()
+    async def on_guild_available(self, guild):
+        self.index(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild):
+        self.index(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.forget(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_unavailable(self, guild):
+        self.forget(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        if isinstance(channel, discord.TextChannel):
+            self.index(channel.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        if isinstance(channel, discord.TextChannel):
+            self.index(channel.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        # renamed to/from #general, or permissions changed
+        if isinstance(after, discord.TextChannel) and (before.name != after.name or before.overwrites != after.overwrites):
+            self.index(after.guild)
+
+    def describe(self, guild: discord.Guild) -> str:
+        s = self.broadcaster.schedule_for(guild.id)
+        if not s.enabled:
+            return "🌙 Daily quotes are **off** here. Turn them on with `!dailyquote on`."
+        channel_id = s.channel_id or self.channels.get(guild.id)
+        where = f"<#{channel_id}>" if channel_id else "*(no channel I can post in)*"
+        due = dt.datetime.fromtimestamp(self.broadcaster.next_due(guild.id), dt.timezone.utc)
+        return (f"🌞 Daily quote at **{s.at:%H:%M}** ({s.tz}) in {where}"
+                f"{'' if s.channel_id else ' (default)'} · next {discord.utils.format_dt(due, 'R')}")
+
+    # !dailyquote [channel #ch | time HH:MM | tz UTC+8 | on | off]
+    @commands.group(name="dailyquote", invoke_without_command=True)
+    @commands.guild_only()
+    async def dailyquote(self, ctx):
+        """Show this server's daily quote schedule."""
+        await ctx.send(self.describe(ctx.guild))
+
+    @dailyquote.command(name="channel")
+    @commands.has_guild_permissions(manage_guild=True)
+    async def dailyquote_channel(self, ctx, channel: discord.TextChannel = None):
+        """Post here (or in the given channel); no argument resets to the default channel."""
+        self.broadcaster.configure(ctx.guild.id, channel_id=channel.id if channel else None)
+        await ctx.send(self.describe(ctx.guild))
+
+    @dailyquote.command(name="time")
+    @commands.has_guild_permissions(manage_guild=True)
+    async def dailyquote_time(self, ctx, when: str):
+        try:
+            at = parse_clock(when)
+        except ValueError as e:
+            return await ctx.send(f"⏱️ {e} e.g. `!dailyquote time 07:30`")
+        self.broadcaster.configure(ctx.guild.id, at=at)
+        await ctx.send(self.describe(ctx.guild))
+
+    @dailyquote.command(name="tz")
+    @commands.has_guild_permissions(manage_guild=True)
+    async def dailyquote_tz(self, ctx, *, tz: str):
+        try:
+            parse_timezone(tz)
+        except ValueError:
+            return await ctx.send("🌐 Unknown timezone. Use an offset like `UTC+8` / `UTC-5:30` or a name like `Europe/London`.")
+        self.broadcaster.configure(ctx.guild.id, tz=tz.strip())
+        await ctx.send(self.describe(ctx.guild))
+
+    @dailyquote.command(name="on")
+    @commands.has_guild_permissions(manage_guild=True)
+    async def dailyquote_on(self, ctx):
+        self.broadcaster.configure(ctx.guild.id, enabled=True)
+        await ctx.send(self.describe(ctx.guild))
+
+    @dailyquote.command(name="off")
+    @commands.has_guild_permissions(manage_guild=True)
+    async def dailyquote_off(self, ctx):
+        self.broadcaster.configure(ctx.guild.id, enabled=False)
+        await ctx.send(self.describe(ctx.guild))
+
+    async def cog_command_error(self, ctx, error):
+        if isinstance(error, commands.MissingPermissions):
+            await ctx.send("🔒 You need the **Manage Server** permission to change the daily quote.")
+        elif isinstance(error, commands.NoPrivateMessage):
+            await ctx.send("🌞 Daily quotes are set up per server; run this in one.")
+        elif isinstance(error, (commands.BadArgument, commands.MissingRequiredArgument)):
+            await ctx.send(f"🌞 {error} Usage: `!dailyquote [channel #ch | time HH:MM | tz UTC+8 | on | off]`")
+        else:
+            log_command_error(ctx, error)
+
+
+async def setup(bot):
+    await bot.add_cog(DailyQuote(bot))
@@ -0,0 +1,46 @@
+import os
+
+from discord.ext import commands
+
+from metrics import REGISTRY
+from wordfilter import WordFilter
+
+# 👤 Kalvin
+TARGET_USER_ID = 620792701201154048
+# Users the filter applies to in servers that haven't set their own (!config filter add/remove)
+DEFAULT_TARGETS = frozenset({TARGET_USER_ID})
+
+
+class Moderation(commands.Cog):
+    """The target-user banned-word filter."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        # Banned-word filter for the target user (word file is hot-reloaded if present)
+        self.filter = WordFilter(path=os.getenv("BANNED_WORDS_FILE", "banned_words.txt"))
+        REGISTRY.gauge("word_filter_avg_seconds", "Average banned-word filter time per message.").source(
+            lambda: self.filter.stats.as_dict()["avg_us"] / 1e6)
+
+    async def cog_load(self):
+        self.bot.pipeline.register("target_filter", 20, self.target_filter)
+
+    async def cog_unload(self):
+        self.bot.pipeline.unregister("target_filter")
+
+    # just for kalvin HAHAHAHHAAH
+    async def target_filter(self, mctx):
+        message = mctx.message
+        cfg = mctx.config
+        targets = DEFAULT_TARGETS if cfg.filter_users is None else cfg.filter_users
+        if message.author.id not in targets or not cfg.enabled("filter") \
+                or not self.filter.check(mctx.content, mctx.folded):
+            return
+        try:
+            await message.delete()
+        except Exception:
+            pass
+        self.bot.outbox.post(message.channel, f"{message.author.mention} just called himself gay!")
+
+
+async def setup(bot):
+    await bot.add_cog(Moderation(bot))
@@ -0,0 +1,240 @@
+import datetime as dt
+import os
+import random
+import re
+
+import discord
+from discord.ext import commands
+
+from metrics import REGISTRY
+from utils import parse_duration_to_seconds
+from votes import Poll, VoteTracker
+
+# -- Would You Rather (!wyr)
+WYR_QUESTIONS = [
+    "Would you rather be invisible or be able to fly?",
+    "Would you rather have unlimited sushi for life or unlimited tacos for life?",
+    "Would you rather always be 10 minutes late or always be 20 minutes early?",
+    "Would you rather fight 100 duck-sized horses or 1 horse-sized duck?",
+    "Would you rather know the history of every object you touch or be able to talk to animals?",
+    "Would you rather never use social media again or never watch another movie or TV show?",
+    "Would you rather teleport anywhere or be able to read minds?",
+    "Would you rather have the ability to see 10 minutes into the future or 150 years into the future?",
+    "Would you rather be forced to sing along to every song you hear or dance to every song you hear?",
+    "Would you rather have a personal maid or a personal chef?",
+    "Would you rather lose your sight or your memories?",
+    "Would you rather always have a full phone battery or a full gas tank?",
+    "Would you rather have super strength or super speed?",
+    "Would you rather be able to speak all languages or be able to speak to animals?",
+    "Would you rather be the funniest person in the room or the smartest?",
+    "Would you rather live in a world where it pours whenever you sneeze or thunder claps whenever you laugh?",
+    "Would you rather never be stuck in traffic again or never get another cold?",
+    "Would you rather live without music or live without video games?",
+    "Would you rather drink only water or only coffee for the rest of your life?",
+    "Would you rather be an unknown superhero or a famous villain?",
+    "Would you rather always step on a LEGO or always feel like you need to sneeze?",
+    "Would you rather give up pizza forever or give up burgers forever?",
+    "Would you rather have one real get-out-of-jail-free card or a key that opens any door?",
+    "Would you rather glow bright pink every time you’re embarrassed or have a loud honk whenever you’re stressed?",
+    "Would you rather be able to pause time or rewind time?",
+    "Would you rather have to listen to only one song forever or watch only one movie forever?",
+    "Would you rather be rich and lonely or poor and popular?",
+    "Would you rather read the book or watch the movie?",
+    "Would you rather live in space or live under the sea?",
+    "Would you rather be the best player on a losing team or the worst player on a winning team?",
+    "Would you rather only be able to whisper or only be able to shout?",
+    "Would you rather be able to change the past or see into the future?",
+    "Would you rather always have the perfect comeback or always get the last laugh?",
+    "Would you rather wear wet socks for a day or wear winter gloves all day in summer?",
+    "Would you rather never have to sleep or never have to eat?",
+    "Would you rather find true love today or win the lottery next year?",
+    "Would you rather have free international flights for life or never pay for food at restaurants?",
+    "Would you rather only talk in rhymes or only talk in riddles?",
+    "Would you rather have your dream job but no time for friends, or a simple job with tons of time for friends?",
+    "Would you rather always feel slightly too hot or slightly too cold?",
+    "Would you rather be trapped in a romantic comedy with your enemies or a horror movie with your friends?",
+    "Would you rather be able to only move by skipping or only move by crawling?",
+    "Would you rather never use emojis again or never watch memes again?",
+    "Would you rather own a dragon or be a dragon?",
+    "Would you rather travel the world for a year on a shoestring budget or stay in one country in luxury?",
+    "Would you rather have a rewind button on your life or a pause button?",
+    "Would you rather live with no internet or no AC/heating?",
+    "Would you rather always get stuck behind slow walkers or always be stuck in traffic?",
+    "Would you rather have a photographic memory or be able to forget anything you want?",
+    "Would you rather only eat spicy food or only eat bland food?",
+    "Would you rather never age physically or never age mentally?",
+    "Would you rather always say what you’re thinking or never speak again?",
+    "Would you rather give up your smartphone for a week or give up sugar for a week?",
+    "Would you rather be able to clone yourself once or time travel once?",
+    "Would you rather be famous for something embarrassing or unknown for something meaningful?",
+]
+
+NUMBER_EMOJIS = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "6️⃣", "7️⃣", "8️⃣", "9️⃣", "🔟"]
+# !wyr questions stay open this long (a !poll without a duration stays open for a week)
+WYR_DURATION = 86400
+# A leading argument like 10m / 1h30m on !poll sets an auto-close timer
+DURATION_ARG = re.compile(r"(\d+[smhd])+", re.IGNORECASE)
+
+
+def bar(count: int, total: int, width: int = 12) -> str:
+    filled = round(width * count / total) if total else 0
+    return "█" * filled + "░" * (width - filled)
+
+
+def results_embed(poll: Poll, title: str, color) -> discord.Embed:
+    total = poll.total
+    lines = []
+    for emoji, option, count in zip(poll.emojis, poll.options, poll.counts):
+        pct = f"{count / total:.0%}" if total else "0%"
+        label = emoji if option == emoji else f"{emoji} {option}"
+        lines.append(f"{label}\n`{bar(count, total)}` **{count}** ({pct})")
+    embed = discord.Embed(title=title, description="\n".join(lines), color=color)
+    closes = dt.datetime.fromtimestamp(poll.closed_at or poll.closes_at, dt.timezone.utc)
+    state = "closed" if poll.closed else "closes"
+    embed.set_footer(text=f"{total} vote{'s' if total != 1 else ''} · {state}")
+    embed.timestamp = closes
+    return embed
+
+
+class Polls(commands.Cog):
+    """!poll / !wyr with live reaction tallies, timed auto-close and !pollresults."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        # Votes are counted from raw reaction events into in-memory tallies (flushed to SQLite)
+        # (each shard worker only loads polls for its own guilds)
+        shards = bot.shard_config
+        self.tracker = VoteTracker(os.getenv("POLL_DB", "polls.db"), on_change=self.refresh_embed,
+                                   on_close=self.announce_close,
+                                   shard_ids=shards.shard_ids if shards.partial else None,
+                                   shard_count=shards.shard_count or 1)
+        REGISTRY.gauge("polls_tracked", "Polls held by the vote tracker.").source(lambda: len(self.tracker))
+        REGISTRY.gauge("poll_votes_unflushed", "Vote changes not yet written to SQLite.").source(
+            lambda: self.tracker.stats()["unflushed"])
+
+    async def cog_load(self):
+        self.tracker.start()
+
+    async def cog_unload(self):
+        await self.tracker.stop()
+
+    def render(self, poll: Poll) -> discord.Embed:
+        color = discord.Color.dark_grey() if poll.closed else discord.Color.blue()
+        return results_embed(poll, ("🔒 " if poll.closed else "") + poll.question, color)
+
+    def _partial(self, poll: Poll):
+        channel = self.bot.get_channel(poll.channel_id)
+        return channel.get_partial_message(poll.message_id) if channel is not None else None
+
+    async def refresh_embed(self, poll: Poll):
+        msg = self._partial(poll)
+        if msg is not None:
+            await msg.edit(content=None, embed=self.render(poll))
+
+    async def announce_close(self, poll: Poll):
+        msg = self._partial(poll)
+        if msg is None:
+            return
+        await msg.edit(content=None, embed=self.render(poll))
+        if poll.announce:
+            winners = poll.winners()
+            if not winners:
+                text = "nobody voted"
+            else:
+                text = " / ".join(f"{poll.emojis[i]} **{poll.options[i]}**" for i in winners)
+                text += f" with {poll.counts[winners[0]]} of {poll.total} votes"
+            self.bot.outbox.post(msg.channel, f"🔒 Poll closed: **{poll.question}** — {text}", reference=msg)
+
+    async def _start_poll(self, ctx, msg, question: str, options: list, emojis: list, duration: float = None,
+                          announce: bool = False):
+        self.tracker.create(msg.id, ctx.guild.id if ctx.guild else None, ctx.channel.id, ctx.author.id,
+                            question, options, emojis, duration, announce)
+        for emoji in emojis:
+            try:
+                await msg.add_reaction(emoji)
+            except Exception:
+                pass
+
+    async def _on_reaction(self, payload: discord.RawReactionActionEvent, added: bool):
+        if self.bot.user is not None and payload.user_id == self.bot.user.id:
+            return
+        self.tracker.react(payload.message_id, payload.user_id, str(payload.emoji), added)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_add(self, payload):
+        await self._on_reaction(payload, True)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_remove(self, payload):
+        await self._on_reaction(payload, False)
+
+    @commands.command(name="wyr")
+    async def wyr(self, ctx):
+        """Send a Would You Rather question and add vote reactions."""
+        q = random.choice(WYR_QUESTIONS)
+        # Try to split into two options for display if possible
+        opt_a, opt_b = None, None
+        # Common "or" splitter
+        if " or " in q.lower():
+            parts = re.split(r"\s+or\s+", q, flags=re.IGNORECASE)
+            if len(parts) == 2:
+                opt_a, opt_b = parts[0].strip(" ?"), parts[1].strip(" ?")
+        desc = ""
+        if opt_a and opt_b:
+            desc = f"1️⃣ {opt_a}\n2️⃣ {opt_b}"
+        embed = discord.Embed(title="🤔 Would You Rather...", description=desc or q, color=discord.Color.blurple())
+        msg = await ctx.send(embed=embed if desc else None, content=None if desc else f"🤔 {q}")
+        # Always add 1 and 2 for consistency
+        # (a question that couldn't be split is tallied as plain 1️⃣ / 2️⃣)
+        options = [opt_a, opt_b] if desc else NUMBER_EMOJIS[:2]
+        await self._start_poll(ctx, msg, embed.title if desc else f"🤔 {q}", options, NUMBER_EMOJIS[:2], WYR_DURATION)
+
+    # Poll command: !poll [duration] <question> <option1> <option2> ...
+    @commands.command()
+    async def poll(self, ctx, *args):
+        usage = "Usage: !poll [10m|1h|1d] <question> <option1> <option2> [option3] ... (max 10 options)"
+        duration = None
+        if len(args) > 3 and DURATION_ARG.fullmatch(args[0]):
+            try:
+                duration = parse_duration_to_seconds(args[0])
+            except ValueError:  # e.g. 0m
+                await ctx.send(usage)
+                return
+            args = args[1:]
+        if len(args) < 3:
+            await ctx.send(usage)
+            return
+
+        question = args[0]
+        options = list(args[1:])
+
+        if len(options) > 10:
+            await ctx.send("You can’t have more than 10 options.")
+            return
+
+        emojis = NUMBER_EMOJIS[:len(options)]
+        description = ""
+        for emoji, option in zip(emojis, options):
+            description += f"{emoji} {option}\n"
+
+        embed = discord.Embed(title=question, description=description, color=discord.Color.blue())
+        if duration:
+            closes = dt.datetime.now(dt.timezone.utc) + dt.timedelta(seconds=duration)
+            embed.add_field(name="⏳ Closes", value=discord.utils.format_dt(closes, "R"))
+        msg = await ctx.send(embed=embed)
+        # a timed poll posts its result when it closes
+        await self._start_poll(ctx, msg, question, options, emojis, duration, announce=duration is not None)
+
+    @commands.command(name="pollresults")
+    async def pollresults(self, ctx, message_id: int = None):
+        """Usage: !pollresults [message id] (or reply to the poll; defaults to the latest poll here)"""
+        if message_id is None and ctx.message.reference is not None:
+            message_id = ctx.message.reference.message_id
+        poll = self.tracker.get(message_id) if message_id else self.tracker.latest_in(ctx.channel.id)
+        if poll is None:
+            return await ctx.send("❓ I'm not tracking that poll (it may have expired).")
+        await ctx.send(embed=self.render(poll))
+
+
+async def setup(bot):
+    await bot.add_cog(Polls(bot))
@@ -0,0 +1,92 @@
+import datetime as dt
+import os
+
+import discord
+from discord.ext import commands
+
+from metrics import REGISTRY
+from reminders import Reminder, ReminderScheduler
+from utils import parse_duration_to_seconds
+
+# Longest accepted !remindme duration
+MAX_REMINDER_SECONDS = 365 * 86400
+# Latest timestamp !reminders can render
+MAX_DUE = dt.datetime(9999, 1, 1, tzinfo=dt.timezone.utc).timestamp()
+USAGE = "Usage: `!remindme <10s|10m|2h|1d|1h30m> <message>` (up to 1 year ahead)"
+
+
+class Reminders(commands.Cog):
+    """!remindme / !reminders / !cancelreminder backed by the persistent scheduler."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        # Reminders persist in SQLite and are fired by one dispatcher task (survive restarts)
+        # (each shard worker only loads/fires reminders for its own shards)
+        shards = bot.shard_config
+        self.scheduler = ReminderScheduler(os.getenv("REMINDER_DB", "reminders.db"), self.deliver,
+                                           shard_ids=shards.shard_ids if shards.partial else None,
+                                           shard_count=shards.shard_count or 1)
+        REGISTRY.gauge("reminders_pending", "Reminders in the dispatcher heap.").source(lambda: len(self.scheduler))
+
+    async def cog_load(self):
+        await self.scheduler.start()
+
+    async def cog_unload(self):
+        await self.scheduler.stop()
+
+    async def deliver(self, r: Reminder):
+        await self.bot.wait_until_ready()
+        channel = self.bot.get_channel(r.channel_id) or await self.bot.fetch_channel(r.channel_id)
+        late = dt.datetime.now().timestamp() - r.due
+        suffix = " *(sorry, I was offline when this was due)*" if late > 60 else ""
+        await self.bot.outbox.send(channel, f"🔔 Reminder for <@{r.user_id}>: {r.text}{suffix}",
+                                   allowed_mentions=discord.AllowedMentions(users=True, everyone=False, roles=False))
+
+    # -- Reminder System (!remindme 10m <message>) w/ combo support like 1h30m
+    @commands.command(name="remindme")
+    async def remindme(self, ctx, time: str = None, *, message: str = None):
+        """
+        Usage: !remindme <duration> <message>
+        Examples:
+          !remindme 10m stretch
+          !remindme 1h30m take a break
+          !remindme 2d submit assignment
+        """
+        if not time or not message:
+            return await ctx.send(USAGE)
+        try:
+            seconds = parse_duration_to_seconds(time)
+        except ValueError:
+            return await ctx.send("⏱️ Invalid duration. Examples: `10m`, `1h30m`, `2d4h`, `45s`")
+        if seconds > MAX_REMINDER_SECONDS:
+            return await ctx.send(f"⏱️ That's too far ahead. {USAGE}")
+        rid = self.scheduler.add(ctx.guild.id if ctx.guild else None, ctx.channel.id, ctx.author.id, seconds, message)
+        await ctx.send(f"⏰ Okay {ctx.author.mention}, I’ll remind you in **{time}**: {message} *(id `{rid}`)*")
+
+    @commands.command(name="reminders")
+    async def reminders_cmd(self, ctx):
+        """List your pending reminders."""
+        pending = self.scheduler.pending_for(ctx.author.id, limit=10)
+        if not pending:
+            return await ctx.send("📭 You have no pending reminders.")
+        # (clamped: reminders stored before the duration cap can lie past datetime's range)
+        lines = [
+            f"`{r.id}` — {discord.utils.format_dt(dt.datetime.fromtimestamp(min(r.due, MAX_DUE), dt.timezone.utc), 'R')}:"
+            f" {r.text[:100]}"
+            for r in pending
+        ]
+        await self.bot.outbox.safe_send(ctx, "⏰ Your pending reminders:\n" + "\n".join(lines))
+
+    @commands.command(name="cancelreminder")
+    async def cancelreminder(self, ctx, rid: int = None):
+        """Usage: !cancelreminder <id>"""
+        if rid is None:
+            return await ctx.send("Usage: `!cancelreminder <id>` (see `!reminders` for ids)")
+        if self.scheduler.cancel(rid, ctx.author.id):
+            await ctx.send(f"🗑️ Reminder `{rid}` cancelled.")
+        else:
+            await ctx.send(f"❓ No pending reminder `{rid}` of yours.")
+
+
+async def setup(bot):
+    await bot.add_cog(Reminders(bot))
@@ -0,0 +1,171 @@
+import discord
+from discord.ext import commands
+
+from cogs.moderation import DEFAULT_TARGETS
+from cogs.triggers import SIXTY_SEVEN_GIF, SPEED_GIF, THANKS_GIF
+from guild_settings import MAX_PHRASE, MAX_RESPONSE, MAX_RULES, MENTION_SYNTAX
+from utils import log_command_error
+
+# Auto-replies a server can switch off with !config disable <name>
+TOGGLES = {
+    "sixtyseven": "6 7 / six seven gif",
+    "sad": "sadness check-in quote",
+    "thanks": "thank you gif",
+    "speed": "plz speed gif",
+    "custom": "this server's custom rules",
+    "filter": "banned-word filter",
+}
+# Built-in replies a server can swap with !config reply <name> <text>
+REPLY_DEFAULTS = {"thanks": THANKS_GIF, "speed": SPEED_GIF, "sixtyseven": SIXTY_SEVEN_GIF}
+NO_MENTIONS_HINT = "⚙️ Replies can't contain mentions (`@everyone`, `@here`, users or roles)."
+
+
+class Settings(commands.Cog):
+    """!config: per-server trigger toggles, custom phrase rules, reply overrides and filter targets."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    def edit(self, ctx, change):
+        return self.bot.settings.edit(ctx.guild.id, change)
+
+    # !config [enable|disable <name> | rule add|remove | rules | reply <name> <text> | filter add|remove @user]
+    @commands.group(name="config", invoke_without_command=True)
+    @commands.guild_only()
+    async def config(self, ctx):
+        """Show this server's settings."""
+        cfg = self.bot.settings.get(ctx.guild.id)
+        toggles = " · ".join(f"{'✅' if cfg.enabled(name) else '❌'} `{name}`" for name in TOGGLES)
+        users = DEFAULT_TARGETS if cfg.filter_users is None else cfg.filter_users
+        lines = [
+            "⚙️ **Server settings**",
+            f"Auto-replies: {toggles}",
+            f"Custom rules: **{len(cfg.rules)}**/{MAX_RULES} (`!config rules`)",
+            f"Reply overrides: {', '.join(f'`{n}`' for n in cfg.responses) or 'none'}",
+            f"Filter applies to: {', '.join(f'<@{u}>' for u in sorted(users)) or 'nobody'}"
+            f"{' (default)' if cfg.filter_users is None else ''}",
+            "Admins: `!config enable|disable <name>` · `!config rule add \"<phrase>\" <reply>` ·"
+            " `!config rule remove <n>` · `!config reply <thanks|speed|sixtyseven> <text|reset>` ·"
+            " `!config filter add|remove @user`",
+        ]
+        await ctx.send("\n".join(lines), allowed_mentions=discord.AllowedMentions.none())
+
+    async def _toggle(self, ctx, name: str, on: bool):
+        name = name.lower()
+        if name not in TOGGLES:
+            return await ctx.send(f"❓ Unknown auto-reply. Pick one of: {', '.join(f'`{n}`' for n in TOGGLES)}")
+
+        def change(data):
+            disabled = set(data.get("disabled", ()))
+            (disabled.discard if on else disabled.add)(name)
+            data["disabled"] = sorted(disabled)
+
+        self.edit(ctx, change)
+        await ctx.send(f"{'✅ Enabled' if on else '❌ Disabled'} **{name}** ({TOGGLES[name]}).")
+
+    @config.command(name="enable")
+    @commands.has_guild_permissions(manage_guild=True)
+    async def enable(self, ctx, name: str):
+        await self._toggle(ctx, name, True)
+
+    @config.command(name="disable")
+    @commands.has_guild_permissions(manage_guild=True)
+    async def disable(self, ctx, name: str):
+        await self._toggle(ctx, name, False)
+
+    @config.command(name="rules")
+    @commands.has_guild_permissions(manage_guild=True)
+    async def rules(self, ctx):
+        cfg = self.bot.settings.get(ctx.guild.id)
+        if not cfg.rules:
+            return await ctx.send('📭 No custom rules. Add one with `!config rule add "<phrase>" <reply>`.')
+        lines = [f"`{i + 1}` **{phrase}** → {reply[:80]}" for i, (phrase, reply) in enumerate(cfg.rules)]
+        await self.bot.outbox.safe_send(ctx, "🧩 Custom rules:\n" + "\n".join(lines),
+                                        allowed_mentions=discord.AllowedMentions.none())
+
+    @config.group(name="rule", invoke_without_command=True)
+    @commands.has_guild_permissions(manage_guild=True)
+    async def rule(self, ctx):
+        await ctx.send('Usage: `!config rule add "<phrase>" <reply>` or `!config rule remove <n>`')
+
+    @rule.command(name="add")
+    @commands.has_guild_permissions(manage_guild=True)
+    async def rule_add(self, ctx, phrase: str, *, reply: str):
+        phrase = " ".join(phrase.lower().split())
+        if not phrase or len(phrase) > MAX_PHRASE or len(reply) > MAX_RESPONSE:
+            return await ctx.send(f"⚙️ Phrases can be up to {MAX_PHRASE} characters, replies up to {MAX_RESPONSE}.")
+        if MENTION_SYNTAX.search(reply):
+            return await ctx.send(NO_MENTIONS_HINT)
+        if len(self.bot.settings.get(ctx.guild.id).rules) >= MAX_RULES:
+            return await ctx.send(f"⚙️ This server already has {MAX_RULES} rules; remove one first.")
+
+        def change(data):
+            rules = [r for r in data.get("rules", []) if r["phrase"] != phrase]
+            rules.append({"phrase": phrase, "response": reply})
+            data["rules"] = rules
+
+        cfg = self.edit(ctx, change)
+        await ctx.send(f"🧩 Rule `{len(cfg.rules)}` saved: when someone says **{phrase}** I'll reply.",
+                       allowed_mentions=discord.AllowedMentions.none())
+
+    @rule.command(name="remove")
+    @commands.has_guild_permissions(manage_guild=True)
+    async def rule_remove(self, ctx, number: int):
+        rules = self.bot.settings.get(ctx.guild.id).rules
+        if not 1 <= number <= len(rules):
+            return await ctx.send("❓ No such rule (see `!config rules`).")
+        phrase = rules[number - 1][0]
+        self.edit(ctx, lambda data: data["rules"].pop(number - 1))
+        await ctx.send(f"🗑️ Removed the rule for **{phrase}**.", allowed_mentions=discord.AllowedMentions.none())
+
+    @config.command(name="reply")
+    @commands.has_guild_permissions(manage_guild=True)
+    async def reply(self, ctx, name: str, *, text: str):
+        name = name.lower()
+        if name not in REPLY_DEFAULTS:
+            return await ctx.send(f"❓ Pick one of: {', '.join(f'`{n}`' for n in REPLY_DEFAULTS)}")
+        if len(text) > MAX_RESPONSE:
+            return await ctx.send(f"⚙️ Replies can be up to {MAX_RESPONSE} characters.")
+        if MENTION_SYNTAX.search(text):
+            return await ctx.send(NO_MENTIONS_HINT)
+        reset = text.strip().lower() == "reset"
+
+        def change(data):
+            responses = data.setdefault("responses", {})
+            if reset:
+                responses.pop(name, None)
+            else:
+                responses[name] = text.strip()
+
+        self.edit(ctx, change)
+        await ctx.send(f"🔁 **{name}** reply {'reset to the default' if reset else 'updated'}.")
+
+    @config.command(name="filter")
+    @commands.has_guild_permissions(manage_guild=True)
+    async def filter_users(self, ctx, action: str, member: discord.Member):
+        action = action.lower()
+        if action not in ("add", "remove"):
+            return await ctx.send("Usage: `!config filter add|remove @user`")
+
+        def change(data):
+            users = set(data["filter_users"]) if "filter_users" in data else set(DEFAULT_TARGETS)
+            (users.add if action == "add" else users.discard)(member.id)
+            data["filter_users"] = sorted(users)
+
+        self.edit(ctx, change)
+        await ctx.send(f"🛑 The filter {'now applies' if action == 'add' else 'no longer applies'} to {member.mention}.",
+                       allowed_mentions=discord.AllowedMentions.none())
+
+    async def cog_command_error(self, ctx, error):
+        if isinstance(error, commands.MissingPermissions):
+            await ctx.send("🔒 You need the **Manage Server** permission to change settings.")
+        elif isinstance(error, commands.NoPrivateMessage):
+            await ctx.send("⚙️ Settings are per server; run this in one.")
+        elif isinstance(error, (commands.BadArgument, commands.MissingRequiredArgument)):
+            await ctx.send(f"⚙️ {error} See `!config` for usage.")
+        else:
+            log_command_error(ctx, error)
+
+
+async def setup(bot):
+    await bot.add_cog(Settings(bot))
@@ -0,0 +1,118 @@
+import os
+
+import discord
+from discord.ext import commands
+
+from cooldown import CoalescingCooldown
+from metrics import CACHE_ENTRIES
+from pipeline import STOP
+from triggers import build_default_matcher
+
+THANKS_GIF = "https://tenor.com/view/thank-you-thank-you-bro-how-i-thank-bro-fantasy-challenge-thank-you-tiktok-gif-7839145224229268701"
+SPEED_GIF = "https://tenor.com/view/my-mom-is-kinda-homeless-ishowspeed-speeding-please-speed-i-need-this-ishowspeed-trying-not-to-laugh-gif-16620227105127147208"
+SIXTY_SEVEN_GIF = "https://tenor.com/view/taylen-kinney-6-7-67-six-seven-doot-doot-gif-14312959711459626479"
+
+# Sadness auto-reply cooldown: per (guild, channel, user) token bucket, replies
+# inside the coalescing window are merged into one message mentioning everyone
+SAD_REPLY_PER = float(os.getenv("SAD_REPLY_PER", 60))       # seconds per refilled token
+SAD_REPLY_BURST = int(os.getenv("SAD_REPLY_BURST", 2))      # replies a user can get back-to-back
+SAD_REPLY_WINDOW = float(os.getenv("SAD_REPLY_WINDOW", 5))  # coalescing window per channel
+# At most this many custom-rule replies per message
+MAX_CUSTOM_REPLIES = 3
+# Server-set reply text never pings anyone (even if it names @everyone or a role)
+NO_MENTIONS = discord.AllowedMentions.none()
+
+
+class Triggers(commands.Cog):
+    """Keyword auto-replies (67, sadness, thank you, speed) and their gif commands."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        # One combined regex pass per message decides every keyword trigger
+        self.matcher = build_default_matcher()
+        self.sad_replies = CoalescingCooldown(self.send_sad_reply, per=SAD_REPLY_PER,
+                                              burst=SAD_REPLY_BURST, window=SAD_REPLY_WINDOW)
+        CACHE_ENTRIES.source(lambda: len(self.sad_replies), "cooldown")
+
+    async def cog_load(self):
+        pipeline = self.bot.pipeline
+        pipeline.register("sixtyseven", 10, self.on_sixtyseven)
+        pipeline.register("sad", 30, self.on_sad)
+        pipeline.register("thanks", 40, self.on_thanks)
+        pipeline.register("speed", 50, self.on_speed)
+        pipeline.register("custom", 60, self.on_custom)
+
+    async def cog_unload(self):
+        for name in ("sixtyseven", "sad", "thanks", "speed", "custom"):
+            self.bot.pipeline.unregister(name)
+
+    def fired(self, mctx) -> set:
+        """Trigger names matched by this message (computed once, shared by every handler)."""
+        fired = mctx.extras.get("triggers")
+        if fired is None:
+            fired = mctx.extras["triggers"] = self.matcher.match(mctx.lower)
+        return fired
+
+    async def send_sad_reply(self, channel, users):
+        quote = await self.bot.get_quote(getattr(getattr(channel, "guild", None), "id", None))
+        mentions = ", ".join(u.mention for u in users)
+        await self.bot.outbox.safe_send(channel, f"💙 Stay strong {mentions}, here’s something for you:\n> {quote}")
+
+    # 67 meme trigger (any orientation: 6 7, 7 6, six seven, seven six, etc.)
+    async def on_sixtyseven(self, mctx):
+        if mctx.config.enabled("sixtyseven") and "sixtyseven" in self.fired(mctx):
+            self.bot.outbox.post(mctx.message.channel, mctx.config.response("sixtyseven", SIXTY_SEVEN_GIF),
+                                 allowed_mentions=NO_MENTIONS)
+            return STOP
+
+    # Sadness detector :(
+    async def on_sad(self, mctx):
+        if mctx.config.enabled("sad") and "sad" in self.fired(mctx):
+            self.sad_replies.hit(mctx.guild_id, mctx.message.channel, mctx.message.author)
+
+    # THANK YOU auto-trigger
+    async def on_thanks(self, mctx):
+        if mctx.config.enabled("thanks") and "thanks" in self.fired(mctx):
+            self.bot.outbox.post(mctx.message.channel, mctx.config.response("thanks", THANKS_GIF),
+                                 allowed_mentions=NO_MENTIONS)
+
+    # PLZ SPEED auto-trigger
+    async def on_speed(self, mctx):
+        if mctx.config.enabled("speed") and "speed" in self.fired(mctx):
+            self.bot.outbox.post(mctx.message.channel, mctx.config.response("speed", SPEED_GIF),
+                                 allowed_mentions=NO_MENTIONS)
+
+    # Server-defined phrase -> response rules (!config rule add), one compiled matcher per guild
+    async def on_custom(self, mctx):
+        if not mctx.config.enabled("custom"):
+            return
+        for reply in mctx.config.custom_replies(mctx.lower)[:MAX_CUSTOM_REPLIES]:
+            self.bot.outbox.post(mctx.message.channel, reply, allowed_mentions=NO_MENTIONS)
+
+    def gif(self, ctx, name: str, default: str) -> str:
+        return self.bot.settings.get(ctx.guild.id if ctx.guild else 0).response(name, default)
+
+    # Thank You command
+    @commands.command(name="thankyou")
+    async def thankyou(self, ctx):
+        await ctx.send(self.gif(ctx, "thanks", THANKS_GIF), allowed_mentions=NO_MENTIONS)
+
+    # Speed command
+    @commands.command(name="plzspeedineedthis")
+    async def plzspeedineedthis(self, ctx):
+        await ctx.send(self.gif(ctx, "speed", SPEED_GIF), allowed_mentions=NO_MENTIONS)
+
+    # 67 command (triggers on any orientation of 6 7 or six seven)
+    @commands.command(name="67")
+    async def sixtyseven(self, ctx):
+        await ctx.send(self.gif(ctx, "sixtyseven", SIXTY_SEVEN_GIF), allowed_mentions=NO_MENTIONS)
+
+    # Manual help for immediate support
+    @commands.command(name="ineedhelp")
+    async def ineedhelp(self, ctx):
+        quote = await self.bot.get_quote(ctx.guild.id if ctx.guild else None)
+        await ctx.send(f"💡 Here’s something to lift you up, {ctx.author.mention}:\n> {quote}")
+
+
+async def setup(bot):
+    await bot.add_cog(Triggers(bot))
@@ -0,0 +1,217 @@
+import os
+import random
+
+import discord
+from discord.ext import commands
+
+from content_bank import ContentBank
+from content_sources import fetch_advice, fetch_compliment, fetch_insult
+from metrics import REGISTRY
+from quote_pool import quotes
+from resilience import first_success
+
+# Below this many banked entries a command still asks the live API (and banks the answer)
+BANK_MIN_ENTRIES = 25
+# Share of banked !compliment answers drawn from advice instead of compliments
+ADVICE_SHARE = 0.2
+# Upstream budget for !roast / !compliment: past this we answer from the local lists
+API_DEADLINE = 3.0
+# Start the secondary compliment source if the primary hasn't answered by then
+HEDGE_DELAY = 0.3
+
+# Error replies for !roast when neither the API nor the bank has a roast (never banked)
+ROAST_FALLBACK = [
+    "you're lucky, the roast machine broke.",
+    "the roast API choked. You win this round.",
+]
+
+
+def advice_line(advice: str) -> str:
+    return f"you're awesome — also, a lil' thought: {advice}"
+
+
+COMPLIMENT_FALLBACK = [
+    "You have a magnetic energy that brightens rooms.",
+    "Your presence makes things better.",
+    "You’re the kind of person people feel lucky to know.",
+    "You make hard things feel possible.",
+    "Your humor is elite. Never change.",
+    "You’re doing better than you think.",
+]
+
+
+class Utilities(commands.Cog):
+    """Quick fun commands (flip, roast, compliment), help and owner stats."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        http = bot.http_client
+        shards = bot.shard_config
+        # Roasts/compliments/advice/quotes served from SQLite + memory, harvested in the background
+        # (only the worker running shard 0 harvests; the others pick up its rows)
+        self.bank = ContentBank(
+            os.getenv("CONTENT_DB", "content.db"),
+            sources={
+                "roast": lambda: fetch_insult(http, API_DEADLINE),
+                "compliment": lambda: fetch_compliment(http, API_DEADLINE),
+                "advice": lambda: fetch_advice(http, API_DEADLINE),
+            },
+            idle=lambda: bot.loop_lag.last_lag < 0.05 and bot.outbox.depth() == 0,
+            harvest=not shards.partial or 0 in shards.shard_ids,
+        )
+        entries = REGISTRY.gauge("content_bank_entries", "Entries in the local content bank.", ("kind",))
+        for kind in ("roast", "compliment", "advice", "quote"):
+            entries.source(lambda kind=kind: self.bank.count(kind), kind)
+
+    async def cog_load(self):
+        self.bank.open()
+        # older versions seeded ROAST_FALLBACK (and some invented insults) as roasts
+        self.bank.discard("roast", "seed")
+        self.bank.seed("compliment", COMPLIMENT_FALLBACK)
+        self.bank.seed("quote", quotes)
+        # QuotePool answers from the banked quotes when its prefetch buffer runs dry
+        self.bot.quotes.bank = self.bank
+        self.bank.start()
+
+    async def cog_unload(self):
+        self.bot.quotes.bank = None
+        await self.bank.stop()
+
+    # Manual help command (renamed)
+    @commands.command(name="helptryhard")
+    async def help_command(self, ctx):
+        embed = discord.Embed(
+            title="📖 Tryhard Bot Help",
+            description="Here are all the commands and features I support:",
+            color=discord.Color.green()
+        )
+        embed.add_field(name="!wyr", value="Would You Rather — vote with 1️⃣ / 2️⃣.", inline=False)
+        embed.add_field(name="!remindme <time> <message>", value="Set a reminder. e.g. `!remindme 1h30m take a break`", inline=False)
+        embed.add_field(name="!reminders / !cancelreminder <id>", value="List or cancel your pending reminders.", inline=False)
+        embed.add_field(name="!translate <lang> <text>", value="Translate text to a target language. e.g. `!translate es good morning`", inline=False)
+        embed.add_field(name="!mymood", value="Analyze your last 20 messages and guess your mood.", inline=False)
+        embed.add_field(name="!servermood", value="Read the room: rank this server's channels and chatters by mood.", inline=False)
+        embed.add_field(name="!moodplay", value="AI DJ recommends EXACTLY one song based on chat vibe.", inline=False)
+        embed.add_field(name="!poll [10m] <question> <option1> <option2> [...]", value="Create a poll (2–10 options), optionally closing after a time.", inline=False)
+        embed.add_field(name="!pollresults [message id]", value="Live results of the latest poll here (or reply to one).", inline=False)
+        embed.add_field(name="!ineedhelp", value="Get a motivational quote instantly.", inline=False)
+        embed.add_field(name="!thankyou", value="Send a thank you gif.", inline=False)
+        embed.add_field(name="!plzspeedineedthis", value="Send a Speed gif.", inline=False)
+        embed.add_field(name="!flip", value="Flip a coin (Heads or Tails).", inline=False)
+        embed.add_field(name="!roast @user", value="Send a random roast from Evil Insult API.", inline=False)
+        embed.add_field(name="!compliment @user", value="Send a wholesome compliment (now with fallback).", inline=False)
+        embed.add_field(name="🌞 Daily Quotes", value="I send a motivational quote every day (8 AM UTC+8 in #general by default). Admins: `!dailyquote channel/time/tz/on/off`.", inline=False)
+        embed.add_field(name="😢 Depression Checker", value="If you say sad/depressed/self-harm things, I’ll send you a motivational quote.", inline=False)
+        embed.add_field(name="🛑 Special Filter", value="If user `620792701201154048` uses *any* version of the N-word, their message is deleted and replaced with a funny reply.", inline=False)
+        embed.add_field(name="😂 Auto-Triggers", value="Saying 'thank you' or 'plz speed i need this' will trigger funny gifs.", inline=False)
+        embed.add_field(name="⚙️ !config", value="Per-server settings. Admins: toggle auto-replies, add custom `phrase → reply` rules, swap the gifs, pick who the filter applies to.", inline=False)
+
+        await ctx.send(embed=embed)
+
+    # Coin flip command
+    @commands.command(name="flip")
+    async def flip(self, ctx):
+        result = random.choice(["Heads 👑", "Tails 🍑"])
+        await ctx.send(f"🪙 The coin landed on... **{result}**!")
+
+    async def _fetch_and_bank(self, kind: str, fetch):
+        text = await fetch()
+        if text:
+            self.bank.add(kind, text, "live")
+        return text
+
+    # Roast command: from the local bank once it's stocked, else the API (strict deadline)
+    @commands.command(name="roast")
+    async def roast(self, ctx, member: discord.Member = None):
+        if not member:
+            member = ctx.author
+        guild_id = ctx.guild.id if ctx.guild else 0
+        insult = None
+        if self.bank.count("roast") < BANK_MIN_ENTRIES:
+            http = self.bot.http_client
+            insult = await first_success(lambda: self._fetch_and_bank("roast", lambda: fetch_insult(http, API_DEADLINE)),
+                                         deadline=API_DEADLINE)
+        insult = insult or self.bank.pick(guild_id, "roast") or random.choice(ROAST_FALLBACK)
+        await ctx.send(f"🔥 {member.mention}, {insult}")
+
+    # Compliment command: local bank first; cold bank hedges complimentr with adviceslip
+    @commands.command(name="compliment")
+    async def compliment(self, ctx, member: discord.Member = None):
+        if not member:
+            member = ctx.author
+        guild_id = ctx.guild.id if ctx.guild else 0
+        comp = None
+        if self.bank.count("compliment") < BANK_MIN_ENTRIES:
+            http = self.bot.http_client
+
+            async def advice():
+                # Secondary API (fun fact / fortune fallback, we’ll rephrase it)
+                text = await self._fetch_and_bank("advice", lambda: fetch_advice(http, API_DEADLINE))
+                return text and advice_line(text)
+
+            comp = await first_success(
+                lambda: self._fetch_and_bank("compliment", lambda: fetch_compliment(http, API_DEADLINE)), advice,
+                deadline=API_DEADLINE, hedge_delay=HEDGE_DELAY)
+        elif self.bank.count("advice") and random.random() < ADVICE_SHARE:
+            comp = advice_line(self.bank.pick(guild_id, "advice"))
+        # Final local fallback (seeded compliments)
+        comp = comp or self.bank.pick(guild_id, "compliment")
+        await ctx.send(f"💖 {member.mention}, {comp}")
+
+    # Owner-only internals: cache sizes and hot-path counters
+    @commands.command(name="botstats")
+    @commands.is_owner()
+    async def botstats(self, ctx):
+        bot = self.bot
+        gem = bot.gemini.stats()
+        tr = bot.translator.stats()
+        out = bot.outbox.stats()
+        lines = []
+        ai = bot.get_cog("AI")
+        if ai is not None:
+            idx = ai.user_index.merged_stats()
+            win = ai.channel_windows.merged_stats()
+            lines.append(f"🗂️ Message index: **{idx.get('users', 0)}** users, {idx.get('snippets', 0)} snippets"
+                         f" (~{idx.get('chars', 0) // 1024} KiB) over {idx['shards']} shard(s), hit rate {idx['hit_rate']:.0%}")
+            lines.append(f"🪟 Chat windows: **{win.get('channels', 0)}** channels, {win.get('lines', 0)} lines, hit rate {win['hit_rate']:.0%}")
+            busy = ", ".join(f"{name} {lim.stats()['keys']} keys/{lim.rejected} rejected" for name, lim in ai.limiters().items())
+            lines.append(f"🚦 Limiters: {busy}")
+        lines.append(f"🤖 Gemini: {gem['calls']} calls, {gem['errors']} errors, avg {gem['avg_ms']} ms, cache hit rate {gem['cache']['hit_rate']:.0%}")
+        lines.append(f"🌍 Translate: {tr['calls']} calls, {tr['coalesced']} coalesced, cache hit rate {tr['cache']['hit_rate']:.0%}")
+        lines.append(f"📤 Outbox: depth {out['depth']}, {out['sends']} sends (+{out['merged']} merged), avg latency {out['avg_latency_ms']} ms")
+        moderation = bot.get_cog("Moderation")
+        if moderation is not None:
+            flt = moderation.filter.stats.as_dict()
+            lines.append(f"🛑 Filter: {flt['checks']} checks, avg {flt['avg_us']} µs, max {flt['max_us']} µs")
+        reminders = bot.get_cog("Reminders")
+        triggers = bot.get_cog("Triggers")
+        lines.append(f"💬 Quote buffer: {len(bot.quotes)} · ⏰ pending reminders: {len(reminders.scheduler) if reminders else 0}"
+                     f" · 💙 cooldown keys: {len(triggers.sad_replies) if triggers else 0}")
+        lines.append(f"🧩 Shards: {bot.shard_config.label()}")
+        bank = self.bank.stats()
+        kinds = ", ".join(f"{n} {kind}" for kind, n in sorted(bank["entries"].items()))
+        lines.append(f"🏦 Content bank: {kinds} · {bank['harvested']} harvested, {bank['duplicates']} dupes skipped")
+        breakers = ", ".join(f"{host} {b.state}" for host, b in bot.http_client.breakers.items())
+        if breakers:
+            lines.append(f"🔌 Upstreams: {breakers}")
+        polls = bot.get_cog("Polls")
+        if polls is not None:
+            pst = polls.tracker.stats()
+            lines.append(f"🗳️ Polls: {pst['open']} open / {pst['polls']} tracked · {pst['events']} reaction events"
+                         f" ({pst['ignored']} ignored), {pst['unflushed']} unflushed")
+        daily = bot.get_cog("DailyQuote")
+        if daily is not None:
+            dst = daily.broadcaster.stats()
+            lines.append(f"🌞 Daily quote: {dst['tracked']} guilds ({dst['configured']} configured) · {dst['sent']} sent,"
+                         f" {dst['failed']} failed, {dst['retried']} retries · last slot {dst['last_slot']['guilds']} guilds"
+                         f" in {dst['last_slot']['seconds']}s")
+        sst = bot.settings.stats()
+        lines.append(f"⚙️ Guild settings: {sst['cached']} cached · {sst['hit_rate']:.0%} hits, {sst['rebuilds']} rebuilds,"
+                     f" {sst['dirty']} unsaved")
+        handlers = ", ".join(f"{name}({prio})" for prio, name in bot.pipeline.handlers)
+        lines.append(f"🧵 Message pipeline: {handlers}")
+        await ctx.send("\n".join(lines))
+
+
+async def setup(bot):
+    await bot.add_cog(Utilities(bot))
@@ -0,0 +1,198 @@
+import asyncio
+import collections
+import hashlib
+import random
+import re
+import sqlite3
+import time
+
+from cache import TTLCache
+from resilience import CircuitOpen
+
+
+def normalize(text: str) -> str:
+    """Dedupe key: lowercase, letters/digits only, single spaces."""
+    return re.sub(r"\s+", " ", re.sub(r"[^a-z0-9\s]", "", text.lower())).strip()
+
+
+class ContentBank:
+    """
+    Local store of short reusable strings (roasts, compliments, advice, quotes).
+
+    SQLite is the source of truth; every row is also held in memory per kind,
+    so `pick()` is a random choice plus a set lookup, with no I/O. Each guild
+    has a bounded "recently used" window per kind, and picks avoid anything in
+    it until the bank runs out of alternatives (then the least recently used
+    entry is reused). Duplicates are rejected on a normalized-text hash.
+
+    A background task harvests batches from `sources` (kind -> async fetcher
+    returning one string or None) while the bot is idle, quickly until each
+    kind reaches `target` entries and slowly after that. With `harvest=False`
+    (e.g. on secondary shard workers) it only picks up rows other processes
+    have written.
+    """
+
+    def __init__(self, path: str, sources: dict = None, recent_window: int = 50, target: int = 500,
+                 batch_size: int = 5, fill_interval: float = 20.0, topup_interval: float = 1800.0,
+                 idle=None, harvest: bool = True, max_guilds: int = 10000):
+        self.path = path
+        self.sources = sources or {}
+        self.recent_window = recent_window
+        self.target = target
+        self.batch_size = batch_size
+        self.fill_interval = fill_interval
+        self.topup_interval = topup_interval
+        self.idle = idle or (lambda: True)
+        self.harvest = harvest
+        self._db = None
+        self._items = collections.defaultdict(list)  # kind -> [(id, text)]
+        self._last_id = 0
+        self._recent = TTLCache(maxsize=max_guilds, ttl=7 * 86400, sliding=True)
+        self._task = None
+        self.harvested = 0
+        self.duplicates = 0
+        self.picks = 0
+
+    def __len__(self):
+        return sum(len(v) for v in self._items.values())
+
+    def open(self):
+        if self._db is not None:
+            return
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS content ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT NOT NULL, text TEXT NOT NULL,"
+            " digest TEXT NOT NULL, source TEXT, added REAL NOT NULL, UNIQUE(kind, digest))"
+        )
+        self._db.commit()
+        self._load_new()
+
+    def _load_new(self):
+        rows = self._db.execute("SELECT id, kind, text FROM content WHERE id > ? ORDER BY id", (self._last_id,))
+        for rid, kind, text in rows:
+            self._items[kind].append((rid, text))
+            self._last_id = rid
+
+    def add(self, kind: str, text: str, source: str = None) -> bool:
+        """Store `text` unless an equivalent entry exists. Returns True if it was new."""
+        self.open()
+        text = text.strip()
+        key = normalize(text)
+        if not key:
+            return False
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        cur = self._db.execute(
+            "INSERT OR IGNORE INTO content (kind, text, digest, source, added) VALUES (?, ?, ?, ?, ?)",
+            (kind, text, digest, source, time.time()),
+        )
+        self._db.commit()
+        if cur.rowcount == 0:
+            self.duplicates += 1
+            return False
+        self._load_new()
+        return True
+
+    def seed(self, kind: str, texts) -> int:
+        """Add local fallback strings (idempotent). Returns how many were new."""
+        return sum(self.add(kind, t, "seed") for t in texts)
+
+    def discard(self, kind: str, source: str) -> int:
+        """Delete every entry of `kind` that came from `source`. Returns how many were removed."""
+        self.open()
+        cur = self._db.execute("DELETE FROM content WHERE kind = ? AND source = ?", (kind, source))
+        self._db.commit()
+        if cur.rowcount:
+            kept = {rid for (rid,) in self._db.execute("SELECT id FROM content WHERE kind = ?", (kind,))}
+            self._items[kind] = [it for it in self._items[kind] if it[0] in kept]
+        return cur.rowcount
+
+    def count(self, kind: str) -> int:
+        return len(self._items.get(kind, ()))
+
+    def pick(self, guild_id: int, kind: str):
+        """A random entry of `kind` not used recently in this guild, or None if the bank has none."""
+        items = self._items.get(kind)
+        if not items:
+            return None
+        window = self._recent.get((guild_id, kind), count=False)
+        if window is None:
+            window = self._recent[(guild_id, kind)] = collections.deque(maxlen=self.recent_window)
+        recent = set(window)
+        choice = None
+        if len(recent) < len(items):
+            # a few random probes almost always land outside a small window
+            for _ in range(8):
+                cand = random.choice(items)
+                if cand[0] not in recent:
+                    choice = cand
+                    break
+            if choice is None:
+                fresh = [it for it in items if it[0] not in recent]
+                choice = random.choice(fresh)
+        else:
+            # everything was used recently: reuse the least recently used one
+            oldest = window[0]
+            choice = next(it for it in items if it[0] == oldest)
+            window.remove(oldest)
+        window.append(choice[0])
+        self.picks += 1
+        return choice[1]
+
+    def start(self):
+        self.open()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._harvest_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    async def harvest_once(self, kind: str) -> int:
+        """Fetch one batch for `kind`; returns how many new entries were stored."""
+        fetch = self.sources[kind]
+        new = 0
+        for _ in range(self.batch_size):
+            try:
+                text = await fetch()
+            except CircuitOpen:
+                break
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                continue
+            if text and self.add(kind, text, "harvest"):
+                new += 1
+        self.harvested += new
+        return new
+
+    async def _harvest_loop(self):
+        while True:
+            filling = self.harvest and any(self.count(k) < self.target for k in self.sources)
+            await asyncio.sleep(self.fill_interval if filling or not self.harvest else self.topup_interval)
+            if not self.harvest:
+                self._load_new()
+                continue
+            if not self.idle():
+                continue
+            for kind in self.sources:
+                if self.count(kind) < self.target or not filling:
+                    try:
+                        await self.harvest_once(kind)
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        print(f"⚠️ Content harvest for {kind} failed: {e}")
+
+    def stats(self) -> dict:
+        return {"entries": {k: len(v) for k, v in self._items.items()}, "harvested": self.harvested,
+                "duplicates": self.duplicates, "picks": self.picks, "guild_windows": len(self._recent)}
@@ -0,0 +1,26 @@
+"""Fetchers for the third-party text APIs. Each returns one string, or None if the upstream had nothing usable."""
+
+EVILINSULT_URL = "https://evilinsult.com/generate_insult.php?lang=en&type=json"
+COMPLIMENTR_URL = "https://complimentr.com/api"
+ADVICESLIP_URL = "https://api.adviceslip.com/advice"
+
+
+async def fetch_insult(http, timeout: float = None):
+    status, data = await http.get_json(EVILINSULT_URL, timeout=timeout)
+    if status == 200 and isinstance(data, dict):
+        return (data.get("insult") or "").strip() or None
+    return None
+
+
+async def fetch_compliment(http, timeout: float = None):
+    status, data = await http.get_json(COMPLIMENTR_URL, timeout=timeout)
+    if status == 200 and isinstance(data, dict):
+        return (data.get("compliment") or "").strip() or None
+    return None
+
+
+async def fetch_advice(http, timeout: float = None):
+    status, data = await http.get_json(ADVICESLIP_URL, timeout=timeout)
+    if status == 200 and isinstance(data, dict):
+        return ((data.get("slip") or {}).get("advice") or "").strip() or None
+    return None
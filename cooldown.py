@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+from cache import TTLCache
+
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, capacity: float, now: float):
+        self.tokens = capacity
+        self.updated = now
+
+    def take(self, rate: float, capacity: float, now: float) -> bool:
+        """Refill at `rate` tokens/sec up to `capacity`, then try to take one token."""
+        self.tokens = min(capacity, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+class CoalescingCooldown:
+    """
+    Token-bucket cooldown keyed by (guild, channel, user) plus per-channel reply coalescing.
+
+    Each key gets `burst` replies, refilled at one per `per` seconds; triggers
+    from a key with an empty bucket are dropped. The first trigger in a quiet
+    channel is answered right away and opens a `window`-second coalescing
+    window; everyone else who triggers inside it is answered together in one
+    reply when the window closes. Buckets live in a TTLCache, so idle keys
+    expire and memory stays bounded no matter how many guilds the bot is in.
+
+    `send(channel, users)` is the coroutine that posts the actual reply.
+    """
+
+    def __init__(self, send, per: float = 60.0, burst: int = 2, window: float = 5.0,
+                 max_keys: int = 10000):
+        self.send = send
+        self.rate = 1.0 / per
+        self.burst = float(burst)
+        self.window = window
+        self._buckets = TTLCache(maxsize=max_keys, ttl=per * burst, sliding=True)
+        self._pending = {}  # channel id -> (channel, {user id: user}) for open windows
+        self._tasks = set()
+        self.dropped = 0
+        self.coalesced = 0
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def allow(self, guild_id: int, channel_id: int, user_id: int) -> bool:
+        """Take a token for this key; False means the key is cooling down."""
+        key = (guild_id, channel_id, user_id)
+        now = time.monotonic()
+        bucket = self._buckets.get(key, count=False)
+        if bucket is None:
+            bucket = TokenBucket(self.burst, now)
+            self._buckets[key] = bucket
+        return bucket.take(self.rate, self.burst, now)
+
+    def hit(self, guild_id: int, channel, user) -> bool:
+        """Register a trigger. Returns False if it was dropped by the cooldown."""
+        if not self.allow(guild_id, channel.id, user.id):
+            self.dropped += 1
+            return False
+        pending = self._pending.get(channel.id)
+        if pending is not None:
+            # window open: fold this user into the next coalesced reply
+            pending[1].setdefault(user.id, user)
+            self.coalesced += 1
+            return True
+        self._pending[channel.id] = (channel, {})
+        self._spawn(self.send(channel, [user]))
+        asyncio.get_running_loop().call_later(self.window, self._close_window, channel.id)
+        return True
+
+    def _close_window(self, channel_id: int):
+        channel, users = self._pending.pop(channel_id, (None, None))
+        if not users:
+            return
+        # replying opens a fresh window so a steady trickle still coalesces
+        self._pending[channel_id] = (channel, {})
+        self._spawn(self.send(channel, list(users.values())))
+        asyncio.get_running_loop().call_later(self.window, self._close_window, channel_id)
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(self._run(coro))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, coro):
+        try:
+            await coro
+        except Exception as e:
+            print(f"⚠️ Coalesced reply failed: {e}")
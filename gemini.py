@@ -0,0 +1,214 @@
+import asyncio
+import hashlib
+import json
+import re
+import threading
+import time
+
+from cache import TTLCache
+from metrics import CALL_ERRORS, CALL_LATENCY
+
+
+def _genai():
+    # google.generativeai (with grpc/protobuf) is heavy; load it on the first AI command
+    import google.generativeai as genai
+    return genai
+
+
+def response_text(response) -> str:
+    """Pull the text out of a Gemini response, trying the candidates if `.text` is empty."""
+    try:
+        raw = getattr(response, "text", None) or ""
+    except Exception:
+        # .text raises when the response was blocked or has no parts
+        raw = ""
+    if not raw and hasattr(response, "candidates"):
+        try:
+            raw = response.candidates[0].content.parts[0].text
+        except Exception:
+            pass
+    return raw
+
+
+class JSONFieldStream:
+    """
+    Incremental parser for a flat JSON object of string fields arriving in chunks.
+
+    `feed(chunk)` returns every field whose string value has been closed so
+    far, so a caller can act on `song_title`/`artist` before the rest of the
+    object (or the closing brace) has streamed in. Already-complete fields are
+    never rescanned.
+    """
+
+    _FIELD = re.compile(r'"((?:[^"\\]|\\.)*)"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+    def __init__(self):
+        self.buffer = ""
+        self.fields = {}
+        self._pos = 0
+
+    def feed(self, chunk: str) -> dict:
+        self.buffer += chunk
+        for m in self._FIELD.finditer(self.buffer, self._pos):
+            try:
+                key, value = json.loads(f'"{m.group(1)}"'), json.loads(f'"{m.group(2)}"')
+            except ValueError:
+                continue
+            self.fields.setdefault(key, value)
+            self._pos = m.end()
+        return self.fields
+
+
+class GeminiClient:
+    """
+    Shared Gemini access for the AI commands.
+
+    The GenerativeModel is built once and reused, at most `max_concurrency`
+    blocking `generate_content` calls run in worker threads at a time, and
+    answers are cached (LRU + TTL) under a hash of the whitespace-normalized
+    prompt, so e.g. repeated `!mymood` calls over unchanged history never reach
+    the API. `model_factory(name)` can be swapped for a local fake in tests.
+    """
+
+    def __init__(self, api_key: str = None, model_name: str = "gemini-2.0-flash",
+                 max_concurrency: int = 4, cache_size: int = 256, cache_ttl: float = 600.0,
+                 model_factory=None):
+        self.api_key = api_key
+        self.model_name = model_name
+        self.model_factory = model_factory or self._default_factory
+        self.cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._sem = asyncio.Semaphore(max_concurrency)
+        self._model = None
+        self._pumps = set()
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def _default_factory(self, name: str):
+        genai = _genai()
+        if self.api_key:
+            genai.configure(api_key=self.api_key)
+        return genai.GenerativeModel(name)
+
+    @property
+    def model(self):
+        if self._model is None:
+            self._model = self.model_factory(self.model_name)
+        return self._model
+
+    @staticmethod
+    def cache_key(prompt: str, json_mode: bool) -> str:
+        normalized = re.sub(r"\s+", " ", prompt).strip()
+        return hashlib.sha256(f"{int(json_mode)}|{normalized}".encode("utf-8")).hexdigest()
+
+    async def generate(self, prompt: str, json_mode: bool = False, use_cache: bool = True) -> str:
+        """Return the model's text for `prompt` ('' if it returned nothing)."""
+        key = self.cache_key(prompt, json_mode)
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        kwargs = {}
+        if json_mode:
+            kwargs["generation_config"] = {"response_mime_type": "application/json"}
+        async with self._sem:
+            start = time.perf_counter()
+            self.calls += 1
+            try:
+                response = await asyncio.to_thread(self.model.generate_content, prompt, **kwargs)
+            except Exception:
+                self.errors += 1
+                CALL_ERRORS.inc("gemini")
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                CALL_LATENCY.observe(elapsed, "gemini")
+                self.total_ms += elapsed * 1e3
+                self.max_ms = max(self.max_ms, elapsed * 1e3)
+        text = response_text(response)
+        if text and use_cache:
+            self.cache[key] = text
+        return text
+
+    async def stream(self, prompt: str, json_mode: bool = False, use_cache: bool = True):
+        """
+        Async iterator over the model's text chunks (`stream=True`).
+
+        The blocking SDK iterator runs in a worker thread and hands chunks to
+        the event loop as they arrive. A cached answer comes back as a single
+        chunk; a fully streamed answer is cached like `generate()`'s.
+        """
+        key = self.cache_key(prompt, json_mode)
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+        kwargs = {"stream": True}
+        if json_mode:
+            kwargs["generation_config"] = {"response_mime_type": "application/json"}
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        done = object()
+        stop = threading.Event()
+
+        def put(item):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                # loop already closed (shutdown mid-stream)
+                stop.set()
+
+        def pump():
+            try:
+                for chunk in self.model.generate_content(prompt, **kwargs):
+                    if stop.is_set():
+                        break
+                    text = response_text(chunk)
+                    if text:
+                        put(text)
+            except Exception as e:
+                put(e)
+            finally:
+                put(done)
+
+        parts = []
+        complete = False
+        async with self._sem:
+            start = time.perf_counter()
+            self.calls += 1
+            # if the consumer stops early, the thread sees `stop` at its next chunk and exits
+            pump_task = asyncio.ensure_future(asyncio.to_thread(pump))
+            self._pumps.add(pump_task)
+            pump_task.add_done_callback(self._pumps.discard)
+            try:
+                while True:
+                    item = await queue.get()
+                    if item is done:
+                        complete = True
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+                    if not parts:
+                        CALL_LATENCY.observe(time.perf_counter() - start, "gemini_first_chunk")
+                    parts.append(item)
+                    yield item
+            except Exception:
+                self.errors += 1
+                CALL_ERRORS.inc("gemini")
+                raise
+            finally:
+                stop.set()
+                elapsed = time.perf_counter() - start
+                CALL_LATENCY.observe(elapsed, "gemini")
+                self.total_ms += elapsed * 1e3
+                self.max_ms = max(self.max_ms, elapsed * 1e3)
+        text = "".join(parts)
+        if complete and text and use_cache:
+            self.cache[key] = text
+
+    def stats(self) -> dict:
+        avg = self.total_ms / self.calls if self.calls else 0.0
+        return {"calls": self.calls, "errors": self.errors, "avg_ms": round(avg, 1),
+                "max_ms": round(self.max_ms, 1), "cache": self.cache.stats()}
@@ -0,0 +1,176 @@
+import asyncio
+import json
+import re
+import sqlite3
+
+from triggers import TriggerMatcher
+
+# Limits for admin-defined phrase -> response rules
+MAX_RULES = 50
+MAX_PHRASE = 100
+MAX_RESPONSE = 500
+# @everyone / @here and user or role mentions are refused in stored replies
+MENTION_SYNTAX = re.compile(r"@(everyone|here)|<@[!&]?\d+>")
+
+
+def phrase_pattern(phrase: str) -> str:
+    """Regex for a literal phrase that can't match inside a longer word ("down" vs "download")."""
+    body = re.escape(phrase)
+    head = r"(?<!\w)" if re.match(r"\w", phrase) else ""
+    tail = r"(?!\w)" if re.search(r"\w$", phrase) else ""
+    return head + body + tail
+
+
+class GuildConfig:
+    """
+    Read-only snapshot of one guild's settings.
+
+    Built once per change, never mutated: handlers can hold it for the whole
+    message without locking, and the custom rules are already compiled into
+    one TriggerMatcher.
+    """
+
+    __slots__ = ("disabled", "filter_users", "responses", "rules", "matcher")
+
+    def __init__(self, data: dict = None):
+        data = data or {}
+        self.disabled = frozenset(data.get("disabled", ()))
+        users = data.get("filter_users")
+        self.filter_users = frozenset(users) if users is not None else None  # None: the cog's default
+        self.responses = dict(data.get("responses", {}))
+        self.rules = tuple((r["phrase"], r["response"]) for r in data.get("rules", ()))
+        self.matcher = TriggerMatcher({f"r{i}": phrase_pattern(p) for i, (p, _) in enumerate(self.rules)}) \
+            if self.rules else None
+
+    def enabled(self, name: str) -> bool:
+        return name not in self.disabled
+
+    def response(self, name: str, default: str) -> str:
+        return self.responses.get(name, default)
+
+    def custom_replies(self, lower: str) -> list:
+        """Responses of every custom rule whose phrase occurs in `lower`, in rule order."""
+        if self.matcher is None:
+            return []
+        fired = sorted(int(name[1:]) for name in self.matcher.match(lower))
+        return [self.rules[i][1] for i in fired]
+
+    def as_dict(self) -> dict:
+        data = {}
+        if self.disabled:
+            data["disabled"] = sorted(self.disabled)
+        if self.filter_users is not None:
+            data["filter_users"] = sorted(self.filter_users)
+        if self.responses:
+            data["responses"] = dict(self.responses)
+        if self.rules:
+            data["rules"] = [{"phrase": p, "response": r} for p, r in self.rules]
+        return data
+
+
+DEFAULT_CONFIG = GuildConfig()
+
+
+class GuildSettings:
+    """
+    Per-guild configuration: SQLite for persistence, a dict of snapshots for reads.
+
+    `get(guild_id)` is a single dict lookup once a guild has been seen; the
+    first lookup reads the guild's row (guilds without one share
+    DEFAULT_CONFIG). `edit()` builds a new snapshot right away, so only the
+    edited guild's matcher is recompiled, and queues the row; a background task
+    writes queued rows every `flush_interval` seconds and on stop.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 5.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._db = None
+        self._cache = {}  # guild_id -> GuildConfig
+        self._dirty = {}  # guild_id -> data dict waiting to be written
+        self._task = None
+        self.hits = 0
+        self.misses = 0
+        self.rebuilds = 0
+
+    def __len__(self):
+        return len(self._cache)
+
+    def open(self):
+        if self._db is not None:
+            return
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS guild_settings (guild_id INTEGER PRIMARY KEY, data TEXT NOT NULL)")
+        self._db.commit()
+
+    def get(self, guild_id: int) -> GuildConfig:
+        cfg = self._cache.get(guild_id)
+        if cfg is not None:
+            self.hits += 1
+            return cfg
+        if not guild_id:
+            return DEFAULT_CONFIG
+        self.misses += 1
+        self.open()
+        row = self._db.execute("SELECT data FROM guild_settings WHERE guild_id = ?", (guild_id,)).fetchone()
+        cfg = self._cache[guild_id] = GuildConfig(json.loads(row[0])) if row else DEFAULT_CONFIG
+        return cfg
+
+    def edit(self, guild_id: int, change) -> GuildConfig:
+        """Apply `change(data)` to a copy of the guild's settings dict and publish the result."""
+        data = self.get(guild_id).as_dict()
+        change(data)
+        cfg = GuildConfig(data)
+        self._cache[guild_id] = cfg
+        self._dirty[guild_id] = cfg.as_dict()
+        self.rebuilds += 1
+        return cfg
+
+    def flush(self) -> int:
+        if not self._dirty:
+            return 0
+        self.open()
+        dirty, self._dirty = self._dirty, {}
+        try:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO guild_settings (guild_id, data) VALUES (?, ?)",
+                [(gid, json.dumps(data)) for gid, data in dirty.items()],
+            )
+            self._db.commit()
+        except sqlite3.Error:
+            # keep the rows queued (newer edits win) and retry on the next flush
+            self._dirty = {**dirty, **self._dirty}
+            raise
+        return len(dirty)
+
+    def start(self):
+        self.open()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._db is not None:
+            self.flush()
+            self._db.close()
+            self._db = None
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                print(f"⚠️ Saving guild settings failed: {e}")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {"cached": len(self._cache), "dirty": len(self._dirty), "rebuilds": self.rebuilds,
+                "hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0}
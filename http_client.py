@@ -0,0 +1,103 @@
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from metrics import CALL_ERRORS, CALL_LATENCY, REGISTRY
+from resilience import CircuitBreaker
+
+
+class HttpClient:
+    """
+    One long-lived aiohttp session shared by every outbound call.
+
+    Connections are pooled (with a per-host cap so one slow upstream can't hog
+    the pool), kept alive between requests, and DNS answers are cached, so a
+    `!roast` or a sadness auto-reply reuses an open TCP/TLS connection instead
+    of paying a fresh handshake each time.
+
+    Every host gets a CircuitBreaker: after a few consecutive failures (errors,
+    timeouts, 5xx/429) calls to it raise CircuitOpen instantly until a trial
+    request succeeds, so callers fall back locally instead of waiting on a
+    dead upstream.
+    """
+
+    def __init__(self, limit: int = 64, limit_per_host: int = 8, dns_ttl: int = 300,
+                 keepalive_timeout: float = 30.0, timeout: float = 8.0,
+                 failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session = None
+        self._lock = asyncio.Lock()
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.breakers = {}
+        self._state_gauge = REGISTRY.gauge("circuit_open", "1 while an upstream's circuit breaker is open.", ("host",))
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        b = self.breakers.get(host)
+        if b is None:
+            b = self.breakers[host] = CircuitBreaker(host, self.failure_threshold, self.reset_timeout)
+            self._state_gauge.source(lambda: 0.0 if b.state == CircuitBreaker.CLOSED else 1.0, host)
+        return b
+
+    async def start(self) -> aiohttp.ClientSession:
+        """Create the session (idempotent). Must run on the bot's event loop."""
+        async with self._lock:
+            if self._session is None or self._session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    ttl_dns_cache=self.dns_ttl,
+                    use_dns_cache=True,
+                    keepalive_timeout=self.keepalive_timeout,
+                )
+                self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self._session
+
+    async def session(self) -> aiohttp.ClientSession:
+        """The shared session, created on first use if `start()` hasn't run yet."""
+        if self._session is None or self._session.closed:
+            return await self.start()
+        return self._session
+
+    async def get_json(self, url: str, timeout: float = None):
+        """GET `url` and return (status, parsed JSON or None). Raises CircuitOpen for known-dead hosts."""
+        host = urlsplit(url).hostname
+        breaker = self.breaker(host)
+        breaker.check()
+        session = await self.session()
+        kwargs = {"timeout": aiohttp.ClientTimeout(total=timeout)} if timeout else {}
+        label = f"http:{host}"
+        start = time.perf_counter()
+        try:
+            async with session.get(url, **kwargs) as resp:
+                if resp.status != 200:
+                    CALL_ERRORS.inc(label)
+                    if resp.status >= 500 or resp.status == 429:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                    return resp.status, None
+                # some upstreams (complimentr) send JSON with a text/html content type
+                data = await resp.json(content_type=None)
+                breaker.record_success()
+                return resp.status, data
+        except asyncio.CancelledError:
+            breaker.abandon()
+            raise
+        except Exception:
+            CALL_ERRORS.inc(label)
+            breaker.record_failure()
+            raise
+        finally:
+            CALL_LATENCY.observe(time.perf_counter() - start, label)
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -0,0 +1,81 @@
+import asyncio
+import contextlib
+
+
+class Busy(Exception):
+    """Raised by KeyedLimiter.hold() when a key already has too much work queued."""
+
+    def __init__(self, key):
+        super().__init__(f"busy: {key!r}")
+        self.key = key
+
+
+class _Entry:
+    __slots__ = ("sem", "active", "waiting")
+
+    def __init__(self, concurrency: int):
+        self.sem = asyncio.Semaphore(concurrency)
+        self.active = 0
+        self.waiting = 0
+
+
+class KeyedLimiter:
+    """
+    Per-key concurrency limit whose entries disappear once nobody holds or waits on them.
+
+    Up to `concurrency` holders run per key; up to `max_waiting` more may queue
+    behind them, and anything beyond that is rejected immediately with `Busy`
+    instead of piling up. Entries are refcounted (active + waiting) and removed
+    when the count hits zero, so memory tracks in-flight work rather than every
+    key ever seen.
+
+        async with limiter.hold(channel.id):
+            ...
+    """
+
+    def __init__(self, concurrency: int = 1, max_waiting: int = 1):
+        self.concurrency = concurrency
+        self.max_waiting = max_waiting
+        self._entries = {}
+        self.rejected = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def busy(self, key) -> bool:
+        """True if `hold(key)` would be rejected right now."""
+        entry = self._entries.get(key)
+        return entry is not None and entry.active >= self.concurrency and entry.waiting >= self.max_waiting
+
+    def _release_ref(self, key, entry):
+        if entry.active == 0 and entry.waiting == 0 and self._entries.get(key) is entry:
+            del self._entries[key]
+
+    @contextlib.asynccontextmanager
+    async def hold(self, key):
+        if self.busy(key):
+            self.rejected += 1
+            raise Busy(key)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _Entry(self.concurrency)
+        entry.waiting += 1
+        try:
+            await entry.sem.acquire()
+        except BaseException:
+            entry.waiting -= 1
+            self._release_ref(key, entry)
+            raise
+        entry.waiting -= 1
+        entry.active += 1
+        try:
+            yield
+        finally:
+            entry.active -= 1
+            entry.sem.release()
+            self._release_ref(key, entry)
+
+    def stats(self) -> dict:
+        entries = list(self._entries.values())
+        return {"keys": len(entries), "active": sum(e.active for e in entries),
+                "waiting": sum(e.waiting for e in entries), "rejected": self.rejected}
@@ -0,0 +1,99 @@
+"""
+Run the bot as several worker processes, each owning a contiguous shard range.
+
+    python launcher.py --shard-count 8 --processes 4
+
+Worker i runs `main.py --shards <range> --shard-count N` with PORT set to
+BASE_PORT + i (worker 0 keeps Render's PORT). Crashed workers are restarted
+with exponential backoff; SIGINT/SIGTERM are forwarded to every worker.
+"""
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+
+from sharding import format_shard_ids, split_ranges
+
+MAIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+
+class Worker:
+    def __init__(self, index: int, shard_ids: list, shard_count: int, port: int, extra_args: list):
+        self.index = index
+        self.shard_ids = shard_ids
+        self.shard_count = shard_count
+        self.port = port
+        self.extra_args = extra_args
+        self.proc = None
+        self.backoff = 1.0
+        self.restart_at = 0.0
+        self.started_at = 0.0
+
+    def label(self) -> str:
+        return f"worker {self.index} (shards {format_shard_ids(self.shard_ids)}/{self.shard_count})"
+
+    def start(self):
+        env = dict(os.environ, PORT=str(self.port))
+        cmd = [sys.executable, MAIN, "--shards", format_shard_ids(self.shard_ids),
+               "--shard-count", str(self.shard_count), *self.extra_args]
+        self.proc = subprocess.Popen(cmd, env=env)
+        self.started_at = time.monotonic()
+        print(f"🚀 Started {self.label()} pid {self.proc.pid} on port {self.port}", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shard-count", type=int, default=int(os.getenv("SHARD_COUNT", 2)))
+    parser.add_argument("--processes", type=int, default=int(os.getenv("SHARD_PROCESSES", os.cpu_count() or 1)))
+    parser.add_argument("--base-port", type=int, default=int(os.getenv("PORT", 8080)))
+    parser.add_argument("--max-backoff", type=float, default=60.0)
+    args, extra = parser.parse_known_args(argv)
+
+    ranges = split_ranges(args.shard_count, args.processes)
+    workers = [Worker(i, ids, args.shard_count, args.base_port + i, extra) for i, ids in enumerate(ranges)]
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for w in workers:
+            if w.proc is not None and w.proc.poll() is None:
+                w.proc.send_signal(signum)
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    for w in workers:
+        w.start()
+
+    while not stopping:
+        time.sleep(1.0)
+        now = time.monotonic()
+        for w in workers:
+            if w.proc is not None:
+                code = w.proc.poll()
+                if code is None:
+                    # a worker that stayed up for a while has earned a fresh backoff
+                    if now - w.started_at > 300:
+                        w.backoff = 1.0
+                    continue
+                print(f"⚠️ {w.label()} exited with {code}; restarting in {w.backoff:.0f}s", flush=True)
+                w.proc = None
+                w.restart_at = now + w.backoff
+                w.backoff = min(w.backoff * 2, args.max_backoff)
+            elif now >= w.restart_at and not stopping:
+                w.start()
+
+    for w in workers:
+        if w.proc is not None:
+            try:
+                w.proc.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                w.proc.kill()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+import collections
+
+from cache import TTLCache
+
+
+class _UserBuffer:
+    __slots__ = ("snippets", "warm")
+
+    def __init__(self, maxlen: int):
+        self.snippets = collections.deque(maxlen=maxlen)  # (message id, snippet), oldest first
+        self.warm = False  # True once history has been scanned for this user
+
+
+class UserMessageIndex:
+    """
+    Ring buffer of each (guild, user)'s last `per_user` message snippets.
+
+    Filled incrementally from on_message, so `!mymood` normally needs no REST
+    calls at all. A user seen for the first time can be warmed once from channel
+    history (`warm()`); after that the buffer stays current on its own. Users
+    are kept in an LRU with idle expiry, so memory is bounded by
+    `max_users * per_user` snippets.
+    """
+
+    def __init__(self, per_user: int = 20, max_users: int = 5000, idle_ttl: float = 7 * 86400,
+                 snippet_len: int = 200):
+        self.per_user = per_user
+        self.snippet_len = snippet_len
+        self._users = TTLCache(maxsize=max_users, ttl=idle_ttl, sliding=True)
+
+    @staticmethod
+    def clean(content: str) -> str:
+        # keep a compact single-line version
+        return content.replace("\n", " ").strip()
+
+    def _buffer(self, guild_id: int, user_id: int, create: bool = True):
+        key = (guild_id, user_id)
+        buf = self._users.get(key, count=False)
+        if buf is None and create:
+            buf = _UserBuffer(self.per_user)
+            self._users[key] = buf
+        return buf
+
+    def record(self, guild_id: int, user_id: int, message_id: int, content: str):
+        clean = self.clean(content)
+        if clean:
+            self._buffer(guild_id, user_id).snippets.append((message_id, clean[:self.snippet_len]))
+
+    def recent(self, guild_id: int, user_id: int, n: int = None) -> list:
+        """Up to `n` most-recent snippets, newest first (hit/miss counted)."""
+        buf = self._users.get((guild_id, user_id))
+        if buf is None:
+            return []
+        items = [text for _, text in reversed(buf.snippets)]
+        return items[:n] if n else items
+
+    def guild_buffers(self, guild_id: int) -> dict:
+        """{user_id: snippets} for every buffered user of `guild_id` (no hit/miss counting)."""
+        return {uid: [text for _, text in buf.snippets]
+                for (gid, uid), buf in self._users.items() if gid == guild_id and buf.snippets}
+
+    def is_warm(self, guild_id: int, user_id: int) -> bool:
+        buf = self._buffer(guild_id, user_id, create=False)
+        return buf is not None and buf.warm
+
+    def warm(self, guild_id: int, user_id: int, messages):
+        """Merge (message id, content) pairs fetched from history into the buffer."""
+        buf = self._buffer(guild_id, user_id)
+        merged = dict(buf.snippets)
+        for mid, content in messages:
+            clean = self.clean(content)
+            if clean:
+                merged.setdefault(mid, clean[:self.snippet_len])
+        # snowflake ids sort by time
+        buf.snippets.clear()
+        buf.snippets.extend(sorted(merged.items())[-self.per_user:])
+        buf.warm = True
+
+    def stats(self) -> dict:
+        buffers = self._users.values()
+        snippets = sum(len(b.snippets) for b in buffers)
+        chars = sum(len(t) for b in buffers for _, t in b.snippets)
+        cache = self._users.stats()
+        return {"users": len(buffers), "snippets": snippets, "chars": chars,
+                "hits": cache["hits"], "misses": cache["misses"], "hit_rate": cache["hit_rate"]}
+
+
+class ChatLine:
+    __slots__ = ("message_id", "author", "content")
+
+    def __init__(self, message_id: int, author: str, content: str):
+        self.message_id = message_id
+        self.author = author
+        self.content = content
+
+    def __str__(self):
+        return f"{self.author}: {self.content}"
+
+
+class _Window:
+    __slots__ = ("lines", "warm")
+
+    def __init__(self, maxlen: int):
+        self.lines = collections.deque(maxlen=maxlen)  # oldest first
+        self.warm = False
+
+
+class ChannelWindows:
+    """
+    Rolling window of the last `size` human chat lines per channel, fed by on_message.
+
+    `!moodplay` builds its prompt from the window with zero REST calls once the
+    window is warm (full, or already back-filled from history once). Windows of
+    idle channels expire, so memory stays flat across thousands of channels.
+    """
+
+    def __init__(self, size: int = 10, max_channels: int = 10000, idle_ttl: float = 6 * 3600,
+                 line_len: int = 160):
+        self.size = size
+        self.line_len = line_len
+        self._windows = TTLCache(maxsize=max_channels, ttl=idle_ttl, sliding=True)
+
+    def _window(self, channel_id: int) -> _Window:
+        win = self._windows.get(channel_id, count=False)
+        if win is None:
+            win = _Window(self.size)
+            self._windows[channel_id] = win
+        return win
+
+    def _line(self, message_id: int, author: str, content: str):
+        content = content.replace("\n", " ").strip()
+        if not content:
+            return None
+        return ChatLine(message_id, author, content[:self.line_len])
+
+    def record(self, channel_id: int, message_id: int, author: str, content: str):
+        line = self._line(message_id, author, content)
+        if line is not None:
+            self._window(channel_id).lines.append(line)
+
+    def lines(self, channel_id: int):
+        """The window as 'author: text' strings (oldest first), or None if it is cold."""
+        win = self._windows.get(channel_id)
+        if win is None or not (win.warm or len(win.lines) >= self.size):
+            return None
+        return [str(line) for line in win.lines]
+
+    def texts(self, channel_id: int):
+        """Message texts in the window (oldest first), warm or not, or None; no hit/miss counting."""
+        win = self._windows.get(channel_id, count=False)
+        return [line.content for line in win.lines] if win is not None and win.lines else None
+
+    def warm(self, channel_id: int, messages):
+        """Back-fill from history: `messages` are (message id, author, content) tuples."""
+        win = self._window(channel_id)
+        merged = {line.message_id: line for line in win.lines}
+        for mid, author, content in messages:
+            if mid not in merged:
+                line = self._line(mid, author, content)
+                if line is not None:
+                    merged[mid] = line
+        win.lines.clear()
+        win.lines.extend(line for _, line in sorted(merged.items())[-self.size:])
+        win.warm = True
+        return [str(line) for line in win.lines]
+
+    def stats(self) -> dict:
+        windows = self._windows.values()
+        cache = self._windows.stats()
+        return {"channels": len(windows), "lines": sum(len(w.lines) for w in windows),
+                "hits": cache["hits"], "misses": cache["misses"], "hit_rate": cache["hit_rate"]}
@@ -0,0 +1,181 @@
+import asyncio
+import bisect
+import functools
+import time
+
+# latency buckets in seconds: sub-ms hot paths up to slow upstream APIs
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_str(names: tuple, values: tuple) -> str:
+    if not names:
+        return ""
+    body = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return "{" + body + "}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values = {}
+
+    def inc(self, *label_values, amount: float = 1.0):
+        self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def render(self) -> list:
+        return [f"{self.name}{_label_str(self.labels, k)} {v:g}" for k, v in list(self._values.items())]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, value: float, *label_values):
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> list:
+        lines = []
+        for key, series in list(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series[:-1]):
+                cumulative += count
+                le = bound if bound == "+Inf" else f"{bound:g}"
+                lines.append(f"{self.name}_bucket{_label_str(self.labels + ('le',), key + (le,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_str(self.labels, key)} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{_label_str(self.labels, key)} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """Values read from callbacks at scrape time, one callback per label set."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._sources = {}
+
+    def source(self, fn, *label_values):
+        """Register (or replace) the callback for one label set."""
+        self._sources[label_values] = fn
+        return self
+
+    def render(self) -> list:
+        lines = []
+        for key, fn in list(self._sources.items()):
+            try:
+                value = fn()
+            except Exception:
+                continue
+            lines.append(f"{self.name}{_label_str(self.labels, key)} {value:g}")
+        return lines
+
+
+class Registry:
+    def __init__(self, prefix: str = "tryhard_"):
+        self.prefix = prefix
+        self._metrics = {}
+
+    def _get(self, cls, name, *args, **kwargs):
+        name = self.prefix + name
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, *args, **kwargs)
+        return metric
+
+    def counter(self, name: str, help: str, labels: tuple = ()) -> Counter:
+        return self._get(Counter, name, help, labels)
+
+    def histogram(self, name: str, help: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help, labels, buckets)
+
+    def gauge(self, name: str, help: str, labels: tuple = ()) -> Gauge:
+        return self._get(Gauge, name, help, labels)
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        out = []
+        for metric in list(self._metrics.values()):
+            out.append(f"# HELP {metric.name} {metric.help}")
+            out.append(f"# TYPE {metric.name} {metric.kind}")
+            out.extend(metric.render())
+        return "\n".join(out) + "\n"
+
+
+REGISTRY = Registry()
+
+CALL_LATENCY = REGISTRY.histogram("external_call_duration_seconds", "Latency of outbound calls.", ("call",))
+CALL_ERRORS = REGISTRY.counter("external_call_errors_total", "Failed outbound calls.", ("call",))
+COMMAND_LATENCY = REGISTRY.histogram("command_duration_seconds", "Command handler latency.", ("command",))
+COMMAND_ERRORS = REGISTRY.counter("command_errors_total", "Commands that raised.", ("command",))
+EVENT_LATENCY = REGISTRY.histogram("event_duration_seconds", "Gateway event handler latency.", ("event",))
+EVENT_ERRORS = REGISTRY.counter("event_errors_total", "Gateway event handlers that raised.", ("event",))
+HANDLER_LATENCY = REGISTRY.histogram("message_handler_duration_seconds", "Per-handler on_message pipeline latency.", ("handler",))
+HANDLER_ERRORS = REGISTRY.counter("message_handler_errors_total", "on_message pipeline handlers that raised.", ("handler",))
+CACHE_HIT_RATIO = REGISTRY.gauge("cache_hit_ratio", "Hit ratio of in-memory caches.", ("cache",))
+CACHE_ENTRIES = REGISTRY.gauge("cache_entries", "Entries held by in-memory caches.", ("cache",))
+LOOP_LAG = REGISTRY.histogram("event_loop_lag_seconds", "How late the event loop woke a sleeping task.",
+                              buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0))
+
+
+def timed(call: str, histogram: Histogram = CALL_LATENCY, errors: Counter = CALL_ERRORS):
+    """Decorator for coroutines: record latency (and failures) under label `call`."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            except Exception:
+                errors.inc(call)
+                raise
+            finally:
+                histogram.observe(time.perf_counter() - start, call)
+        return wrapper
+    return decorator
+
+
+class LoopLagMonitor:
+    """Sleeps `interval` seconds in a loop and records how late each wake-up was."""
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.last_lag = 0.0
+        self._task = None
+        REGISTRY.gauge("event_loop_lag_last_seconds", "Most recent event loop lag sample.").source(lambda: self.last_lag)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.last_lag = max(0.0, loop.time() - start - self.interval)
+            LOOP_LAG.observe(self.last_lag)
@@ -0,0 +1,332 @@
+import re
+import string
+import threading
+from operator import itemgetter
+from typing import NamedTuple
+
+# ---------------- LEXICON -----------------
+
+# Mood columns, in score-matrix order; the first three lift valence, the rest lower it
+MOODS = ("happy", "excited", "chill", "sad", "stressed", "angry", "anxious")
+VALENCE = (1, 1, 1, -1, -1, -1, -1)
+
+# term -> weight per mood. Single tokens (see MoodLexicon.tokens()); inflections are listed explicitly
+# so "down" never matches inside "download".
+MOOD_TERMS = {
+    "happy": {
+        "happy": 2, "glad": 1.5, "great": 1, "awesome": 1.5, "amazing": 1.5, "good": 0.5, "love": 1.5,
+        "loved": 1, "loving": 1, "nice": 1, "yay": 1.5, "win": 1, "won": 1, "fun": 1, "lol": 0.5,
+        "lmao": 0.5, "lmfao": 0.5, "haha": 1, "hahaha": 1, "hehe": 1, "content": 0.5, "grateful": 1.5,
+        "thanks": 0.5, "thank": 0.5, "proud": 1.5, "blessed": 1.5, "wholesome": 1.5, "cute": 1,
+        "best": 1, "gg": 0.5, "😂": 0.5, "🤣": 0.5, "😄": 1.5, "😁": 1.5, "😊": 1.5, "🥰": 1.5, "❤": 1,
+    },
+    "excited": {
+        "excited": 2, "hyped": 2, "hype": 1.5, "pumped": 2, "lets": 0.5, "omg": 1,
+        "stoked": 2, "insane": 1, "poggers": 1.5, "pog": 1.5, "letsgo": 2, "woo": 1.5, "wooo": 1.5,
+        "yes": 0.5, "finally": 1, "🔥": 1, "🎉": 1.5, "🥳": 1.5,
+    },
+    "chill": {
+        "chill": 2, "chilling": 2, "chillin": 2, "relaxed": 2, "relax": 1.5, "relaxing": 1.5, "calm": 1.5,
+        "cozy": 1.5, "peaceful": 2, "vibing": 1.5, "vibes": 1, "vibe": 0.5, "comfy": 1.5, "nap": 1,
+        "fine": 0.5, "okay": 0.3, "😌": 1.5,
+    },
+    "sad": {
+        "sad": 2, "sadness": 2, "sadge": 1.5, "depressed": 2.5, "depression": 2.5, "depressing": 2,
+        "cry": 2, "crying": 2, "cried": 2, "tears": 1.5, "lonely": 2, "alone": 1, "worthless": 2.5,
+        "hopeless": 2.5, "empty": 1, "numb": 1.5, "lost": 1, "down": 1, "hurt": 1.5, "pain": 1.5,
+        "broken": 1.5, "miss": 0.5, "tired": 1, "exhausted": 1, "drained": 1, "fml": 1.5, "ugh": 1,
+        "😢": 2, "😭": 1.5, "💔": 2, "😔": 1.5, "😞": 1.5, "☹": 1.5, "🥺": 1,
+    },
+    "stressed": {
+        "stress": 2, "stressed": 2.5, "stressful": 2, "pressure": 1.5, "deadline": 1.5, "deadlines": 1.5,
+        "overwhelmed": 2.5, "exam": 0.5, "exams": 0.5, "busy": 0.5, "swamped": 2, "burnt": 1.5,
+        "burned": 1, "tired": 0.5, "exhausted": 1, "drained": 1, "cramming": 1.5, "ugh": 0.5, "😩": 1.5,
+        "😫": 1.5,
+    },
+    "angry": {
+        "angry": 2.5, "mad": 2, "pissed": 2.5, "furious": 3, "hate": 2, "hating": 1.5, "annoyed": 1.5,
+        "annoying": 1.5, "upset": 1.5, "rage": 2, "raging": 2, "trash": 1, "wtf": 1, "stupid": 1,
+        "😡": 2.5, "🤬": 3, "😠": 2,
+    },
+    "anxious": {
+        "anxious": 2.5, "anxiety": 2.5, "nervous": 2, "worried": 2, "worry": 1.5, "scared": 2,
+        "afraid": 2, "panic": 2.5, "panicking": 2.5, "overthinking": 2, "uneasy": 1.5, "dread": 2,
+        "😰": 2, "😟": 1.5, "😬": 1,
+    },
+}
+
+# a negator flips lexicon terms up to two tokens after it in the same message ("not happy", "don't hate it")
+NEGATORS = frozenset({
+    "not", "no", "never", "dont", "don't", "isnt", "isn't", "aint", "ain't", "wasnt", "wasn't",
+    "cant", "can't", "wont", "won't", "nor", "without", "hardly", "barely", "neither",
+})
+# distinct tokens remembered by the lookup memo before it starts over
+MEMO_SIZE = 100_000
+# score() matches tokens by their first KEY_BYTES bytes (one 8-byte word for most);
+# every lexicon token must be shorter
+KEY_BYTES = 16
+
+# Tokenizing runs on UTF-8 bytes so the heavy lifting stays in C: a few replace() calls
+# for curly quotes and emoji, then one translate() that lowercases ASCII and turns
+# punctuation and whitespace into spaces (apostrophes are kept for "don't"), so a token is
+# any run of non-space bytes. Non-ASCII letters pass through untouched.
+_BYTE_TABLE = bytes(
+    c + 32 if 65 <= c <= 90 else 32 if chr(c) in string.punctuation + string.whitespace + "\0" and c != 39 else c
+    for c in range(256)
+)
+_REPLACEMENTS = [(a.encode(), b.encode()) for a, b in (
+    ("’", "'"), ("‘", "'"), ("“", " "), ("”", " "), ("…", " "),
+    ("\ufe0f", ""),  # emoji variation selector: "❤️" scores as "❤"
+)]
+# every 4-byte character (nearly all emoji) starts a new token; lexicon emoji outside that
+# range are padded on both sides in __init__
+_WIDE_LEAD = b"\xf0"
+# message / buffer separators _prepare() joins with; bare tokens after split()
+_MESSAGE_SEP, _BUFFER_SEP = " \x02 ", " \x01 "
+_ELONGATED = re.compile(r"(.)\1{2,}")
+_REPEATS = re.compile(r"(.)\1+")
+
+# token codes besides vocabulary columns (>= 0)
+_OTHER, _NEGATOR, _MESSAGE_END, _BUFFER_END = -1, -2, -3, -4
+
+
+def _mix(np, lo, hi):
+    # one 64-bit search key per token; matches are confirmed on (lo, hi) afterwards
+    return lo ^ (hi * np.uint64(0x9E3779B97F4A7C15))
+
+
+class MoodResult(NamedTuple):
+    key: object
+    mood: str        # strongest mood column, or "neutral"
+    valence: float   # positive minus negative weight, per message
+    hits: int        # lexicon terms matched
+    messages: int
+    scores: tuple    # summed weight per MOODS column
+
+
+# ---------------- SCORING ENGINE -----------------
+class MoodLexicon:
+    """
+    Weighted term lexicon that scores many message buffers in one matrix product.
+
+    A whole batch is normalized into one byte string and its tokens are
+    matched against the vocabulary on the byte array (a sorted-key search, no
+    per-token Python objects); the matches go into a (buffers x vocabulary)
+    count matrix (negated terms count -1), which is multiplied by the
+    (vocabulary x mood) weight matrix. Scoring a guild's users and channels
+    is one `score()` call.
+
+    numpy is imported on the first batch only: `mood()` scores a single
+    buffer in plain Python, so the !mymood fallback never loads it. It gives
+    the same labels as a batch of one; it is not meant to be fast.
+    """
+
+    def __init__(self, terms: dict = None, min_score: float = 1.0):
+        terms = terms or MOOD_TERMS
+        self.min_score = min_score
+        self.index = {}  # token -> vocabulary column
+        vocab = sorted({t for weights in terms.values() for t in weights})
+        for i, term in enumerate(vocab):
+            self.index[term] = i
+        # elongated spellings ("happyyy", "sooo sad") are looked up with repeats folded;
+        # kept separate so a plain "god" never reads as "good"
+        self.folded = {_REPEATS.sub(r"\1", t): i for t, i in self.index.items()}
+        # sparse rows of the weight matrix: column -> ((mood column, weight), ...)
+        self.term_weights = [()] * len(vocab)
+        for col, mood in enumerate(MOODS):
+            for term, weight in terms.get(mood, {}).items():
+                i = self.index[term]
+                self.term_weights[i] += ((col, weight),)
+        self._weights = None  # dense (vocabulary x mood) numpy matrix, built by score()
+        self._keys = None     # sorted token keys -> codes for score(), built with _weights
+        self._masks = None    # _masks[n]: a uint64 with its low n bytes set, n = 0..8
+        padded = [(t.encode(), f" {t} ".encode()) for t in vocab if not t.isascii()
+                  and not t.encode().startswith(_WIDE_LEAD)]
+        # grouped by lead byte: one cheap scan skips a whole group when chat has none of it
+        self._replacements = {}
+        for old, new in _REPLACEMENTS + padded:
+            self._replacements.setdefault(old[:1], []).append((old, new))
+        self._memo = {}  # token bytes -> code, so each distinct chat word is classified once
+        self._memo_lock = threading.Lock()  # score() may run in worker threads
+
+    def __len__(self):
+        return len(self.index)
+
+    def _code(self, token: bytes) -> int:
+        if token == b"\x02":
+            return _MESSAGE_END
+        if token == b"\x01":
+            return _BUFFER_END
+        word = token.decode(errors="replace").strip("'")
+        if word in NEGATORS:
+            return _NEGATOR
+        i = self.index.get(word)
+        if i is None and _ELONGATED.search(word):
+            i = self.folded.get(_REPEATS.sub(r"\1", word))
+        return _OTHER if i is None else i
+
+    def _prepare(self, buffers: list) -> bytes:
+        """A whole batch as one normalized byte string, buffers and messages separated by marker tokens."""
+        text = _BUFFER_SEP.join(_MESSAGE_SEP.join(texts) for texts in buffers)
+        if text.count("\x01") != max(len(buffers) - 1, 0):
+            # a message carried the separator itself; blank it so rows stay aligned
+            text = _BUFFER_SEP.join(_MESSAGE_SEP.join(t.replace("\x01", " ") for t in texts) for texts in buffers)
+        data = text.encode()
+        if not data.isascii():
+            for lead, pairs in self._replacements.items():
+                if lead in data:
+                    for old, new in pairs:
+                        data = data.replace(old, new)
+            data = data.replace(_WIDE_LEAD, b" " + _WIDE_LEAD)
+        return data.translate(_BYTE_TABLE)
+
+    def tokens(self, buffers: list) -> list:
+        return self._prepare(buffers).split()
+
+    def codes(self, tokens: list):
+        """Code of every token: one lookup each, and only unseen words are classified in Python."""
+        with self._memo_lock:
+            memo = self._memo
+            new = set(tokens).difference(memo)
+            if len(memo) + len(new) > MEMO_SIZE:
+                memo.clear()
+                new = set(tokens)
+            for token in new:
+                memo[token] = self._code(token)
+            if len(tokens) < 2:
+                return [memo[t] for t in tokens]
+            return itemgetter(*tokens)(memo)
+
+    def _build_tables(self, np):
+        weights = np.zeros((len(self.index), len(MOODS)), dtype=np.float64)
+        for i, pairs in enumerate(self.term_weights):
+            for col, weight in pairs:
+                weights[i, col] = weight
+        special = {"\x02": _MESSAGE_END, "\x01": _BUFFER_END, **{w: _NEGATOR for w in NEGATORS}}
+        entries = [(t.encode(), code) for t, code in {**self.index, **special}.items()]
+        assert all(len(t) < KEY_BYTES for t, _ in entries), "lexicon token too long for score()"
+        # every token as two little-endian uint64 words: its UTF-8 bytes zero-padded to KEY_BYTES
+        # ("sad" -> lo = 0x646173, hi = 0); _batch_codes() packs chat tokens the same way
+        words = np.frombuffer(b"".join(t.ljust(KEY_BYTES, b"\0") for t, _ in entries), dtype="<u8").reshape(-1, 2)
+        codes = np.array([code for _, code in entries], dtype=np.int64)
+        long = np.array([len(t) > 8 for t, _ in entries])
+        # tokens of up to 8 bytes are their own key (hi is 0); longer ones hash both words
+        short_order = np.argsort(words[~long, 0])
+        lo, hi = words[long, 0], words[long, 1]
+        long_keys = _mix(np, lo, hi)
+        long_order = np.argsort(long_keys)
+        self._keys = (
+            (words[~long, 0][short_order], codes[~long][short_order]),
+            (long_keys[long_order], lo[long_order], hi[long_order], codes[long][long_order]),
+        )
+        self._masks = np.array([(1 << (8 * n)) - 1 for n in range(9)], dtype=np.uint64)
+        self._weights = weights
+
+    def _batch_codes(self, np, data: bytes):
+        """Code of every token in `data`, computed on the byte array without per-token Python objects."""
+        # space-framed (and padded, so an 8-byte window fits past the last token)
+        raw = b" " + data + b" " * (KEY_BYTES + 1)
+        buf = np.frombuffer(raw, dtype=np.uint8)
+        # token boundaries: +1 where a space turns into a non-space, -1 where it turns back
+        edges = np.flatnonzero(np.diff((buf != 32).view(np.int8)))
+        starts = edges[0::2] + 1
+        lens = edges[1::2] + 1 - starts
+        (short_keys, short_codes), (long_keys, long_lo, long_hi, long_codes) = self._keys
+        masks = self._masks
+        windows = np.lib.stride_tricks.sliding_window_view(buf, 8)
+        # lo: each token's first 8 bytes read as one little-endian uint64 (byte i is bits 8i..8i+7),
+        # then masked to its length, so the next token's bytes read as the zero padding of the keys
+        lo = windows[starts].view("<u8")[:, 0]
+        lo &= masks[np.minimum(lens, 8)]
+        # binary search in the sorted short keys; a hit must be an exact match of a <= 8 byte token
+        pos = np.minimum(np.searchsorted(short_keys, lo), len(short_keys) - 1)
+        codes = np.where((short_keys[pos] == lo) & (lens <= 8), short_codes[pos], _OTHER)
+        # the few 9-15 byte tokens also need hi, their bytes 8..15 (masked the same way); they are
+        # found on the mixed key and confirmed on both words, since different tokens can share a key
+        long = np.flatnonzero((lens > 8) & (lens < KEY_BYTES))
+        if len(long_keys) and len(long):
+            l_lo = lo[long]
+            l_hi = windows[starts[long] + 8].view("<u8")[:, 0]
+            l_hi &= masks[lens[long] - 8]
+            h = _mix(np, l_lo, l_hi)
+            pos = np.minimum(np.searchsorted(long_keys, h), len(long_keys) - 1)
+            hit = (long_keys[pos] == h) & (long_lo[pos] == l_lo) & (long_hi[pos] == l_hi)
+            codes[long[hit]] = long_codes[pos[hit]]
+        # the rare tokens that need folding ("happyyy", "'sad'") go through _code(): any token
+        # holding a byte repeated 3 times, or starting/ending with an apostrophe
+        same = buf[1:] == buf[:-1]
+        triple = np.flatnonzero(same[1:] & same[:-1])
+        triple = triple[buf[triple] != 32]
+        quoted = np.flatnonzero((buf[starts] == 39) | (buf[starts + lens - 1] == 39))
+        odd = set((np.searchsorted(starts, triple, side="right") - 1).tolist())
+        odd.update(quoted.tolist())
+        for i in odd:
+            codes[i] = self._code(raw[starts[i]:starts[i] + lens[i]])
+        return codes
+
+    def score(self, buffers: list) -> tuple:
+        """
+        Score a batch of message buffers (each a list of texts).
+
+        Returns (moods, valence, hits) as numpy arrays: a (len(buffers),
+        len(MOODS)) matrix of summed mood weights (negations can push a column
+        below zero), the per-buffer valence and the number of matched terms.
+        """
+        import numpy as np
+
+        if self._weights is None:
+            self._build_tables(np)
+        n, v = len(buffers), len(self.index)
+        codes = self._batch_codes(np, self._prepare(buffers))
+        # only the matched terms are looked at from here on
+        at = np.flatnonzero(codes >= 0)
+        term_rows = np.searchsorted(np.flatnonzero(codes == _BUFFER_END), at)
+        # negated: a negator 1 token back, or 2 back with no message break between
+        before = np.concatenate(([_OTHER, _OTHER], codes))
+        prev1, prev2 = before[at + 1], before[at]
+        negated = (prev1 == _NEGATOR) | ((prev2 == _NEGATOR) & (prev1 > _MESSAGE_END))
+        flat = term_rows * v + codes[at]
+        signs = np.where(negated, -1.0, 1.0)
+        counts = np.bincount(flat, weights=signs, minlength=n * v).reshape(n, v)
+        moods = counts @ self._weights
+        hits = np.bincount(term_rows, minlength=n)
+        return moods, moods @ np.array(VALENCE, dtype=np.float64), hits
+
+    def label(self, scores) -> str:
+        best = max(range(len(MOODS)), key=scores.__getitem__)
+        return MOODS[best] if scores[best] >= self.min_score else "neutral"
+
+    def rank(self, buffers: dict) -> list:
+        """Score {key: [texts]} in one batch; results sorted from most positive to most negative."""
+        keys = list(buffers)
+        texts = [buffers[k] for k in keys]
+        if not keys:
+            return []
+        moods, valence, hits = self.score(texts)
+        results = []
+        for key, t, row, val, h in zip(keys, texts, moods.tolist(), valence.tolist(), hits.tolist()):
+            results.append(MoodResult(key, self.label(row), val / max(len(t), 1), h, len(t), tuple(row)))
+        results.sort(key=lambda r: r.valence, reverse=True)
+        return results
+
+    def overall(self, results: list) -> str:
+        """Mood label of several ranked buffers taken together, without rescoring them."""
+        if not results:
+            return "neutral"
+        return self.label([sum(col) for col in zip(*(r.scores for r in results))])
+
+    def mood(self, texts: list) -> str:
+        """The mood label of one buffer, scored in plain Python (same result as a batch of one)."""
+        totals = [0.0] * len(MOODS)
+        weights = self.term_weights
+        prev1 = prev2 = _MESSAGE_END
+        for code in self.codes(self.tokens([texts])):
+            if code >= 0:
+                negated = prev1 == _NEGATOR or (prev2 == _NEGATOR and prev1 > _MESSAGE_END)
+                for col, weight in weights[code]:
+                    totals[col] += -weight if negated else weight
+            prev2, prev1 = prev1, code
+        return self.label(totals)
+
+
+LEXICON = MoodLexicon()
@@ -0,0 +1,248 @@
+import asyncio
+import heapq
+import io
+import itertools
+import time
+
+import discord
+from discord.ext import commands
+
+from cooldown import TokenBucket
+
+REPLY = 0   # user-facing answers go first
+STATUS = 1  # progress chatter ("Talking to Gemini...")
+
+DISCORD_LIMIT = 2000
+
+
+class _Item:
+    __slots__ = ("content", "kwargs", "mentions", "future", "merge", "enqueued")
+
+    def __init__(self, content, kwargs, future, merge=True):
+        self.content = content
+        # allowed_mentions is the one send option that merged text can share
+        self.mentions = kwargs.pop("allowed_mentions", None)
+        self.kwargs = kwargs
+        self.future = future
+        self.merge = merge
+        self.enqueued = time.perf_counter()
+
+    @property
+    def mergeable(self) -> bool:
+        return self.merge and self.content is not None and not self.kwargs
+
+    def same_mentions(self, other) -> bool:
+        a, b = self.mentions, other.mentions
+        return a is b or (a is not None and b is not None and a.to_dict() == b.to_dict())
+
+
+class _ChannelQueue:
+    __slots__ = ("channel", "heap", "bucket", "worker", "wake")
+
+    def __init__(self, channel, bucket):
+        self.channel = channel
+        self.heap = []
+        self.bucket = bucket
+        self.worker = None
+        self.wake = asyncio.Event()
+
+
+class OutboundDispatcher:
+    """
+    Per-channel outbound queue in front of `channel.send`.
+
+    - Replies (REPLY) are sent before status chatter (STATUS), FIFO within a priority.
+    - Plain-text messages queued within `merge_window` seconds of each other are
+      merged into one send (up to Discord's 2000 character limit), unless queued
+      with `merge=False` (messages that are edited later must stay their own).
+      Only messages with the same `allowed_mentions` are merged, and the merged
+      send keeps it.
+    - Each channel's message route gets a proactive token bucket (`burst` sends,
+      refilled at `rate` per second) so we wait locally instead of hitting 429s.
+
+    A worker task exists only while a channel has queued messages. `send()`
+    waits for the resulting Message; `post()` is fire-and-forget.
+    """
+
+    def __init__(self, rate: float = 1.0, burst: int = 5, merge_window: float = 0.1):
+        self.rate = rate
+        self.burst = float(burst)
+        self.merge_window = merge_window
+        self._queues = {}
+        self._seq = itertools.count()
+        self.sent = 0
+        self.merged = 0
+        self.errors = 0
+        self.total_latency_ms = 0.0
+        self.max_latency_ms = 0.0
+
+    @staticmethod
+    def _channel(dest):
+        return dest.channel if isinstance(dest, commands.Context) else dest
+
+    def depth(self) -> int:
+        return sum(len(q.heap) for q in self._queues.values())
+
+    def _enqueue(self, dest, content, priority, kwargs, future, merge=True):
+        channel = self._channel(dest)
+        q = self._queues.get(channel.id)
+        if q is None:
+            q = self._queues[channel.id] = _ChannelQueue(channel, TokenBucket(self.burst, time.monotonic()))
+        heapq.heappush(q.heap, (priority, next(self._seq), _Item(content, kwargs, future, merge)))
+        q.wake.set()
+        if q.worker is None or q.worker.done():
+            q.worker = asyncio.create_task(self._drain(channel.id, q))
+
+    async def send(self, dest, content=None, *, priority: int = REPLY, merge: bool = True, **kwargs):
+        """Queue a message and wait until it has been sent. Returns the Message."""
+        future = asyncio.get_running_loop().create_future()
+        self._enqueue(dest, content, priority, kwargs, future, merge)
+        return await future
+
+    def post(self, dest, content=None, *, priority: int = REPLY, merge: bool = True, **kwargs):
+        """Queue a message without waiting for it."""
+        self._enqueue(dest, content, priority, kwargs, None, merge)
+
+    async def safe_send(self, dest, text: str, *, priority: int = REPLY, **kwargs):
+        """Send text safely without exceeding Discord limit."""
+        if len(text) <= DISCORD_LIMIT:
+            return await self.send(dest, text, priority=priority, **kwargs)
+        # If long, ship as a file instead of spamming chunks
+        data = io.BytesIO(text.encode("utf-8"))
+        return await self.send(dest, priority=priority, file=discord.File(data, filename="message.txt"))
+
+    async def send_as_file(self, dest, content: str, filename: str, header: str = None, *, priority: int = REPLY):
+        """Attach long content as a file instead of breaking Discord limit."""
+        if header:
+            self.post(dest, header, priority=priority)
+        data = io.BytesIO(content.encode("utf-8"))
+        return await self.send(dest, priority=priority, file=discord.File(data, filename))
+
+    def _take_merged(self, q: _ChannelQueue, first: _Item) -> list:
+        batch = [first]
+        size = len(first.content)
+        while q.heap:
+            nxt = q.heap[0][2]
+            if not nxt.mergeable or not nxt.same_mentions(first) or size + 1 + len(nxt.content) > DISCORD_LIMIT:
+                break
+            heapq.heappop(q.heap)
+            batch.append(nxt)
+            size += 1 + len(nxt.content)
+        return batch
+
+    async def _drain(self, channel_id: int, q: _ChannelQueue):
+        try:
+            while q.heap:
+                _, _, item = heapq.heappop(q.heap)
+                batch = [item]
+                if item.mergeable:
+                    if not q.heap:
+                        # give an adjacent small message a moment to arrive and ride along
+                        q.wake.clear()
+                        try:
+                            await asyncio.wait_for(q.wake.wait(), timeout=self.merge_window)
+                        except asyncio.TimeoutError:
+                            pass
+                    batch = self._take_merged(q, item)
+                await self._wait_for_token(q)
+                await self._send_batch(q.channel, batch)
+        finally:
+            if not q.heap and self._queues.get(channel_id) is q:
+                del self._queues[channel_id]
+
+    async def _wait_for_token(self, q: _ChannelQueue):
+        while not q.bucket.take(self.rate, self.burst, time.monotonic()):
+            await asyncio.sleep((1.0 - q.bucket.tokens) / self.rate)
+
+    async def _send_batch(self, channel, batch: list):
+        first = batch[0]
+        try:
+            kwargs = dict(first.kwargs)
+            if first.mentions is not None:
+                kwargs["allowed_mentions"] = first.mentions
+            content = "\n".join(i.content for i in batch) if len(batch) > 1 else first.content
+            msg = await channel.send(content, **kwargs)
+        except Exception as e:
+            self.errors += 1
+            for item in batch:
+                if item.future is None:
+                    print(f"⚠️ Queued send to {getattr(channel, 'id', channel)} failed: {e}")
+                elif not item.future.done():
+                    item.future.set_exception(e)
+            return
+        self.sent += 1
+        self.merged += len(batch) - 1
+        now = time.perf_counter()
+        for item in batch:
+            latency = (now - item.enqueued) * 1e3
+            self.total_latency_ms += latency
+            self.max_latency_ms = max(self.max_latency_ms, latency)
+            if item.future is not None and not item.future.done():
+                item.future.set_result(msg)
+
+    def stats(self) -> dict:
+        delivered = self.sent + self.merged
+        avg = self.total_latency_ms / delivered if delivered else 0.0
+        return {"depth": self.depth(), "channels": len(self._queues), "sends": self.sent,
+                "merged": self.merged, "errors": self.errors,
+                "avg_latency_ms": round(avg, 1), "max_latency_ms": round(self.max_latency_ms, 1)}
+
+
+class LiveMessage:
+    """
+    One status message edited in place instead of a trail of new messages.
+
+    `update(text)` never blocks: the first call sends the message through the
+    outbox (unmerged, so later edits cannot overwrite other queued text), later
+    calls just replace the pending text, and a single flusher task applies it
+    with at most one edit per `min_interval` seconds (the newest text wins,
+    intermediate ones are skipped). `finish()` waits until the final text is
+    shown.
+    """
+
+    def __init__(self, outbox: OutboundDispatcher, dest, *, priority: int = STATUS, min_interval: float = 1.0):
+        self.outbox = outbox
+        self.dest = dest
+        self.priority = priority
+        self.min_interval = min_interval
+        self.message = None
+        self.edits = 0
+        self._pending = None
+        self._shown = None
+        self._last = 0.0
+        self._flusher = None
+        self._failed = False
+
+    def update(self, text: str):
+        self._pending = text[:DISCORD_LIMIT]
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush())
+
+    async def finish(self, text: str = None):
+        """Show `text` (or the last update) and wait until it is on screen. Returns the Message."""
+        if text is not None:
+            self.update(text)
+        while self._flusher is not None and not self._flusher.done():
+            await asyncio.shield(self._flusher)
+        return self.message
+
+    async def _flush(self):
+        while not self._failed and self._pending != self._shown:
+            text = self._pending
+            try:
+                if self.message is None:
+                    self.message = await self.outbox.send(self.dest, text, priority=self.priority, merge=False)
+                else:
+                    wait = self._last + self.min_interval - time.monotonic()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                        text = self._pending
+                    await self.message.edit(content=text)
+                    self.edits += 1
+            except Exception as e:
+                # status chatter only: give up on live updates, never fail the command over it
+                print(f"⚠️ Live status update failed: {e}")
+                self._failed = True
+                return
+            self._shown = text
+            self._last = time.monotonic()
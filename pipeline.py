@@ -0,0 +1,92 @@
+import time
+import traceback
+
+from metrics import HANDLER_ERRORS, HANDLER_LATENCY
+from wordfilter import fold_text
+
+STOP = True  # handler return value: skip remaining handlers and command processing
+
+
+class MessageContext:
+    """
+    One incoming message plus the derived forms handlers share.
+
+    `lower` is computed once up front; `folded` (the strict filter form) is
+    computed on first access and then reused. `config` is the guild's settings
+    snapshot (looked up once per message). Handlers may stash their own
+    per-message results in `extras`.
+    """
+
+    __slots__ = ("message", "content", "lower", "guild_id", "config", "_folded", "extras")
+
+    def __init__(self, message, config=None):
+        self.message = message
+        self.content = message.content
+        self.lower = self.content.lower()
+        self.guild_id = message.guild.id if message.guild else 0
+        self.config = config
+        self._folded = None
+        self.extras = {}
+
+    @property
+    def folded(self) -> str:
+        if self._folded is None:
+            self._folded = fold_text(self.content)
+        return self._folded
+
+
+class _Handler:
+    __slots__ = ("name", "priority", "fn")
+
+    def __init__(self, name, priority, fn):
+        self.name = name
+        self.priority = priority
+        self.fn = fn
+
+
+class MessagePipeline:
+    """
+    The single on_message dispatch path.
+
+    Cogs register `async fn(mctx) -> bool | None` handlers with a priority
+    (lower runs first). A handler returning STOP short-circuits the rest of
+    the pipeline and command processing. Each handler is timed separately,
+    and one failing handler doesn't take the others down.
+    `config_for(guild_id)` supplies each message's `mctx.config`.
+    """
+
+    def __init__(self, config_for=None):
+        self.config_for = config_for
+        self._handlers = []
+
+    def register(self, name: str, priority: int, fn):
+        self.unregister(name)
+        self._handlers.append(_Handler(name, priority, fn))
+        self._handlers.sort(key=lambda h: h.priority)
+
+    def unregister(self, name: str):
+        self._handlers = [h for h in self._handlers if h.name != name]
+
+    @property
+    def handlers(self) -> list:
+        return [(h.priority, h.name) for h in self._handlers]
+
+    async def run(self, message) -> bool:
+        """Run every handler in order. Returns True if one of them stopped the pipeline."""
+        mctx = MessageContext(message)
+        if self.config_for is not None:
+            mctx.config = self.config_for(mctx.guild_id)
+        for h in self._handlers:
+            start = time.perf_counter()
+            try:
+                stop = await h.fn(mctx)
+            except Exception:
+                HANDLER_ERRORS.inc(h.name)
+                print(f"⚠️ Message handler {h.name} failed:")
+                traceback.print_exc()
+                stop = False
+            finally:
+                HANDLER_LATENCY.observe(time.perf_counter() - start, h.name)
+            if stop:
+                return True
+        return False
@@ -0,0 +1,108 @@
+import asyncio
+import collections
+import datetime as dt
+import random
+
+ZENQUOTES_BATCH_URL = "https://zenquotes.io/api/quotes"
+
+# fallback list of quotes
+quotes = [
+    "Believe you can and you're halfway there.",
+    "Keep going. Everything you need will come to you at the perfect time.",
+    "Dream big and dare to fail.",
+    "Success is not final, failure is not fatal: It is the courage to continue that counts.",
+]
+
+
+class QuotePool:
+    """
+    Bounded buffer of prefetched quotes kept full by one background task.
+
+    `get()` is an O(1) pop that never touches the network; whenever the buffer
+    drops below `low_water` the refill task wakes up and pulls a batch from
+    zenquotes (about 50 quotes per call). Failures and rate limits back off
+    exponentially. If the buffer is empty (cold start, upstream down) `get()`
+    falls back to the quotes of `bank` (a ContentBank, attached once it is
+    open), then to the local `fallback` list.
+    """
+
+    def __init__(self, http, fallback: list = quotes, url: str = ZENQUOTES_BATCH_URL,
+                 maxlen: int = 200, low_water: int = 20,
+                 min_backoff: float = 30.0, max_backoff: float = 900.0):
+        self.http = http
+        self.fallback = fallback
+        self.url = url
+        self.low_water = low_water
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self._quotes = collections.deque(maxlen=maxlen)
+        self._need_refill = asyncio.Event()
+        self._task = None
+        self._backoff = 0.0
+        self.bank = None
+
+    def __len__(self):
+        return len(self._quotes)
+
+    def get(self, guild_id: int = None) -> str:
+        """Pop a fresh quote, or a banked/local fallback quote if the buffer is empty."""
+        try:
+            quote = self._quotes.popleft()
+        except IndexError:
+            quote = self.bank.pick(guild_id, "quote") if self.bank is not None else None
+            quote = quote or self.fallback[dt.datetime.now().day % len(self.fallback)]
+        if len(self._quotes) < self.low_water:
+            self._need_refill.set()
+        return quote
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._need_refill.set()
+            self._task = asyncio.create_task(self._refill_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _fetch_batch(self) -> list:
+        status, data = await self.http.get_json(self.url, timeout=5)
+        if status != 200 or not isinstance(data, list):
+            raise RuntimeError(f"zenquotes returned HTTP {status}")
+        batch = []
+        for item in data:
+            q, a = item.get("q"), item.get("a")
+            # when rate limited zenquotes answers 200 with a single notice "quote"
+            if not q or not a or a == "zenquotes.io":
+                continue
+            batch.append(f"{q} — {a}")
+        if not batch:
+            raise RuntimeError("zenquotes returned no usable quotes (rate limited?)")
+        random.shuffle(batch)
+        return batch
+
+    async def _refill_loop(self):
+        while True:
+            await self._need_refill.wait()
+            self._need_refill.clear()
+            while len(self._quotes) < self.low_water:
+                try:
+                    batch = await self._fetch_batch()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self._backoff = min(self.max_backoff, max(self.min_backoff, self._backoff * 2))
+                    print(f"⚠️ Quote refill failed ({e}); retrying in {self._backoff:.0f}s")
+                    await asyncio.sleep(self._backoff)
+                    continue
+                self._backoff = 0.0
+                seen = set(self._quotes)
+                self._quotes.extend(q for q in batch if q not in seen)
+                if len(self._quotes) >= self.low_water:
+                    break
+                # zenquotes allows ~5 calls per 30s; don't hammer it while topping up
+                await asyncio.sleep(self.min_backoff / 5)
@@ -0,0 +1,188 @@
+import asyncio
+import heapq
+import sqlite3
+import time
+from typing import NamedTuple
+
+
+class Reminder(NamedTuple):
+    id: int
+    due: float  # unix timestamp
+    guild_id: int
+    channel_id: int
+    user_id: int
+    text: str
+
+
+class ReminderScheduler:
+    """
+    Persistent reminders: SQLite is the source of truth, and one in-memory
+    min-heap of (due, id) pairs is drained by a single dispatcher task.
+
+    There is no task per reminder, so memory per pending reminder is one small
+    tuple. Pending rows are reloaded at startup; anything that came due while
+    the bot was down fires right away in one batch. Cancelled reminders are
+    deleted from the table, but their heap entries stay (and count in len())
+    until their due time, when they are skipped.
+
+    `deliver(reminder)` is the coroutine that actually posts the reminder.
+    Each delivery runs as its own task (at most `batch_size` at once), so a
+    slow channel never holds up the reminders due after it. A row is deleted only once its delivery succeeded; a failed one is retried
+    `retry_delay` seconds later (doubling each time), up to `max_attempts`
+    tries, and a crash mid-delivery leaves it in the table for the next start.
+    When several shard workers share one database, pass the worker's
+    `shard_ids`/`shard_count` so each only loads and fires reminders for guilds
+    on its own shards (DM reminders belong to shard 0).
+    """
+
+    def __init__(self, path: str, deliver, batch_size: int = 100, shard_ids=None, shard_count: int = 1,
+                 retry_delay: float = 60.0, max_attempts: int = 5):
+        self.path = path
+        self.deliver = deliver
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self.max_attempts = max_attempts
+        self.shard_ids = shard_ids
+        self.shard_count = shard_count
+        self._db = None
+        self._heap = []
+        self._attempts = {}  # reminder id -> failed deliveries so far
+        self._inflight = set()  # delivery tasks
+        self._wake = asyncio.Event()
+        self._task = None
+
+    def __len__(self):
+        return len(self._heap)
+
+    def open(self):
+        if self._db is not None:
+            return
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS reminders ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " due REAL NOT NULL, guild_id INTEGER, channel_id INTEGER NOT NULL,"
+            " user_id INTEGER NOT NULL, text TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS reminders_user ON reminders(user_id, due)")
+        self._db.commit()
+        query, params = "SELECT id, due FROM reminders", ()
+        if self.shard_ids is not None:
+            # same routing as discord: (guild_id >> 22) % shard_count, NULL guild -> shard 0
+            marks = ",".join("?" * len(self.shard_ids))
+            query += f" WHERE (COALESCE(guild_id, 0) >> 22) % ? IN ({marks})"
+            params = (self.shard_count, *self.shard_ids)
+        self._heap = [(due, rid) for rid, due in self._db.execute(query, params)]
+        heapq.heapify(self._heap)
+
+    async def start(self):
+        self.open()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._dispatch_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # unfinished deliveries keep their rows and run again on the next start
+        for task in list(self._inflight):
+            task.cancel()
+        await asyncio.gather(*self._inflight, return_exceptions=True)
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def add(self, guild_id: int, channel_id: int, user_id: int, seconds: float, text: str) -> int:
+        """Persist a reminder due `seconds` from now and return its id."""
+        self.open()
+        due = time.time() + seconds
+        cur = self._db.execute(
+            "INSERT INTO reminders (due, guild_id, channel_id, user_id, text) VALUES (?, ?, ?, ?, ?)",
+            (due, guild_id, channel_id, user_id, text),
+        )
+        self._db.commit()
+        rid = cur.lastrowid
+        # only wake the dispatcher if this reminder is now the earliest one
+        if not self._heap or due < self._heap[0][0]:
+            self._wake.set()
+        heapq.heappush(self._heap, (due, rid))
+        return rid
+
+    def cancel(self, rid: int, user_id: int) -> bool:
+        """Delete one of `user_id`'s reminders. Returns False if it doesn't exist."""
+        self.open()
+        cur = self._db.execute("DELETE FROM reminders WHERE id = ? AND user_id = ?", (rid, user_id))
+        self._db.commit()
+        return cur.rowcount > 0
+
+    def pending_for(self, user_id: int, limit: int = 10) -> list:
+        self.open()
+        rows = self._db.execute(
+            "SELECT id, due, guild_id, channel_id, user_id, text FROM reminders"
+            " WHERE user_id = ? ORDER BY due LIMIT ?", (user_id, limit),
+        )
+        return [Reminder(*row) for row in rows]
+
+    def _pop_due(self, now: float, limit: int) -> list:
+        ids = []
+        while self._heap and self._heap[0][0] <= now and len(ids) < limit:
+            ids.append(heapq.heappop(self._heap)[1])
+        if not ids:
+            return []
+        marks = ",".join("?" * len(ids))
+        rows = self._db.execute(
+            f"SELECT id, due, guild_id, channel_id, user_id, text FROM reminders WHERE id IN ({marks})", ids
+        ).fetchall()
+        # rows missing here were cancelled; their heap entries are simply dropped
+        for rid in set(ids).difference(row[0] for row in rows):
+            self._attempts.pop(rid, None)
+        return [Reminder(*row) for row in sorted(rows, key=lambda r: r[1])]
+
+    def _start_delivery(self, r: Reminder):
+        task = asyncio.create_task(self.deliver(r))
+        self._inflight.add(task)
+        task.add_done_callback(lambda t: self._settle(r, t))
+
+    def _settle(self, r: Reminder, task: asyncio.Task):
+        """Delete a delivered (or given up) row; push a failed one back on the heap with backoff."""
+        self._inflight.discard(task)
+        self._wake.set()  # a delivery slot is free
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            attempts = self._attempts[r.id] = self._attempts.get(r.id, 0) + 1
+            if attempts < self.max_attempts:
+                print(f"⚠️ Reminder {r.id} could not be delivered (try {attempts}/{self.max_attempts}): {error}")
+                retry_at = time.time() + self.retry_delay * 2 ** (attempts - 1)
+                heapq.heappush(self._heap, (retry_at, r.id))
+                return
+            print(f"⚠️ Reminder {r.id} could not be delivered after {attempts} tries, dropping it: {error}")
+        self._attempts.pop(r.id, None)
+        self._db.execute("DELETE FROM reminders WHERE id = ?", (r.id,))
+        self._db.commit()
+
+    async def _dispatch_loop(self):
+        while True:
+            self._wake.clear()
+            if self._heap:
+                delay = self._heap[0][0] - time.time()
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+            else:
+                await self._wake.wait()
+                continue
+            if len(self._inflight) >= self.batch_size:
+                await self._wake.wait()
+                continue
+            for r in self._pop_due(time.time(), self.batch_size - len(self._inflight)):
+                self._start_delivery(r)
@@ -0,0 +1,116 @@
+import asyncio
+import time
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling an upstream whose breaker is open."""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} circuit open (retry in {retry_in:.0f}s)")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Classic three-state breaker for one upstream.
+
+    `failure_threshold` consecutive failures open the circuit; while open every
+    call is refused instantly. After `reset_timeout` seconds a single trial call
+    is let through (half-open): success closes the circuit, failure re-opens it
+    with the timeout doubled (capped at `max_reset_timeout`).
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 30.0,
+                 max_reset_timeout: float = 600.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._trial_in_flight = False
+
+    def retry_in(self) -> float:
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """Whether a call may go out now (claims the half-open trial slot if it's due)."""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and self.retry_in() <= 0:
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+        if self.state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def check(self):
+        if not self.allow():
+            raise CircuitOpen(self.name, self.retry_in())
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self.reset_timeout = self.base_reset_timeout
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN:
+            self.reset_timeout = min(self.max_reset_timeout, self.reset_timeout * 2)
+            self._open()
+        elif self.failures >= self.failure_threshold:
+            self._open()
+
+    def abandon(self):
+        """The call never finished (e.g. cancelled as a hedge loser): free the trial slot."""
+        self._trial_in_flight = False
+
+    def _open(self):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+
+async def first_success(*attempts, deadline: float, hedge_delay: float = 0.0):
+    """
+    Race coroutine factories and return the first truthy result, or None.
+
+    `attempts[0]` starts right away; each later one starts `hedge_delay` seconds
+    after the previous (0 = all in parallel) or as soon as everything already
+    started has failed. Failures and falsy results are ignored, losers are
+    cancelled, and nothing runs past `deadline` seconds in total.
+    """
+    loop = asyncio.get_running_loop()
+    end = loop.time() + deadline
+    pending = set()
+    queue = list(attempts)
+    try:
+        while queue or pending:
+            if queue and (not pending or hedge_delay <= 0):
+                pending.add(asyncio.ensure_future(queue.pop(0)()))
+                if queue and hedge_delay <= 0:
+                    continue
+            remaining = end - loop.time()
+            if remaining <= 0:
+                return None
+            timeout = min(remaining, hedge_delay) if queue else remaining
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if not task.cancelled() and task.exception() is None and task.result():
+                    return task.result()
+            if not done and queue:
+                # hedge: the running attempts are slow, start the next one alongside
+                pending.add(asyncio.ensure_future(queue.pop(0)()))
+        return None
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,164 @@
+import argparse
+import os
+
+
+def shard_for(guild_id, shard_count: int) -> int:
+    """Discord's shard routing: (guild_id >> 22) % shard_count. DMs (no guild) go to shard 0."""
+    if not guild_id or not shard_count or shard_count <= 1:
+        return 0
+    return (guild_id >> 22) % shard_count
+
+
+def parse_shard_ids(spec: str) -> list:
+    """'0-3' -> [0, 1, 2, 3]; '0,2,5-6' -> [0, 2, 5, 6]."""
+    ids = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            ids.extend(range(int(lo), int(hi) + 1))
+        else:
+            ids.append(int(part))
+    if not ids:
+        raise ValueError(f"empty shard spec: {spec!r}")
+    return sorted(set(ids))
+
+
+def format_shard_ids(ids) -> str:
+    """Inverse of parse_shard_ids for contiguous runs: [0, 1, 2, 5] -> '0-2,5'."""
+    ids = sorted(ids)
+    runs = []
+    start = prev = ids[0]
+    for i in ids[1:] + [None]:
+        if i is not None and i == prev + 1:
+            prev = i
+            continue
+        runs.append(str(start) if start == prev else f"{start}-{prev}")
+        if i is not None:
+            start = prev = i
+    return ",".join(runs)
+
+
+def split_ranges(shard_count: int, processes: int) -> list:
+    """Split shards 0..shard_count-1 into `processes` contiguous, near-equal ranges."""
+    processes = max(1, min(processes, shard_count))
+    base, extra = divmod(shard_count, processes)
+    ranges, start = [], 0
+    for p in range(processes):
+        size = base + (1 if p < extra else 0)
+        ranges.append(list(range(start, start + size)))
+        start += size
+    return ranges
+
+
+class ShardConfig:
+    """
+    Which shards this process runs.
+
+    `shard_ids is None` with `shard_count is None` is the classic single
+    connection; `auto` lets AutoShardedBot pick the recommended count; an
+    explicit count (optionally with a subset of ids) is what the multi-process
+    launcher hands each worker.
+    """
+
+    def __init__(self, shard_ids=None, shard_count=None, auto: bool = False):
+        if shard_ids is not None and not shard_count:
+            raise ValueError("--shards needs --shard-count")
+        if shard_ids is not None and any(not 0 <= s < shard_count for s in shard_ids):
+            raise ValueError(f"shard ids {shard_ids} out of range for {shard_count} shards")
+        self.shard_ids = shard_ids
+        self.shard_count = shard_count
+        self.auto = auto
+
+    @property
+    def sharded(self) -> bool:
+        return self.auto or self.shard_count is not None
+
+    @property
+    def partial(self) -> bool:
+        """True if other processes own some of the shards (state must be filtered)."""
+        return self.shard_ids is not None and len(self.shard_ids) < self.shard_count
+
+    def owns(self, guild_id) -> bool:
+        if not self.partial:
+            return True
+        return shard_for(guild_id, self.shard_count) in self.shard_ids
+
+    def label(self) -> str:
+        if self.shard_ids is not None:
+            return f"shards {format_shard_ids(self.shard_ids)} of {self.shard_count}"
+        if self.shard_count is not None:
+            return f"all {self.shard_count} shards"
+        return "auto-sharded" if self.auto else "unsharded"
+
+    def slug(self) -> str:
+        """Filesystem-safe name for this shard range ('' when unsharded)."""
+        if self.shard_ids is None:
+            return f"all-of-{self.shard_count}" if self.shard_count else ""
+        return f"{format_shard_ids(self.shard_ids).replace(',', '_')}-of-{self.shard_count}"
+
+    def path_for(self, base: str) -> str:
+        """`base` suffixed with the shard range, e.g. the lock file or log of one worker."""
+        slug = self.slug()
+        return f"{base}.{slug}" if slug else base
+
+    @classmethod
+    def from_argv(cls, argv) -> "ShardConfig":
+        """`--shards 0-3 --shard-count 8` / `--autoshard`, falling back to SHARD_IDS / SHARD_COUNT env vars."""
+        parser = argparse.ArgumentParser(add_help=False)
+        parser.add_argument("--shards", default=os.getenv("SHARD_IDS"))
+        parser.add_argument("--shard-count", default=os.getenv("SHARD_COUNT"))
+        parser.add_argument("--autoshard", action="store_true")
+        args, _ = parser.parse_known_args(argv)
+        auto = args.autoshard or (args.shard_count or "").lower() == "auto"
+        count = int(args.shard_count) if args.shard_count and not auto else None
+        ids = parse_shard_ids(args.shards) if args.shards else None
+        return cls(ids, count, auto=auto and ids is None)
+
+
+class ShardPartitioned:
+    """
+    Per-guild state split into one independent instance per shard.
+
+    `factory()` builds a partition on first use. Each partition keeps its own
+    bounds, so one busy shard can't evict another shard's entries, and a
+    process only ever holds partitions for the shards it runs. `shard_count`
+    may be a callable for AutoShardedBot, whose count is only known once it
+    has connected.
+    """
+
+    def __init__(self, factory, shard_count=1):
+        self.factory = factory
+        self._shard_count = shard_count
+        self._parts = {}
+
+    @property
+    def shard_count(self) -> int:
+        count = self._shard_count() if callable(self._shard_count) else self._shard_count
+        return count or 1
+
+    def for_shard(self, shard_id: int):
+        part = self._parts.get(shard_id)
+        if part is None:
+            part = self._parts[shard_id] = self.factory()
+        return part
+
+    def for_guild(self, guild_id):
+        return self.for_shard(shard_for(guild_id, self.shard_count))
+
+    def items(self):
+        return list(self._parts.items())
+
+    def merged_stats(self) -> dict:
+        """Sum each partition's `stats()` and recompute `hit_rate` from the summed hits/misses."""
+        total = {}
+        for part in self._parts.values():
+            for k, v in part.stats().items():
+                if k != "hit_rate":
+                    total[k] = total.get(k, 0) + v
+        lookups = total.get("hits", 0) + total.get("misses", 0)
+        total["hit_rate"] = total.get("hits", 0) / lookups if lookups else 0.0
+        total["shards"] = len(self._parts)
+        return total
@@ -0,0 +1,117 @@
+import importlib.abc
+import os
+import sys
+import time
+
+_PROCESS_START = time.perf_counter()
+
+
+def rss_mib() -> float:
+    """Resident set size of this process in MiB (0.0 if unavailable)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    except Exception:
+        return 0.0
+
+
+class _TimingLoader(importlib.abc.Loader):
+    def __init__(self, loader, name, profiler):
+        self._loader = loader
+        self._name = name
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._profiler._enter(self._name)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit(self._name)
+
+    def __getattr__(self, item):
+        return getattr(self._loader, item)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    def __init__(self, profiler):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimingLoader(spec.loader, fullname, self._profiler)
+                return spec
+        return None
+
+
+class StartupProfiler:
+    """
+    `--profile-startup` support: phase timestamps (lock, imports, login, READY),
+    RSS at each phase, and self-time per imported top-level package.
+
+    Disabled profilers cost nothing beyond a couple of attribute checks.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.phases = []  # (name, seconds since process start, rss MiB)
+        self.import_self_time = {}  # top-level package -> seconds
+        self._stack = []
+        self._finder = None
+        self._reported = False
+        if enabled:
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def _enter(self, name):
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def _exit(self, name):
+        _, start, child = self._stack.pop()
+        total = time.perf_counter() - start
+        top = name.split(".", 1)[0]
+        self.import_self_time[top] = self.import_self_time.get(top, 0.0) + (total - child)
+        if self._stack:
+            self._stack[-1][2] += total
+
+    def phase(self, name: str):
+        if self.enabled:
+            self.phases.append((name, time.perf_counter() - _PROCESS_START, rss_mib()))
+
+    def stop_import_tracking(self):
+        if self._finder is not None and self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+
+    def report(self, top: int = 15) -> str:
+        lines = ["⏱️ Startup profile", f"{'phase':<14}{'at (s)':>9}{'delta (s)':>11}{'RSS (MiB)':>11}"]
+        prev = 0.0
+        for name, at, rss in self.phases:
+            lines.append(f"{name:<14}{at:>9.3f}{at - prev:>11.3f}{rss:>11.1f}")
+            prev = at
+        if self.import_self_time:
+            lines.append(f"top imports by self time (of {len(self.import_self_time)} packages):")
+            ranked = sorted(self.import_self_time.items(), key=lambda kv: kv[1], reverse=True)
+            for name, secs in ranked[:top]:
+                lines.append(f"  {name:<28}{secs * 1e3:>9.1f} ms")
+        lines.append(f"pid {os.getpid()}")
+        return "\n".join(lines)
+
+    def print_report_once(self):
+        if self.enabled and not self._reported:
+            self._reported = True
+            self.stop_import_tracking()
+            print(self.report(), flush=True)
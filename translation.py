@@ -0,0 +1,101 @@
+import asyncio
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cache import TTLCache
+from metrics import CALL_ERRORS, CALL_LATENCY
+
+
+def _google_translator(target: str):
+    from deep_translator import GoogleTranslator
+    return GoogleTranslator(source="auto", target=target)
+
+
+class TranslationService:
+    """
+    Cached, coalesced translation for `!translate`.
+
+    Results are cached (LRU + TTL) under (target, whitespace-normalized text);
+    concurrent requests for the same key share one in-flight future instead of
+    each calling the upstream. The blocking translator calls run on a small
+    dedicated thread pool, and each worker thread keeps one translator per
+    target language instead of building a new one per request.
+    `translator_factory(target)` can be swapped for a local stand-in.
+    """
+
+    def __init__(self, translator_factory=None, cache_size: int = 2048, cache_ttl: float = 86400.0,
+                 max_workers: int = 4):
+        self.translator_factory = translator_factory or _google_translator
+        self.cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self.max_workers = max_workers
+        self._pool = None
+        self._local = threading.local()
+        self._inflight = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.total_ms = 0.0
+
+    @staticmethod
+    def cache_key(text: str, target: str) -> tuple:
+        return target, re.sub(r"\s+", " ", text).strip()
+
+    def _translate_blocking(self, target: str, text: str) -> str:
+        translators = getattr(self._local, "translators", None)
+        if translators is None:
+            translators = self._local.translators = {}
+        translator = translators.get(target)
+        if translator is None:
+            translator = translators[target] = self.translator_factory(target)
+        return translator.translate(text)
+
+    async def translate(self, text: str, target: str) -> str:
+        key = self.cache_key(text, target)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        fut = self._inflight.get(key)
+        if fut is not None:
+            self.coalesced += 1
+            return await asyncio.shield(fut)
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._inflight[key] = fut
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="translate")
+        start = time.perf_counter()
+        self.calls += 1
+        try:
+            result = await loop.run_in_executor(self._pool, self._translate_blocking, target, key[1])
+        except Exception as e:
+            self.errors += 1
+            CALL_ERRORS.inc("translate")
+            fut.set_exception(e)
+            # mark retrieved so a failure nobody else awaited doesn't warn on GC
+            fut.exception()
+            raise
+        else:
+            if result:
+                self.cache[key] = result
+            fut.set_result(result)
+            return result
+        finally:
+            if not fut.done():
+                # we were cancelled mid-call; release anyone coalesced onto us
+                fut.cancel()
+            elapsed = time.perf_counter() - start
+            CALL_LATENCY.observe(elapsed, "translate")
+            self.total_ms += elapsed * 1e3
+            self._inflight.pop(key, None)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> dict:
+        avg = self.total_ms / self.calls if self.calls else 0.0
+        return {"calls": self.calls, "coalesced": self.coalesced, "errors": self.errors,
+                "avg_ms": round(avg, 1), "cache": self.cache.stats()}
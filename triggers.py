@@ -0,0 +1,116 @@
+import re
+
+# ---------------- TRIGGER WORD LISTS -----------------
+
+# Expanded depression/sadness triggers
+sad_words = [
+    "sad", "so sad", "really sad", "feeling sad", "feels sad", "sadness", "sadtimes", "sadge",
+    "depressed", "depression", "depressing", "depress", "down bad", "downbad", "emo", "blue",
+    "cry", "crying", "cryinggg", "cryin", "tears", "tearful", "sobbing", "weeping", "😢", "😭",
+    "hopeless", "pointless", "worthless", "meaningless", "nothing matters", "no point",
+    "why bother", "life sucks", "fml", "ugh life", "why me", "done with life", "so tired of this",
+    "lonely", "alone", "unloved", "nobody cares", "nobody loves me", "i’m worthless", "not cared about",
+    "no friends", "ignored", "abandoned", "empty", "isolated",
+    "kill myself", "kms", "kys", "end it all", "suicidal", "suicide", "i wanna die", "want to die",
+    "wish i was dead", "better off dead", "die alone", "ending it", "goodbye world",
+    "slit wrists", "cutting", "self harm", "self-harm", "hurt myself", "not gonna make it",
+    "im gonna throw myself off a cliff", "throw myself off a cliff",
+    "jump off a bridge", "jump off a building", "throw myself off", "end my life",
+    "anxious", "anxiety", "stressed", "stressful", "overwhelmed", "drained", "burnt out", "burned out",
+    "low energy", "tired", "exhausted", "done", "numb", "broken", "hurt", "pain", "painful", "suffering",
+    "mentally exhausted", "emotionally drained", "can’t handle this", "can’t do this anymore",
+    "down", "feelsbad", "feels bad man", "bruh im sad", "ugh", "ugh life", "not okay", "im not okay",
+    "never happy", "so low", "feeling low", "stuck", "trapped", "lost", "dark thoughts", "heavy",
+    "in my feels", "in my feelings", "broken heart", "💔", "🫠", "😔", "☹️", "😞", "😟", "😩", "😫", "🥺", "😿", "😕"
+]
+
+# 67 meme trigger (any orientation: 6 7, 7 6, six seven, seven six, etc.)
+SIXTY_SEVEN_PATTERNS = [
+    r"\b6\s*7\b", r"\b7\s*6\b",
+    r"\bsix\s*seven\b", r"\bseven\s*six\b",
+    r"\b6\s*seven\b", r"\bsix\s*7\b",
+    r"\bseven\s*6\b", r"\b7\s*six\b"
+]
+
+# ---------------- MATCHER ENGINE -----------------
+def literal_alternation(words) -> str:
+    """
+    Build one regex alternation for a list of literal phrases, factored into a
+    prefix trie so the regex engine never re-tries a shared prefix, e.g.
+    ["sad", "sadge", "so sad"] -> (?:s(?:ad(?:ge)?|o\\ sad)).
+    """
+    trie = {}
+    for word in words:
+        if not word:
+            continue
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # end-of-word marker
+
+    def build(node) -> str:
+        optional = "" in node
+        edges = [(ch, child) for ch, child in sorted(node.items()) if ch]
+        if not edges:
+            return ""
+        branches = [re.escape(ch) + build(child) for ch, child in edges]
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        # sibling leaves collapse into a character class, which sre scans faster than a branch
+        if len(edges) > 1 and all(child == {"": {}} for _, child in edges):
+            body = "[" + "".join(branches) + "]"
+        else:
+            body = "(?:" + "|".join(branches) + ")"
+        return body + "?" if optional else body
+
+    return "(?:" + build(trie) + ")" if trie else "(?!)"
+
+
+class TriggerMatcher:
+    """
+    All auto-triggers compiled into a single regex, built once at startup.
+
+    Every rule lives in its own optional lookahead with a named group, behind a
+    guard alternation of all rules. The guard lets sre skip quickly to the next
+    position where *something* can fire; the lookaheads then record every rule
+    that starts there without consuming text, so one rule can never hide another.
+    `match()` returns the set of rule names that fired in one pass over the text.
+    """
+
+    def __init__(self, rules: dict):
+        # rules: name -> regex source (already lowercase-aware; callers pass lowered text)
+        self.names = [name for name, src in rules.items() if src]
+        for name in self.names:
+            if not name.isidentifier():
+                raise ValueError(f"Invalid trigger name: {name!r}")
+        if not self.names:
+            self._regex = None
+            return
+        guard = "|".join(f"(?:{rules[n]})" for n in self.names)
+        probes = "".join(f"(?=(?P<{n}>{rules[n]})?)" for n in self.names)
+        self._regex = re.compile(f"(?=(?:{guard})){probes}")
+
+    def match(self, text: str) -> set:
+        """Return the names of every rule that fired anywhere in `text`."""
+        fired = set()
+        if self._regex is None:
+            return fired
+        remaining = len(self.names)
+        for m in self._regex.finditer(text):
+            for name, value in m.groupdict().items():
+                if value is not None and name not in fired:
+                    fired.add(name)
+                    remaining -= 1
+            if not remaining:
+                break
+        return fired
+
+
+def build_default_matcher() -> TriggerMatcher:
+    """The bot's built-in on_message triggers."""
+    return TriggerMatcher({
+        "sixtyseven": "|".join(SIXTY_SEVEN_PATTERNS),
+        "sad": literal_alternation(sad_words),
+        "thanks": literal_alternation(["thank you"]),
+        "speed": r"plz.*speed.*i need this",
+    })
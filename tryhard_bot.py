@@ -0,0 +1,158 @@
+import asyncio
+import os
+import time
+
+import discord
+from discord.ext import commands
+
+from cogs import EXTENSIONS
+from gemini import GeminiClient
+from guild_settings import GuildSettings
+from http_client import HttpClient
+from metrics import (CACHE_ENTRIES, CACHE_HIT_RATIO, COMMAND_ERRORS, COMMAND_LATENCY, EVENT_ERRORS,
+                     EVENT_LATENCY, REGISTRY, LoopLagMonitor, timed)
+from outbound import OutboundDispatcher
+from pipeline import MessagePipeline
+from quote_pool import QuotePool
+from sharding import ShardConfig, ShardPartitioned
+from translation import TranslationService
+from web import WebServer
+
+
+class TryhardMixin:
+    """
+    The bot plus the services every cog shares.
+
+    Owns the pooled HTTP client, the outbound queue, the quote buffer, the
+    Gemini/translation clients, per-guild settings, the health server and the
+    message pipeline.
+    Features live in cogs (see `cogs.EXTENSIONS`); there is exactly one
+    `on_message`, which runs the pipeline and then the command parser.
+
+    Mixed into both `commands.Bot` and `commands.AutoShardedBot`; `shards`
+    (a ShardConfig) says which shards this process owns.
+    """
+
+    def __init__(self, *args, profiler=None, gemini_api_key: str = None, web_port: int = 8080,
+                 shards: ShardConfig = None, **kwargs):
+        self.shard_config = shards or ShardConfig()
+        if self.shard_config.sharded:
+            kwargs.setdefault("shard_count", self.shard_config.shard_count)
+            if self.shard_config.shard_ids is not None:
+                kwargs.setdefault("shard_ids", self.shard_config.shard_ids)
+        super().__init__(*args, **kwargs)
+        self.profiler = profiler
+        self.ready_once = asyncio.Event()
+        # Per-guild settings (toggles, custom triggers): one dict lookup per message
+        self.settings = GuildSettings(os.getenv("SETTINGS_DB", "settings.db"))
+        self.pipeline = MessagePipeline(config_for=self.settings.get)
+        # Event-loop lag sampler (exported on /metrics with everything else)
+        self.loop_lag = LoopLagMonitor()
+        # Shared pooled HTTP client for every outbound API call
+        self.http_client = HttpClient()
+        # Per-channel outbound queue: merges small messages, paces sends per route,
+        # and sends user-facing replies before status chatter
+        self.outbox = OutboundDispatcher()
+        # Prefetched quote buffer, refilled in the background (local list = cold-start fallback)
+        self.quotes = QuotePool(self.http_client)
+        # Shared Gemini client: one model object, bounded concurrency, cached answers
+        self.gemini = GeminiClient(api_key=gemini_api_key)
+        # Cached + coalesced translations, translator instances reused on a small thread pool
+        self.translator = TranslationService()
+        # Health/metrics server on the bot's event loop (Render assigns PORT)
+        self.web = WebServer(self, REGISTRY, self.ready_once, port=web_port)
+        self.before_invoke(self._start_command_timer)
+        self.after_invoke(self._record_command_timing)
+        self._register_gauges()
+
+    def _register_gauges(self):
+        CACHE_HIT_RATIO.source(lambda: self.gemini.cache.stats()["hit_rate"], "gemini")
+        CACHE_HIT_RATIO.source(lambda: self.translator.cache.stats()["hit_rate"], "translate")
+        CACHE_ENTRIES.source(lambda: len(self.gemini.cache), "gemini")
+        CACHE_ENTRIES.source(lambda: len(self.translator.cache), "translate")
+        CACHE_HIT_RATIO.source(lambda: self.settings.stats()["hit_rate"], "guild_settings")
+        CACHE_ENTRIES.source(lambda: len(self.settings), "guild_settings")
+        REGISTRY.gauge("outbox_queue_depth", "Messages waiting in the outbound queue.").source(self.outbox.depth)
+        REGISTRY.gauge("outbox_send_latency_avg_seconds", "Average enqueue-to-sent latency.").source(
+            lambda: self.outbox.stats()["avg_latency_ms"] / 1e3)
+        REGISTRY.gauge("quote_buffer_size", "Prefetched quotes available.").source(lambda: len(self.quotes))
+        REGISTRY.gauge("gateway_latency_seconds", "Discord websocket heartbeat latency.").source(lambda: self.latency)
+
+    def partitioned(self, factory) -> ShardPartitioned:
+        """Per-guild state container split by shard (one partition when unsharded)."""
+        return ShardPartitioned(factory, lambda: self.shard_count or 1)
+
+    def _phase(self, name: str):
+        if self.profiler is not None:
+            self.profiler.phase(name)
+
+    async def setup_hook(self):
+        self._phase("login")
+        self.loop_lag.start()
+        await self.web.start()
+        await self.http_client.start()
+        self.quotes.start()
+        self.settings.start()
+        for ext in EXTENSIONS:
+            await self.load_extension(ext)
+
+    async def close(self):
+        for ext in reversed(list(self.extensions)):
+            try:
+                await self.unload_extension(ext)
+            except Exception as e:
+                print(f"⚠️ Failed to unload {ext}: {e}")
+        await self.quotes.stop()
+        await self.settings.stop()
+        self.translator.close()
+        await self.http_client.close()
+        await self.web.stop()
+        self.loop_lag.stop()
+        await super().close()
+
+    async def on_ready(self):
+        # Guard: ensure this only logs once even if Discord reconnects
+        if self.ready_once.is_set():
+            return
+        self.ready_once.set()
+        self._phase("READY")
+        if self.profiler is not None:
+            self.profiler.print_report_once()
+        print(f"✅ {self.user.name} is online and ready! ({self.shard_config.label()})")
+
+    @timed("on_message", EVENT_LATENCY, EVENT_ERRORS)
+    async def on_message(self, message: discord.Message):
+        if message.author == self.user or message.author.bot:
+            return
+        if await self.pipeline.run(message):
+            return
+        await self.process_commands(message)
+
+    # Per-command latency/error metrics for every command, without decorating each one
+    async def _start_command_timer(self, ctx):
+        ctx.started_at = time.perf_counter()
+
+    async def _record_command_timing(self, ctx):
+        name = ctx.command.qualified_name
+        COMMAND_LATENCY.observe(time.perf_counter() - ctx.started_at, name)
+        if ctx.command_failed:
+            COMMAND_ERRORS.inc(name)
+
+    @timed("get_quote")
+    async def get_quote(self, guild_id: int = None) -> str:
+        """Pop a prefetched quote (never hits the network), fallback to the content bank/local list if empty."""
+        return self.quotes.get(guild_id)
+
+
+class TryhardBot(TryhardMixin, commands.Bot):
+    pass
+
+
+class ShardedTryhardBot(TryhardMixin, commands.AutoShardedBot):
+    pass
+
+
+def make_bot(*args, shards: ShardConfig = None, **kwargs):
+    """AutoShardedBot when sharding is configured, otherwise the plain single-connection Bot."""
+    cls = ShardedTryhardBot if shards is not None and shards.sharded else TryhardBot
+    return cls(*args, shards=shards, **kwargs)
@@ -0,0 +1,128 @@
+import datetime as dt
+import logging
+import re
+import zoneinfo
+
+# discord.py's default command error logger; a cog error handler silences it
+_command_log = logging.getLogger("discord.ext.commands.bot")
+
+
+def log_command_error(ctx, error):
+    """Log an error a cog's error handler didn't answer, as discord.py's default handler would."""
+    _command_log.error("Ignoring exception in command %s", ctx.command, exc_info=error)
+
+
+def parse_duration_to_seconds(s: str) -> int:
+    """
+    Parse compact duration strings like:
+      10m, 2h, 1d, 45s, or combos like 1h30m, 2d4h, 2h15m30s, etc.
+    Returns total seconds; raises ValueError if invalid.
+    """
+    s = s.strip().lower()
+    if not s:
+        raise ValueError("Empty duration.")
+    # allow space-separated combos as well: "1h 30m"
+    parts = re.findall(r'(\d+)\s*([smhd])', s)
+    if not parts:
+        raise ValueError("Invalid time format.")
+    total = 0
+    unit_map = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+    for amt, unit in parts:
+        total += int(amt) * unit_map[unit]
+    if total <= 0:
+        raise ValueError("Duration must be > 0.")
+    return total
+
+
+def parse_timezone(s: str) -> dt.tzinfo:
+    """
+    Parse a timezone: a fixed offset like UTC+8, GMT-5:30, +0530 or an IANA
+    name like Asia/Singapore (follows daylight saving). Raises ValueError.
+    """
+    s = s.strip()
+    m = re.fullmatch(r'(?:utc|gmt)?\s*(?:([+-])\s*(\d{1,2})(?::?(\d{2}))?)?', s, re.IGNORECASE)
+    if m and s:
+        sign, hours, minutes = m.groups()
+        if not sign:
+            return dt.timezone.utc
+        offset = dt.timedelta(hours=int(hours), minutes=int(minutes or 0))
+        if offset > dt.timedelta(hours=14):
+            raise ValueError("UTC offset out of range.")
+        return dt.timezone(-offset if sign == "-" else offset)
+    try:
+        return zoneinfo.ZoneInfo(s)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone: {s}") from None
+
+
+def parse_clock(s: str) -> dt.time:
+    """Parse 24h times like 8, 08:00 or 21:30. Raises ValueError."""
+    m = re.fullmatch(r'(\d{1,2})(?::(\d{2}))?', s.strip())
+    if not m or int(m.group(1)) > 23 or int(m.group(2) or 0) > 59:
+        raise ValueError("Invalid time; use HH:MM (24h).")
+    return dt.time(int(m.group(1)), int(m.group(2) or 0))
+
+
+# Language code resolver for translate
+LANG_ALIASES = {
+    # ISO codes
+    "en": "en", "eng": "en", "english": "en",
+    "es": "es", "spa": "es", "spanish": "es", "español": "es",
+    "fr": "fr", "fra": "fr", "fre": "fr", "french": "fr",
+    "de": "de", "ger": "de", "deu": "de", "german": "de",
+    "it": "it", "ita": "it", "italian": "it",
+    "pt": "pt", "por": "pt", "portuguese": "pt",
+    "pt-br": "pt", "br": "pt",
+    "ru": "ru", "rus": "ru", "russian": "ru",
+    "zh": "zh-cn", "zh-cn": "zh-cn", "chinese": "zh-cn", "mandarin": "zh-cn",
+    "zh-tw": "zh-tw", "traditional chinese": "zh-tw",
+    "ja": "ja", "jpn": "ja", "japanese": "ja",
+    "ko": "ko", "kor": "ko", "korean": "ko",
+    "ar": "ar", "ara": "ar", "arabic": "ar",
+    "hi": "hi", "hin": "hi", "hindi": "hi",
+    "id": "id", "ind": "id", "indonesian": "id", "bahasa": "id",
+    "ms": "ms", "msa": "ms", "malay": "ms",
+    "tl": "tl", "fil": "tl", "tagalog": "tl", "filipino": "tl",
+    "vi": "vi", "vie": "vi", "vietnamese": "vi",
+    "th": "th", "tha": "th", "thai": "th",
+    "tr": "tr", "tur": "tr", "turkish": "tr",
+    "nl": "nl", "dut": "nl", "nld": "nl", "dutch": "nl",
+    "sv": "sv", "swe": "sv", "swedish": "sv",
+    "no": "no", "nor": "no", "norsk": "no", "nb": "no", "nn": "no",
+    "da": "da", "dan": "da", "danish": "da",
+    "pl": "pl", "pol": "pl", "polish": "pl",
+    "uk": "uk", "ukr": "uk", "ukrainian": "uk",
+    "cs": "cs", "cze": "cs", "ces": "cs", "czech": "cs",
+    "el": "el", "greek": "el",
+    "he": "he", "iw": "he", "heb": "he", "hebrew": "he",
+    "fa": "fa", "per": "fa", "fas": "fa", "farsi": "fa", "persian": "fa",
+    "bg": "bg", "bul": "bg", "bulgarian": "bg",
+    "ro": "ro", "rum": "ro", "ron": "ro", "romanian": "ro",
+    "hu": "hu", "hun": "hu", "hungarian": "hu",
+    "fi": "fi", "fin": "fi", "finnish": "fi",
+    "et": "et", "est": "et", "estonian": "et",
+    "lt": "lt", "lit": "lt", "lithuanian": "lt",
+    "lv": "lv", "lav": "lv", "latvian": "lv",
+    "sr": "sr", "srp": "sr", "serbian": "sr",
+    "sk": "sk", "slk": "sk", "slovak": "sk",
+    "sl": "sl", "slv": "sl", "slovenian": "sl",
+    "hr": "hr", "hrv": "hr", "croatian": "hr",
+    "ga": "ga", "gle": "ga", "irish": "ga",
+    "is": "is", "ice": "is", "isl": "is", "icelandic": "is",
+    "af": "af", "afr": "af", "afrikaans": "af",
+    "sw": "sw", "swa": "sw", "swahili": "sw",
+    "am": "am", "amh": "am", "amharic": "am",
+    "ur": "ur", "urd": "ur", "urdu": "ur",
+    "bn": "bn", "ben": "bn", "bengali": "bn",
+    "ta": "ta", "tam": "ta", "tamil": "ta",
+    "te": "te", "tel": "te", "telugu": "te",
+    "mr": "mr", "mar": "mr", "marathi": "mr",
+    "gu": "gu", "guj": "gu", "gujarati": "gu",
+    "pa": "pa", "pan": "pa", "punjabi": "pa",
+    "swedish": "sv", "norwegian": "no",
+}
+
+
+def resolve_lang_code(s: str) -> str:
+    key = s.strip().lower()
+    return LANG_ALIASES.get(key, key)  # fall back to provided key
@@ -0,0 +1,311 @@
+import asyncio
+import heapq
+import json
+import sqlite3
+import time
+
+
+class Poll:
+    """
+    One tracked poll message. Each user holds at most one vote: reacting with
+    another option moves it, removing the reaction for the current choice
+    withdraws it, and repeated or stale events change nothing.
+    """
+
+    __slots__ = ("message_id", "guild_id", "channel_id", "author_id", "question", "options", "emojis",
+                 "closes_at", "closed_at", "announce", "counts", "voters", "_index")
+
+    def __init__(self, message_id: int, guild_id: int, channel_id: int, author_id: int, question: str,
+                 options: list, emojis: list, closes_at: float, closed_at: float = None, announce: bool = False):
+        self.message_id = message_id
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.author_id = author_id
+        self.question = question
+        self.options = list(options)
+        self.emojis = list(emojis)
+        self.closes_at = closes_at
+        self.closed_at = closed_at
+        self.announce = announce
+        self.counts = [0] * len(self.options)
+        self.voters = {}  # user_id -> option index
+        self._index = {e: i for i, e in enumerate(self.emojis)}
+
+    @property
+    def closed(self) -> bool:
+        return self.closed_at is not None
+
+    @property
+    def total(self) -> int:
+        return len(self.voters)
+
+    def option_for(self, emoji: str):
+        return self._index.get(emoji)
+
+    def add(self, user_id: int, option: int) -> bool:
+        prev = self.voters.get(user_id)
+        if prev == option:
+            return False
+        if prev is not None:
+            self.counts[prev] -= 1
+        self.counts[option] += 1
+        self.voters[user_id] = option
+        return True
+
+    def remove(self, user_id: int, option: int) -> bool:
+        if self.voters.get(user_id) != option:
+            return False
+        del self.voters[user_id]
+        self.counts[option] -= 1
+        return True
+
+    def winners(self) -> list:
+        top = max(self.counts, default=0)
+        return [i for i, c in enumerate(self.counts) if c == top] if top else []
+
+
+class VoteTracker:
+    """
+    Live tallies for !poll / !wyr messages, fed by raw reaction events.
+
+    Every tracked poll lives in a dict keyed by message id, so a reaction event
+    is one dict lookup plus a counter bump: no message or reaction-user fetches.
+    Reactions on untracked messages cost a single miss.
+
+    Persistence is write-behind: vote changes are collected per (poll, user)
+    and flushed to SQLite every `persist_interval` seconds and on stop, so a
+    restart keeps tallies (reactions made while offline are not seen). Each
+    poll closes at `closes_at`, capped at `max_open` seconds after creation,
+    and closed polls are dropped from memory and disk `expire_after` seconds
+    later, so memory tracks recent polls only.
+
+    `on_change(poll)` is called at most once per `refresh_interval` seconds
+    per poll with the latest tallies (for the live embed), `on_close(poll)`
+    once when a poll closes. Like ReminderScheduler, shard workers sharing a
+    database pass `shard_ids`/`shard_count` to load only their own guilds.
+    """
+
+    def __init__(self, path: str, on_change=None, on_close=None, persist_interval: float = 30.0,
+                 refresh_interval: float = 2.0, max_open: float = 7 * 86400, expire_after: float = 86400,
+                 shard_ids=None, shard_count: int = 1):
+        self.path = path
+        self.on_change = on_change
+        self.on_close = on_close
+        self.persist_interval = persist_interval
+        self.refresh_interval = refresh_interval
+        self.max_open = max_open
+        self.expire_after = expire_after
+        self.shard_ids = shard_ids
+        self.shard_count = shard_count
+        self._db = None
+        self._polls = {}
+        self._deadlines = []  # heap of (closes_at, message_id)
+        self._expiry = []     # heap of (expires_at, message_id)
+        self._dirty_votes = {}  # (message_id, user_id) -> option index or None (withdrawn)
+        self._stale = set()     # polls whose live embed is behind
+        self._wake = asyncio.Event()
+        self._task = None
+        self._refresher = None
+        self.events = 0
+        self.ignored = 0
+
+    def __len__(self):
+        return len(self._polls)
+
+    def open(self):
+        if self._db is not None:
+            return
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS polls ("
+            " message_id INTEGER PRIMARY KEY, guild_id INTEGER, channel_id INTEGER NOT NULL,"
+            " author_id INTEGER NOT NULL, question TEXT NOT NULL, options TEXT NOT NULL, emojis TEXT NOT NULL,"
+            " closes_at REAL NOT NULL, closed_at REAL, announce INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS votes ("
+            " message_id INTEGER NOT NULL, user_id INTEGER NOT NULL, option INTEGER NOT NULL,"
+            " PRIMARY KEY (message_id, user_id))"
+        )
+        self._db.commit()
+        self._load()
+
+    def _load(self):
+        query, params = ("SELECT message_id, guild_id, channel_id, author_id, question, options, emojis,"
+                         " closes_at, closed_at, announce FROM polls"), ()
+        if self.shard_ids is not None:
+            marks = ",".join("?" * len(self.shard_ids))
+            query += f" WHERE (COALESCE(guild_id, 0) >> 22) % ? IN ({marks})"
+            params = (self.shard_count, *self.shard_ids)
+        for mid, gid, cid, aid, question, options, emojis, closes_at, closed_at, announce in self._db.execute(query, params):
+            self._track(Poll(mid, gid, cid, aid, question, json.loads(options), json.loads(emojis),
+                             closes_at, closed_at, bool(announce)))
+        for mid, uid, option in self._db.execute("SELECT message_id, user_id, option FROM votes"):
+            poll = self._polls.get(mid)
+            if poll is not None and option < len(poll.options):
+                poll.add(uid, option)
+
+    def _track(self, poll: Poll):
+        self._polls[poll.message_id] = poll
+        if poll.closed:
+            heapq.heappush(self._expiry, (poll.closed_at + self.expire_after, poll.message_id))
+        else:
+            if not self._deadlines or poll.closes_at < self._deadlines[0][0]:
+                self._wake.set()
+            heapq.heappush(self._deadlines, (poll.closes_at, poll.message_id))
+
+    def create(self, message_id: int, guild_id: int, channel_id: int, author_id: int, question: str,
+               options: list, emojis: list, duration: float = None, announce: bool = False) -> Poll:
+        """Start tracking a poll message (closed after `max_open` seconds without `duration`; `announce` posts the result)."""
+        self.open()
+        now = time.time()
+        closes_at = now + min(duration if duration is not None else self.max_open, self.max_open)
+        poll = Poll(message_id, guild_id, channel_id, author_id, question, options, emojis, closes_at, None, announce)
+        self._db.execute(
+            "INSERT OR REPLACE INTO polls (message_id, guild_id, channel_id, author_id, question, options, emojis,"
+            " closes_at, closed_at, announce) VALUES (?, ?, ?, ?, ?, ?, ?, ?, NULL, ?)",
+            (message_id, guild_id, channel_id, author_id, question, json.dumps(options), json.dumps(emojis),
+             closes_at, int(announce)),
+        )
+        self._db.commit()
+        self._track(poll)
+        return poll
+
+    def get(self, message_id: int):
+        return self._polls.get(message_id)
+
+    def latest_in(self, channel_id: int):
+        """Most recent tracked poll in a channel (message ids grow over time), or None."""
+        polls = [p for p in self._polls.values() if p.channel_id == channel_id]
+        return max(polls, key=lambda p: p.message_id, default=None)
+
+    def react(self, message_id: int, user_id: int, emoji: str, added: bool) -> bool:
+        """Apply one raw reaction event. Returns True if a tally changed."""
+        self.events += 1
+        poll = self._polls.get(message_id)
+        if poll is None or poll.closed:
+            self.ignored += 1
+            return False
+        option = poll.option_for(emoji)
+        if option is None:
+            self.ignored += 1
+            return False
+        if not (poll.add(user_id, option) if added else poll.remove(user_id, option)):
+            return False
+        self._dirty_votes[(message_id, user_id)] = poll.voters.get(user_id)
+        self._mark_stale(poll)
+        return True
+
+    def _mark_stale(self, poll: Poll):
+        if self.on_change is None:
+            return
+        self._stale.add(poll.message_id)
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.create_task(self._refresh())
+
+    async def _refresh(self):
+        # trailing-edge debounce: one embed edit per poll per interval, with the newest counts
+        while self._stale:
+            await asyncio.sleep(self.refresh_interval)
+            stale, self._stale = self._stale, set()
+            for mid in stale:
+                poll = self._polls.get(mid)
+                if poll is None or poll.closed:
+                    continue
+                try:
+                    await self.on_change(poll)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"⚠️ Poll {mid} live update failed: {e}")
+
+    def close(self, message_id: int):
+        """Close a poll now (idempotent). Returns the Poll, or None if it isn't tracked."""
+        poll = self._polls.get(message_id)
+        if poll is None or poll.closed:
+            return poll
+        poll.closed_at = time.time()
+        self._stale.discard(message_id)
+        self.flush()
+        self._db.execute("UPDATE polls SET closed_at = ? WHERE message_id = ?", (poll.closed_at, message_id))
+        self._db.commit()
+        heapq.heappush(self._expiry, (poll.closed_at + self.expire_after, message_id))
+        return poll
+
+    def flush(self) -> int:
+        """Write pending vote changes to SQLite. Returns how many rows were written."""
+        if not self._dirty_votes or self._db is None:
+            return 0
+        dirty, self._dirty_votes = self._dirty_votes, {}
+        upserts = [(mid, uid, opt) for (mid, uid), opt in dirty.items() if opt is not None]
+        deletes = [(mid, uid) for (mid, uid), opt in dirty.items() if opt is None]
+        self._db.executemany("INSERT OR REPLACE INTO votes (message_id, user_id, option) VALUES (?, ?, ?)", upserts)
+        self._db.executemany("DELETE FROM votes WHERE message_id = ? AND user_id = ?", deletes)
+        self._db.commit()
+        return len(dirty)
+
+    def _expire(self, now: float):
+        gone = []
+        while self._expiry and self._expiry[0][0] <= now:
+            mid = heapq.heappop(self._expiry)[1]
+            if self._polls.pop(mid, None) is not None:
+                gone.append((mid,))
+        if gone:
+            self._db.executemany("DELETE FROM votes WHERE message_id = ?", gone)
+            self._db.executemany("DELETE FROM polls WHERE message_id = ?", gone)
+            self._db.commit()
+
+    def start(self):
+        self.open()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        for task in (self._task, self._refresher):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = self._refresher = None
+        if self._db is not None:
+            self.flush()
+            self._db.close()
+            self._db = None
+
+    async def _run(self):
+        next_flush = time.monotonic() + self.persist_interval
+        while True:
+            now = time.time()
+            while self._deadlines and self._deadlines[0][0] <= now:
+                mid = heapq.heappop(self._deadlines)[1]
+                poll = self._polls.get(mid)
+                if poll is None or poll.closed:
+                    continue  # closed early or expired; heap entries are dropped lazily
+                self.close(mid)
+                if self.on_close is not None:
+                    try:
+                        await self.on_close(poll)
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        print(f"⚠️ Closing poll {mid} failed: {e}")
+            if time.monotonic() >= next_flush:
+                self.flush()
+                self._expire(now)
+                next_flush = time.monotonic() + self.persist_interval
+            timeout = next_flush - time.monotonic()
+            if self._deadlines:
+                timeout = min(timeout, self._deadlines[0][0] - time.time())
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=max(0.0, timeout))
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> dict:
+        open_polls = sum(1 for p in self._polls.values() if not p.closed)
+        return {"polls": len(self._polls), "open": open_polls, "events": self.events, "ignored": self.ignored,
+                "unflushed": len(self._dirty_votes)}
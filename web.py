@@ -0,0 +1,77 @@
+import math
+
+from aiohttp import web
+
+
+def _seconds_or_none(value: float):
+    return None if value is None or math.isnan(value) or math.isinf(value) else round(value, 4)
+
+
+class WebServer:
+    """
+    Health/metrics HTTP server running on the bot's own event loop.
+
+    `/` is the plain keep-alive page Render pings, `/healthz` reports real
+    gateway readiness (200 when ready, 503 otherwise) and `/metrics` serves the
+    Prometheus registry.
+    """
+
+    def __init__(self, bot, registry, ready_event, host: str = "0.0.0.0", port: int = 8080):
+        self.bot = bot
+        self.registry = registry
+        self.ready_event = ready_event
+        self.host = host
+        self.port = port
+        self._runner = None
+
+    def shard_status(self) -> dict:
+        shards = getattr(self.bot, "shards", None)
+        if shards:
+            return {
+                str(sid): {"latency": _seconds_or_none(info.latency), "closed": info.is_closed(),
+                           "ratelimited": info.is_ws_ratelimited()}
+                for sid, info in shards.items()
+            }
+        sid = self.bot.shard_id or 0
+        return {str(sid): {"latency": _seconds_or_none(self.bot.latency), "closed": self.bot.is_closed(),
+                           "ratelimited": self.bot.is_ws_ratelimited()}}
+
+    def health(self) -> dict:
+        shards = self.shard_status()
+        ready = (self.ready_event.is_set() and self.bot.is_ready() and not self.bot.is_closed()
+                 and not any(s["closed"] for s in shards.values()))
+        return {
+            "ready": ready,
+            "user": str(self.bot.user) if self.bot.user else None,
+            "latency": _seconds_or_none(self.bot.latency),
+            "guilds": len(self.bot.guilds),
+            "shards": shards,
+        }
+
+    async def _home(self, request):
+        return web.Response(text="✅ Tryhard Bot is alive!")
+
+    async def _healthz(self, request):
+        body = self.health()
+        return web.json_response(body, status=200 if body["ready"] else 503)
+
+    async def _metrics(self, request):
+        return web.Response(text=self.registry.render(), content_type="text/plain",
+                            headers={"X-Prometheus-Format": "0.0.4"})
+
+    async def start(self):
+        if self._runner is not None:
+            return
+        app = web.Application()
+        app.router.add_get("/", self._home)
+        app.router.add_get("/healthz", self._healthz)
+        app.router.add_get("/metrics", self._metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        print(f"🌐 Health server listening on {self.host}:{self.port}")
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,132 @@
+import os
+import re
+import time
+
+from triggers import literal_alternation
+
+# 🚫 EXTENSIVE banned list with variations (built-in default; a word file overrides it)
+banned_words = [
+    "nigga", "nigger", "niga", "niger", "nibba", "nibber",
+    "niqqa", "niqqer", "n1gga", "n1gger", "n1gg4", "nigg4",
+    "neega", "neegr", "niggaz", "nigz", "nigs", "nig",
+    "nygga", "nygger", "nigguh", "niggur", "niggir",
+]
+
+# leetspeak -> letters, applied before anything non a-z is stripped
+LEET_TABLE = str.maketrans({
+    "0": "o", "1": "i", "!": "i", "|": "i", "3": "e", "4": "a", "@": "a",
+    "5": "s", "$": "s", "7": "t", "+": "t", "8": "b", "9": "g",
+})
+_NON_LETTERS = re.compile(r"[^\sa-z]+")
+_NON_ALPHA = re.compile(r"[^a-z]")
+_REPEATS = re.compile(r"(.)\1+")
+
+
+def _unleet(m) -> str:
+    # only a run between two letters is leetspeak ("n1gga"); elsewhere it is a number or
+    # punctuation and is dropped, so "in 19" never reads as "inig"
+    text, start, end = m.string, m.start(), m.end()
+    if start and end < len(text) and "a" <= text[start - 1] <= "z" and "a" <= text[end] <= "z":
+        return m.group().translate(LEET_TABLE)
+    return ""
+
+
+def fold_text(content: str) -> str:
+    """
+    Strict normalization for the filter: lowercase, undo leetspeak between letters,
+    keep only a-z, then fold repeated letters ("n1gga" -> "niga", "niiiggga" -> "niga").
+    """
+    text = _NON_LETTERS.sub(_unleet, content.lower())
+    text = _NON_ALPHA.sub('', text)
+    return _REPEATS.sub(r'\1', text)
+
+
+class FilterStats:
+    """Per-message latency counter for the filter (microseconds)."""
+
+    __slots__ = ("checks", "hits", "total_us", "max_us", "last_us")
+
+    def __init__(self):
+        self.checks = 0
+        self.hits = 0
+        self.total_us = 0.0
+        self.max_us = 0.0
+        self.last_us = 0.0
+
+    def record(self, elapsed_us: float, hit: bool):
+        self.checks += 1
+        self.hits += hit
+        self.total_us += elapsed_us
+        self.last_us = elapsed_us
+        if elapsed_us > self.max_us:
+            self.max_us = elapsed_us
+
+    def as_dict(self) -> dict:
+        avg = self.total_us / self.checks if self.checks else 0.0
+        return {"checks": self.checks, "hits": self.hits, "avg_us": round(avg, 2),
+                "max_us": round(self.max_us, 2), "last_us": round(self.last_us, 2)}
+
+
+class WordFilter:
+    """
+    Banned-word filter. The word list is folded once and compiled into a single
+    trie-shaped regex, so checking a message is one fold plus one linear scan.
+
+    If `path` is given, the list is read from that file (one word per line, `#`
+    comments allowed) and hot-reloaded when the file's mtime changes; the check
+    for changes is throttled to once every `reload_interval` seconds.
+    """
+
+    def __init__(self, words=None, path: str = None, reload_interval: float = 5.0):
+        self.path = path
+        self.reload_interval = reload_interval
+        self.stats = FilterStats()
+        self._default_words = list(words if words is not None else banned_words)
+        self._mtime = None
+        self._next_reload_check = 0.0
+        self._compile(self._default_words)
+        if path:
+            self.reload()
+
+    def _compile(self, words):
+        folded = sorted({fold_text(w) for w in words} - {""})
+        self.words = folded
+        self._regex = re.compile(literal_alternation(folded)) if folded else None
+
+    def reload(self) -> bool:
+        """Re-read the word file if it changed. Returns True if the list was rebuilt."""
+        self._next_reload_check = time.monotonic() + self.reload_interval
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            if self._mtime is not None:
+                # file removed: go back to the built-in list
+                self._mtime = None
+                self._compile(self._default_words)
+                return True
+            return False
+        if mtime == self._mtime:
+            return False
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                words = [ln.split("#", 1)[0].strip() for ln in f]
+        except OSError as e:
+            print(f"⚠️ Could not read banned word file {self.path}: {e}")
+            return False
+        self._mtime = mtime
+        self._compile([w for w in words if w])
+        print(f"🛑 Loaded {len(self.words)} banned words from {self.path}")
+        return True
+
+    def check(self, content: str, folded: str = None):
+        """Return the (folded) banned word found in `content`, or None. Pass `folded` if already computed."""
+        start = time.perf_counter()
+        if self.path and time.monotonic() >= self._next_reload_check:
+            self.reload()
+        hit = None
+        if self._regex is not None:
+            m = self._regex.search(folded if folded is not None else fold_text(content))
+            if m:
+                hit = m.group(0)
+        self.stats.record((time.perf_counter() - start) * 1e6, hit is not None)
+        return hit